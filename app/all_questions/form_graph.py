@@ -0,0 +1,183 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class FormGraph:
+    """Path-indexed view of the pages in a form json, with forward and reverse adjacency between pages.
+
+    Each node is the metadata dict for that page (initially just `path` and `next_paths`), so anything that
+    `generate_metadata()` adds to a page is available through the graph as well. The page's own json from the form
+    is kept by path in `page_json`.
+    """
+
+    start_page: str
+    pages: dict[str, dict] = field(default_factory=dict)
+    next_paths: dict[str, list[str]] = field(default_factory=dict)
+    previous_paths: dict[str, list[str]] = field(default_factory=dict)
+    page_json: dict[str, dict] = field(default_factory=dict)
+
+    @classmethod
+    def from_form_json(cls, form_json: dict) -> "FormGraph":
+        """Builds the graph for a form, keeping pages in the order they appear in the form json
+
+        Args:
+            form_json (dict): Data from the form json file
+
+        Returns:
+            FormGraph: The graph for this form
+        """
+        graph = cls(start_page=form_json["startPage"])
+        for page in form_json["pages"]:
+            graph.add_page(page["path"], [p["path"] for p in page.get("next", [])], page_json=page)
+        return graph
+
+    def add_page(self, path: str, next_paths: list[str], page_json: dict = None):
+        """Adds a page to the graph. If a page with this path already exists the first one is kept.
+
+        Args:
+            path (str): Path of the page
+            next_paths (list[str]): Everything that could come directly after this page
+            page_json (dict, optional): This page from the form json. Defaults to None.
+        """
+        if path in self.pages:
+            return
+        self.pages[path] = {"path": path, "next_paths": next_paths}
+        if page_json is not None:
+            self.page_json[path] = page_json
+        self.next_paths[path] = next_paths
+        for next_path in dict.fromkeys(next_paths):
+            self.previous_paths.setdefault(next_path, []).append(path)
+
+    def get_page(self, path: str) -> dict | None:
+        return self.pages.get(path)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.pages
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """Finds the strongly connected components of the graph (groups of pages that loop back to each other)
+        using an iterative version of Tarjan's algorithm, so deep forms can't hit the recursion limit.
+
+        Paths that are referenced as a next path but aren't pages in the form (eg. `/summary`) are included as
+        components of their own.
+
+        Returns:
+            list[list[str]]: The components in reverse topological order, ie. every component appears after all
+                the components that can be reached from it
+        """
+        index = {}
+        low_link = {}
+        on_stack = set()
+        stack = []
+        components = []
+
+        for root in self._all_paths():
+            if root in index:
+                continue
+            index[root] = low_link[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.next_paths.get(root, [])))]
+            while work:
+                path, next_paths = work[-1]
+                for next_path in next_paths:
+                    if next_path not in index:
+                        index[next_path] = low_link[next_path] = len(index)
+                        stack.append(next_path)
+                        on_stack.add(next_path)
+                        work.append((next_path, iter(self.next_paths.get(next_path, []))))
+                        break
+                    if next_path in on_stack:
+                        low_link[path] = min(low_link[path], index[next_path])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[path])
+                    if low_link[path] == index[path]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.remove(member)
+                            component.append(member)
+                            if member == path:
+                                break
+                        components.append(component)
+        return components
+
+    def transitive_closure(self) -> "FormGraphClosure":
+        """Works out everything that could come anywhere before and after every page in a single pass, by
+        condensing the graph into its strongly connected components and walking them in topological order.
+
+        Returns:
+            FormGraphClosure: The before/after sets for every page, and everything that could come directly after
+                anything before each page
+        """
+        all_paths = self._all_paths()
+        closure = FormGraphClosure(paths=all_paths, bits={path: 1 << i for i, path in enumerate(all_paths)})
+        components = self.strongly_connected_components()
+        component_of = {path: i for i, component in enumerate(components) for path in component}
+
+        # Components come out successors first, so everything after a component is already known when we get to it
+        after_by_component = [0] * len(components)
+        for i, component in enumerate(components):
+            after = 0
+            for path in component:
+                for next_path in self.next_paths.get(path, []):
+                    after |= closure.bits[next_path]
+                    if component_of[next_path] != i:
+                        after |= after_by_component[component_of[next_path]]
+            after_by_component[i] = after
+
+        # ...and walking them backwards means everything before a component is known when we get to it
+        previous_by_component = [0] * len(components)
+        next_of_previous_by_component = [0] * len(components)
+        for i in reversed(range(len(components))):
+            previous = next_of_previous = 0
+            for path in components[i]:
+                for previous_path in self.previous_paths.get(path, []):
+                    previous |= closure.bits[previous_path]
+                    next_of_previous |= closure.to_bits(self.next_paths[previous_path])
+                    if component_of[previous_path] != i:
+                        previous |= previous_by_component[component_of[previous_path]]
+                        next_of_previous |= next_of_previous_by_component[component_of[previous_path]]
+            previous_by_component[i] = previous
+            next_of_previous_by_component[i] = next_of_previous
+
+        for path in self.pages:
+            closure.after[path] = after_by_component[component_of[path]]
+            closure.previous[path] = previous_by_component[component_of[path]]
+            closure.next_of_previous[path] = next_of_previous_by_component[component_of[path]]
+        return closure
+
+    def _all_paths(self) -> list[str]:
+        """All the pages in the graph, followed by any next paths that aren't pages in the form"""
+        all_paths = dict.fromkeys(self.pages)
+        for next_paths in self.next_paths.values():
+            all_paths.update(dict.fromkeys(next_paths))
+        return list(all_paths)
+
+
+@dataclass
+class FormGraphClosure:
+    """Everything that could come before and after each page in a `FormGraph`, stored as bitsets over `paths`"""
+
+    paths: list[str]
+    bits: dict[str, int]
+    after: dict[str, int] = field(default_factory=dict)
+    previous: dict[str, int] = field(default_factory=dict)
+    next_of_previous: dict[str, int] = field(default_factory=dict)
+
+    def to_bits(self, paths: list[str]) -> int:
+        result = 0
+        for path in paths:
+            result |= self.bits[path]
+        return result
+
+    def to_paths(self, bits: int) -> list[str]:
+        result = []
+        while bits:
+            lowest = bits & -bits
+            result.append(self.paths[lowest.bit_length() - 1])
+            bits ^= lowest
+        return result
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class FormIndexes:
+    """Lookups into the lists and conditions of a form json, built once so rendering each component doesn't need
+    to search through them all.
+
+    Where a form has more than one list or condition with the same name, or more than one item with the same value
+    in a list, the first one is used.
+    """
+
+    list_items: dict[str, list[dict]] = field(default_factory=dict)
+    # list name -> item value -> item text
+    list_item_text: dict[str, dict] = field(default_factory=dict)
+    conditions: dict[str, dict] = field(default_factory=dict)
+    # field name -> condition name -> the parts of that condition that test the field
+    field_conditions: dict[str, dict[str, list[dict]]] = field(default_factory=dict)
+
+    @classmethod
+    def from_form_json(cls, form_json: dict) -> "FormIndexes":
+        """Builds the indexes for a form
+
+        Args:
+            form_json (dict): Data from the form json file
+
+        Returns:
+            FormIndexes: The indexes for this form
+        """
+        indexes = cls()
+        for lst in form_json.get("lists", []):
+            if lst["name"] in indexes.list_items:
+                continue
+            indexes.list_items[lst["name"]] = lst["items"]
+            item_text = indexes.list_item_text[lst["name"]] = {}
+            for item in lst["items"]:
+                item_text.setdefault(item["value"], item["text"])
+
+        for condition in form_json.get("conditions", []):
+            is_first = condition["name"] not in indexes.conditions
+            indexes.conditions.setdefault(condition["name"], condition)
+            for condition_part in condition["value"]["conditions"]:
+                by_condition = indexes.field_conditions.setdefault(condition_part["field"]["name"], {})
+                if is_first:
+                    by_condition.setdefault(condition["name"], []).append(condition_part)
+        return indexes
+
+    def has_conditions(self, field_name: str) -> bool:
+        """Whether any condition in the form tests this field"""
+        return field_name in self.field_conditions
+
+    def conditions_for_field(self, condition_name: str, field_name: str) -> list[dict]:
+        """Gets the parts of a condition that test a field
+
+        Args:
+            condition_name (str): Name of the condition
+            field_name (str): Name of the field
+
+        Returns:
+            list[dict]: The parts of the condition that test this field, in the order they appear
+
+        Raises:
+            KeyError: If the form has no condition with this name
+        """
+        if condition_name not in self.conditions:
+            raise KeyError(condition_name)
+        return self.field_conditions.get(field_name, {}).get(condition_name, [])
@@ -0,0 +1,204 @@
+from html.entities import html5
+from html.parser import HTMLParser
+
+from app.shared.lru_cache import LRUCache
+from config import Config
+
+# Text extracted from each hint or HTML component, keyed by its HTML. The same boilerplate is used in lots of forms.
+html_text_cache = LRUCache(max_bytes=Config.HTML_TEXT_CACHE_MAX_BYTES)
+
+# The text of hints used to be extracted from a BeautifulSoup tree built with html.parser, and the all questions
+# pages show exactly what that extracted. So the parser below follows the same rules BeautifulSoup builds its tree
+# with, without building it.
+ASCII_SPACES = " \n\t\x0c\r"
+EMPTY_ELEMENTS = {
+    "area",
+    "base",
+    "basefont",
+    "bgsound",
+    "br",
+    "col",
+    "command",
+    "embed",
+    "frame",
+    "hr",
+    "image",
+    "img",
+    "input",
+    "isindex",
+    "keygen",
+    "link",
+    "menuitem",
+    "meta",
+    "nextid",
+    "param",
+    "source",
+    "spacer",
+    "track",
+    "wbr",
+}
+PRESERVE_WHITESPACE_ELEMENTS = {"pre", "textarea"}
+# Text in these elements is only part of the text of the element itself, not of anything containing it
+STRING_CONTAINER_ELEMENTS = {"rt", "rp", "style", "script", "template"}
+ENTITIES = {name.removesuffix(";"): character for name, character in html5.items()}
+
+TEXT = "text"
+CDATA = "cdata"
+CONTENT_STRINGS = {TEXT, CDATA}
+
+
+class HtmlTextExtractor(HTMLParser):
+    """Extracts the text to show on the all questions page from some HTML, as `extract_text_from_html` describes.
+
+    Strings are worked out as they're parsed, from a stack of the tags that are open. Only the text of a `<ul>` and
+    each of its items is kept until it's closed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.results = []
+        self.open_tags = []
+        self.current_data = []
+        self.already_closed_empty_elements = []
+        # While in a <ul>, where it is in open_tags, its bullets and the text of the bullet that's open
+        self.list_depth = None
+        self.bullets = None
+        self.bullet_strings = None
+        self.bullet_text = []
+
+    def extract(self, html: str) -> list:
+        self.feed(html)
+        self.close()
+        self._end_data()
+        while self.open_tags:
+            self._pop_tag()
+        return self.results
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        self._end_data()
+        if self.list_depth is not None and len(self.open_tags) == self.list_depth + 1:
+            self.bullet_text = []
+            self.bullet_strings = {tag} if tag in STRING_CONTAINER_ELEMENTS else CONTENT_STRINGS
+        elif self.list_depth is None and tag == "ul":
+            self.list_depth = len(self.open_tags)
+            self.bullets = []
+        self.open_tags.append(tag)
+        if tag in EMPTY_ELEMENTS and handle_empty_element:
+            self.handle_endtag(tag, check_already_closed=False)
+            self.already_closed_empty_elements.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        # The end tag of an empty element that has already been closed, e.g. the </br> of <br></br>
+        if check_already_closed and tag in self.already_closed_empty_elements:
+            self.already_closed_empty_elements.remove(tag)
+            return
+        self._end_data()
+        if tag in self.open_tags:
+            while self._pop_tag() != tag:
+                pass
+
+    def handle_data(self, data):
+        self.current_data.append(data)
+
+    def handle_charref(self, name):
+        if name.startswith(("x", "X")):
+            code_point = int(name.lstrip("xX"), 16)
+        else:
+            code_point = int(name)
+        data = None
+        if code_point < 256:
+            try:
+                data = bytearray([code_point]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(code_point)
+            except (ValueError, OverflowError):
+                pass
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name):
+        self.handle_data(ENTITIES.get(name, f"&{name}"))
+
+    def handle_comment(self, data):
+        self._add_string(data, "comment")
+
+    def handle_decl(self, decl):
+        self._add_string(decl[len("DOCTYPE ") :], "doctype")
+
+    def unknown_decl(self, data):
+        if data.upper().startswith("CDATA["):
+            self._add_string(data[len("CDATA[") :], CDATA)
+        else:
+            self._add_string(data, "declaration")
+
+    def handle_pi(self, data):
+        self._add_string(data, "processing_instruction")
+
+    def _add_string(self, data: str, kind: str):
+        self._end_data()
+        self.handle_data(data)
+        self._end_data(kind)
+
+    def _end_data(self, kind: str = TEXT):
+        if not self.current_data:
+            return
+        string = "".join(self.current_data)
+        self.current_data = []
+        if not PRESERVE_WHITESPACE_ELEMENTS.intersection(self.open_tags) and all(c in ASCII_SPACES for c in string):
+            string = "\n" if "\n" in string else " "
+        if kind == TEXT:
+            kind = next((tag for tag in reversed(self.open_tags) if tag in STRING_CONTAINER_ELEMENTS), TEXT)
+
+        if self.list_depth is None:
+            if kind in CONTENT_STRINGS:
+                _append_stripped(string, self.results)
+        elif len(self.open_tags) == self.list_depth + 1:
+            # A string directly inside the <ul>, rather than in one of its items
+            if kind in CONTENT_STRINGS:
+                _append_stripped(string, self.bullets)
+        elif kind in self.bullet_strings:
+            self.bullet_text.append(string)
+
+    def _pop_tag(self) -> str:
+        tag = self.open_tags.pop()
+        depth = len(self.open_tags)
+        if depth == self.list_depth:
+            self.results.append(self.bullets)
+            self.list_depth = self.bullets = None
+        elif self.list_depth is not None and depth == self.list_depth + 1:
+            _append_stripped("".join(self.bullet_text), self.bullets)
+        return tag
+
+
+def _append_stripped(string: str, strings: list):
+    stripped = string.strip()
+    if stripped:
+        strings.append(stripped)
+
+
+def extract_text_from_html(html: str) -> list:
+    """
+    Extracts the text items from some HTML for rendering in the all questions page.
+
+    Any non-empty strings are stripped of leading/trailing spaces etc and included as items. Any <ul> elements have
+    the text of each of their child elements put into a separate list, which is included as an item.
+
+    Results are cached by the HTML, as the same hints and guidance are used in lots of forms.
+
+    Args:
+        html (str): HTML to extract from
+
+    Returns:
+        list: The text items, which the caller is free to change
+    """
+    results = html_text_cache.get(html)
+    if results is None:
+        results = HtmlTextExtractor().extract(html)
+        html_text_cache.set(html, results, size=len(html) + sum(len(str(item)) for item in results))
+    return [list(item) if isinstance(item, list) else item for item in results]
@@ -1,10 +1,12 @@
-import copy
 import fnmatch
+import json
 from typing import Tuple
 
-from bs4 import BeautifulSoup, NavigableString
 from flask import current_app
 
+from app.all_questions.form_graph import FormGraph
+from app.all_questions.form_indexes import FormIndexes
+from app.all_questions.html_text import extract_text_from_html
 from app.all_questions.read_forms import (
     build_section_header,
     determine_display_value_for_condition,
@@ -13,60 +15,15 @@ from app.all_questions.read_forms import (
     remove_lowest_in_hierarchy,
     strip_leading_numbers,
 )
-from app.db.queries.round import get_round_by_id
-from app.shared.form_store_api import FormNotFoundError
+from app.db.queries.round import get_round_graph_by_id
+from app.shared.lru_cache import LRUCache
+from app.shared.server_timing import timed
+from config import Config
 
 FIELD_TYPES_WITH_MAX_WORDS = ["freetextfield", "multilinetextfield"]
 
-
-def get_all_child_nexts(page: dict, child_nexts: list, all_pages: dict):
-    """Recursively builds a list of everything that could come next from this page,
-    and then everything that could come next from those next pages, and so on.
-
-
-    Args:
-        page (dict): _description_
-        child_nexts (list): _description_
-        all_pages (dict): _description_
-    """
-    # TODO write tests
-    # Add all next paths to the set
-    child_nexts.update([n for n in page["next_paths"]])
-
-    for next_page_path in page["next_paths"]:
-        # Find the next page safely using list comprehension
-        matching_pages = [p for p in all_pages if p["path"] == next_page_path]
-
-        # If found, recursively process
-        if matching_pages:
-            get_all_child_nexts(matching_pages[0], child_nexts, all_pages)
-
-
-def get_all_possible_previous(page_path: str, results: list, all_pages: dict):
-    """Recursively finds all pages that could have come before this one, in any branch of questions
-
-    Args:
-        page_path (str): _description_
-        results (list): _description_
-        all_pages (dict): _description_
-    """
-
-    # TODO write tests
-
-    # Skip processing for non-existent page paths or special paths
-    # This early return prevents processing paths that don't exist in all_pages
-    if not any(page["path"] == page_path for page in all_pages):
-        return
-
-    # Find all pages that directly lead to this page
-    direct_prev = [prev["path"] for prev in all_pages if page_path in prev["next_paths"]]
-
-    # Add them to the results
-    results.update(direct_prev)
-
-    # For each previous page, recursively find its previous pages
-    for prev in direct_prev:
-        get_all_possible_previous(prev, results, all_pages)
+# Print data for published forms, keyed by (form hash, lang, section_idx, form_idx)
+print_data_cache = LRUCache(max_bytes=Config.PRINT_DATA_CACHE_MAX_BYTES)
 
 
 def generate_metadata(full_form_data: dict) -> dict:
@@ -100,7 +57,9 @@ def generate_metadata(full_form_data: dict) -> dict:
                 Everything that could come anywhere after this page
             ]
         },
-    ]
+    ],
+    "graph": FormGraph indexing the pages in `all_pages` by path
+    }
     ```
 
     Args:
@@ -110,64 +69,39 @@ def generate_metadata(full_form_data: dict) -> dict:
         dict: The metadata, as described above
     """
 
-    cutdown = {"start_page": full_form_data["startPage"], "all_pages": []}
-    for page in full_form_data["pages"]:
-        cp = {"path": page["path"], "next_paths": [p["path"] for p in page.get("next", [])]}
-        cutdown["all_pages"].append(cp)
-
-    metadata = copy.deepcopy(cutdown)
-    for p in metadata["all_pages"]:
+    graph = FormGraph.from_form_json(full_form_data)
+    # everything that could come anywhere before and after every page, worked out in one pass
+    closure = graph.transitive_closure()
+    for p in graph.pages.values():
         # everything that could come immediately before this page
-        p["all_direct_previous"] = [prev["path"] for prev in cutdown["all_pages"] if p["path"] in prev["next_paths"]]
+        p["all_direct_previous"] = list(graph.previous_paths.get(p["path"], []))
 
         # all the immediate next paths of the direct previous (aka siblings)
         direct_next_of_direct_previous = set()
         for direct_prev in p["all_direct_previous"]:
-            # Find the page safely
-            matching_pages = [page for page in cutdown["all_pages"] if page["path"] == direct_prev]
-            if matching_pages:
-                direct_next_of_direct_previous.update(matching_pages[0]["next_paths"])
+            direct_next_of_direct_previous.update(graph.next_paths[direct_prev])
         p["direct_next_of_direct_previous"] = list(direct_next_of_direct_previous)
 
         # get all the descendents (possible next anywhere after) of the siblings
-        all_possible_next_of_siblings = set()
+        all_possible_next_of_siblings = 0
         for sibling in p["direct_next_of_direct_previous"]:
-            # Skip paths that don't exist in our valid pages
-            valid_paths = {page["path"] for page in cutdown["all_pages"]}
-            if sibling not in valid_paths:
-                continue
-
-            matching_pages = [page for page in cutdown["all_pages"] if page["path"] == sibling]
-            if matching_pages:
-                get_all_child_nexts(matching_pages[0], all_possible_next_of_siblings, cutdown["all_pages"])
-        p["all_possible_next_of_siblings"] = list(all_possible_next_of_siblings)
+            # Paths that don't exist in our valid pages have no descendents
+            all_possible_next_of_siblings |= closure.after.get(sibling, 0)
+        p["all_possible_next_of_siblings"] = closure.to_paths(all_possible_next_of_siblings)
 
         # everything that could come anywhere before this page
-        all_possible_previous = set()
-        get_all_possible_previous(p["path"], all_possible_previous, cutdown["all_pages"])
-        p["all_possible_previous"] = list(all_possible_previous)
+        p["all_possible_previous"] = closure.to_paths(closure.previous[p["path"]])
 
         # get everything that is directly after all the possible previous to this page
-        all_possible_previous_direct_next = set()
-        for prev in p["all_possible_previous"]:
-            # Skip paths that don't exist in our valid pages
-            if prev not in valid_paths:
-                continue
-
-            matching_pages = [page for page in cutdown["all_pages"] if page["path"] == prev]
-            if matching_pages:
-                all_possible_previous_direct_next.update(matching_pages[0]["next_paths"])
-        p["all_possible_previous_direct_next"] = list(all_possible_previous_direct_next)
+        p["all_possible_previous_direct_next"] = closure.to_paths(closure.next_of_previous[p["path"]])
 
         # everything that could come after this page
-        all_possible_after = set()
-        get_all_child_nexts(page=p, child_nexts=all_possible_after, all_pages=cutdown["all_pages"])
-        p["all_possible_after"] = list(all_possible_after)
+        p["all_possible_after"] = closure.to_paths(closure.after[p["path"]])
 
-    return metadata
+    return {"start_page": graph.start_page, "all_pages": list(graph.pages.values()), "graph": graph}
 
 
-def is_return_point_for_siblings(page: dict, next_path: str, all_pages: dict) -> bool:
+def is_return_point_for_siblings(page: dict, next_path: str, graph: FormGraph) -> bool:
     """Determines if next page is a return point for all siblings of the current page."""
     for sibling in page["direct_next_of_direct_previous"]:
         # don't look at this page
@@ -175,12 +109,10 @@ def is_return_point_for_siblings(page: dict, next_path: str, all_pages: dict) ->
             continue
 
         # Safely find the sibling page
-        sibling_matching_pages = [p for p in all_pages if p["path"] == sibling]
-        if not sibling_matching_pages:
+        sibling_page = graph.get_page(sibling)
+        if not sibling_page:
             continue
 
-        sibling_page = sibling_matching_pages[0]
-
         if next_path not in sibling_page["all_possible_after"]:
             return False
 
@@ -188,7 +120,7 @@ def is_return_point_for_siblings(page: dict, next_path: str, all_pages: dict) ->
 
 
 def determine_next_hierarchy_level(
-    page: dict, next_path: str, next_page: dict, idx: int, start_page: bool, all_pages: dict
+    page: dict, next_path: str, next_page: dict, idx: int, start_page: bool, graph: FormGraph
 ) -> int:
     """Calculates the hierarchy level for the next page."""
     # Default is same level
@@ -207,14 +139,14 @@ def determine_next_hierarchy_level(
 
     # if this page and all it's siblings eventually go back to this same next page, go back a level
     elif len(page["direct_next_of_direct_previous"]) > 1 and len(next_page["all_direct_previous"]) > 1:
-        if is_return_point_for_siblings(page, next_path, all_pages):
+        if is_return_point_for_siblings(page, next_path, graph):
             next_idx = idx - 1
 
     return next_idx
 
 
-def build_hierarchy_levels_for_page(page: dict, results: dict, idx: int, all_pages: dict, start_page: bool = False):
-    """Recursively builds up a dict containing the path of each page, and it's level in the hierarchy of the page
+def build_hierarchy_levels_for_page(page: dict, results: dict, idx: int, graph: FormGraph, start_page: bool = False):
+    """Builds up a dict containing the path of each page, and it's level in the hierarchy of the page
     Format of results:
     ```
         {
@@ -225,78 +157,54 @@ def build_hierarchy_levels_for_page(page: dict, results: dict, idx: int, all_pag
         }
     ```
 
+    Works through the pages with a worklist rather than recursion, so long forms can't hit the recursion limit.
+    The level of a next page is always this page's level plus a fixed step, so once a page has been reached at
+    some level, reaching it again at the same or a higher level can't lower anything after it, and we don't go
+    through it again.
+
     Args:
         page (dict): Page object from metadata
         results (dict): The dict that will store the hierarchy results
         idx (int): The hierarchy level of this page at this point in the tree
-        all_pages (dict): All the pages in the form
+        graph (FormGraph): Graph of all the pages in the form
         start_page (bool, optional): Whether or not this is the first page in the form. Defaults to False.
     """
-    current_level_in_results = results.get(page["path"], 9999)
-    # We want the lowest level the page appears at, so only update if we are at it's lowest point
-    if idx < current_level_in_results:
-        results[page["path"]] = idx
-
-    # loop through every page that comes after this page
-    for next_path in [n for n in page["next_paths"]]:
-        # Skip special paths that are added dynamically later
-        if next_path == "/summary":
-            continue
-
-        # Safely find the next page
-        matching_pages = [p for p in all_pages if p["path"] == next_path]
-        if not matching_pages:
-            print(f"Warning: Page with path '{next_path}' referenced but not found in all_pages")
+    # Lowest level each page has been reached at (other than as the start page, which is worked out differently)
+    lowest_level_reached = {} if start_page else {page["path"]: idx}
+    # No route through the form without loops can take us further up than this, so a loop that keeps taking us up
+    # a level is stopped here rather than going round forever
+    lowest_possible_level = idx + 1 - len(graph.pages)
+
+    to_do = [(page, idx, start_page)]
+    while to_do:
+        page, idx, start_page = to_do.pop()
+
+        # We want the lowest level the page appears at, so only update if we are at it's lowest point
+        if idx < results.get(page["path"], 9999):
+            results[page["path"]] = idx
+
+        # If this page has since been reached at a lower level, everything after it will be done from there
+        if not start_page and idx > lowest_level_reached[page["path"]]:
             continue
 
-        next_page = matching_pages[0]
-
-        # Determine the hierarchy level for the next page
-        next_idx = determine_next_hierarchy_level(page, next_path, next_page, idx, start_page, all_pages)
-
-        build_hierarchy_levels_for_page(next_page, results, next_idx, all_pages)
-
-
-def strip_string_and_append_if_not_empty(string_to_check: str, list_to_append: list):
-    """Uses `str.strip()` to remove leading/trailing whitespace from `string_to_check`.
-    If the resulting string is not empty, appends this to `list_to_append`
-
-    Args:
-        string_to_check (str): String to strip and append
-        list_to_append (list): List to append to
-    """
-    stripped = string_to_check.strip()
-    if stripped:
-        list_to_append.append(stripped)
-
-
-def extract_from_html(soup, results: list):
-    """
-    Takes in a BeautifulSoup element, recursively iterates through it's children to generate text items
-    for rendering in the all questions page.
-
-    Any non-empty strings are stripped of leading/trailing spaces etc and appended to `results`.
-    Any <ul> elements have their child <li> elements put into a separate list and that list is appended to `results`
+        # loop through every page that comes after this page
+        for next_path in page["next_paths"]:
+            # Skip special paths that are added dynamically later
+            if next_path == "/summary":
+                continue
 
-    Args:
-        soup (_type_): HTML to extract from
-        results (list): results to append to
-    """
-    for element in soup.children:
-        # If it's just a string, append that text
-        if isinstance(element, NavigableString):
-            strip_string_and_append_if_not_empty(element.text, results)
-            continue
+            # Safely find the next page
+            next_page = graph.get_page(next_path)
+            if not next_page:
+                print(f"Warning: Page with path '{next_path}' referenced but not found in all_pages")
+                continue
 
-        # If it's a list, append the list items as another list
-        if element.name == "ul":
-            bullets = []
-            for li in element.children:
-                strip_string_and_append_if_not_empty(li.text, bullets)
-            results.append(bullets)
-            continue
+            # Determine the hierarchy level for the next page
+            next_idx = determine_next_hierarchy_level(page, next_path, next_page, idx, start_page, graph)
 
-        extract_from_html(element, results)
+            if lowest_possible_level <= next_idx < lowest_level_reached.get(next_path, 9999):
+                lowest_level_reached[next_path] = next_idx
+                to_do.append((next_page, next_idx, False))
 
 
 def update_wording_for_multi_input_fields(text: list) -> list:
@@ -310,7 +218,7 @@ def update_wording_for_multi_input_fields(text: list) -> list:
 def determine_title_and_text_for_component(  # noqa: C901
     component: dict,
     include_html_components: bool = True,
-    form_lists: list = None,
+    form_indexes: FormIndexes = None,
     is_child: bool = False,
 ) -> Tuple[str, list]:
     """Determines the title and text to display for an individual component.
@@ -318,16 +226,16 @@ def determine_title_and_text_for_component(  # noqa: C901
     Args:
         component (dict): The component to get the text for
         include_html_components (bool, optional): Whether to include html-only components. Defaults to True.
-        form_lists (list, optional): All lists in this form - used to determine display values for list items.
-            Defaults to [].
+        form_indexes (FormIndexes, optional): Indexes of this form's lists - used to determine display values for
+            list items. Defaults to no lists.
         is_child (bool, optionsl): Whether this is a child field in a multi-input field. Defaults to False.
 
 
     Returns:
         Tuple[str, list]: First item is the title, second is the text to display
     """
-    if form_lists is None:
-        form_lists = []
+    if form_indexes is None:
+        form_indexes = FormIndexes()
     title: str = component["title"] if "title" in component else None
     text = []
     # skip details, eg about-your-org-cyp GNpQfE
@@ -339,7 +247,7 @@ def determine_title_and_text_for_component(  # noqa: C901
         title = f"You can add multiple {component['title'].lower()}"
         for child in component["children"]:
             child_title, child_text = determine_title_and_text_for_component(
-                child, include_html_components, form_lists, is_child=True
+                child, include_html_components, form_indexes, is_child=True
             )
             if child["type"].casefold() in FIELD_TYPES_WITH_MAX_WORDS:
                 options = component.get("options", {})
@@ -363,12 +271,7 @@ def determine_title_and_text_for_component(  # noqa: C901
         and (component["type"].casefold() == "html" or component["type"].casefold() == "para")
     ) or ("hint" in component):
         # If there is hint or content text, extract it from the html in the hint field
-        soup = BeautifulSoup(
-            component["hint"] if "hint" in component else component["content"],
-            "html.parser",
-        )
-        text = []
-        extract_from_html(soup, text)
+        text = extract_text_from_html(component["hint"] if "hint" in component else component["content"])
         update_wording_for_multi_input_fields(text)
 
     if (
@@ -381,12 +284,7 @@ def determine_title_and_text_for_component(  # noqa: C901
     if "list" in component:
         # include available options for lists
         list_id = component["list"]
-        list_items = None
-
-        for lst in form_lists:
-            if lst["name"] == list_id:
-                list_items = lst["items"]
-                break
+        list_items = form_indexes.list_items.get(list_id)
 
         if list_items:
             list_display = [item["text"] for item in list_items]
@@ -400,8 +298,7 @@ def determine_title_and_text_for_component(  # noqa: C901
 def build_components_from_page(
     full_page_json: dict,
     include_html_components: bool = True,
-    form_lists: list = None,
-    form_conditions: list = None,
+    form_indexes: FormIndexes = None,
     index_of_printed_headers: dict = None,
     lang: str = "en",
 ) -> list:
@@ -412,8 +309,8 @@ def build_components_from_page(
         full_page_json (dict): This page from the form_jsons data
         include_html_components (bool, optional): Whether or not to include components that are just HTML.
             Defaults to True.
-        form_lists (list, optional): The lists that appear in this form. Defaults to [].
-        form_conditions (list, optional): The conditions that appear in this form. Defaults to [].
+        form_indexes (FormIndexes, optional): Indexes of the lists and conditions in this form. Defaults to no
+            lists or conditions.
         index_of_printed_headers (dict, optional): The set of pages and their numbers for display, used in
             directing people to another section when branching. Defaults to {}.
         lang (str): Language for display. Defaults to 'en'.
@@ -431,39 +328,32 @@ def build_components_from_page(
     # Find out which components in this page determine, through conditions, where we go next
     if index_of_printed_headers is None:
         index_of_printed_headers = {}
-    if form_conditions is None:
-        form_conditions = []
-    if form_lists is None:
-        form_lists = []
-    components_with_conditions = []
-    for condition in form_conditions:
-        components_with_conditions.extend([value["field"]["name"] for value in condition["value"]["conditions"]])
+    if form_indexes is None:
+        form_indexes = FormIndexes()
 
     components = []
     for c in full_page_json["components"]:
         title, text = determine_title_and_text_for_component(
-            c, include_html_components=include_html_components, form_lists=form_lists
+            c, include_html_components=include_html_components, form_indexes=form_indexes
         )
         field_type = c["type"]
         if not title and not text:
             continue
 
         # If there are multiple options for the next page, include text about where to go next
-        if c["name"] in components_with_conditions:
+        if form_indexes.has_conditions(c["name"]):
             for next_config in full_page_json["next"]:
                 if "condition" in next_config and next_config["path"] != "/summary":
                     condition_name = next_config["condition"]
-                    condition_config = next(fc for fc in form_conditions if fc["name"] == condition_name)
+                    field_conditions = form_indexes.conditions_for_field(condition_name, c["name"])
                     destination = index_of_printed_headers[next_config["path"]]["title"]
                     text_with_coordinators = ""
-                    for condition in [
-                        cc for cc in condition_config["value"]["conditions"] if cc["field"]["name"] == c["name"]
-                    ]:
+                    for condition in field_conditions:
                         condition_value = condition["value"]["value"]
                         condition_text = determine_display_value_for_condition(
                             condition_value,
                             list_name=c["list"] if "list" in c else None,
-                            form_lists=form_lists,
+                            form_indexes=form_indexes,
                             lang=lang,
                         )
                         if condition.get("coordinator"):
@@ -520,82 +410,77 @@ def generate_print_headings_for_page(
             ```
         is_form_heading (bool, optional): Whether or not this is the heading for the entire form. Defaults to False.
     """
-    page_path = page["path"]
-    # If we've already done this page, don't do it again or skip if page is summary page
-    if page_path not in pages_to_do or "summary.js" in form_json_page.get("controller", ""):
-        return
-
-    title = strip_leading_numbers(form_json_page["title"])
-
-    level_in_hrch = page_index[page_path]
-    hierarchy_difference = level_in_hrch - parent_hierarchy_level
-
-    # If we are going up a level in the hierarchy, and this isn't the last branch
-    # that goes there, don't do it yet
-    all_siblings = set(prev for prev in page["direct_next_of_direct_previous"] if prev != page_path)
-    if pages_to_do.intersection(all_siblings) and hierarchy_difference < 0:
-        return
-
-    if pages_to_do.intersection(page["all_direct_previous"]) and hierarchy_difference < 0:
-        return
-
-    # Work out the heading number for this page
-    base_heading_number = this_idx
-    if not is_form_heading:
-        if hierarchy_difference < 0:
-            # go back a level
-            base_heading_number = remove_lowest_in_hierarchy(base_heading_number)
-        elif hierarchy_difference > 0:
-            # increase level
-            base_heading_number = f"{this_idx}.{place_in_siblings_list}"
-
-    new_heading_number = increment_lowest_in_hierarchy(base_heading_number)
-
-    index_of_printed_headers[page_path] = {
-        "heading_number": new_heading_number,
-        "is_form_heading": is_form_heading,
-        "title": title,
-    }
-    # Make sure we don't do this page again
-    pages_to_do.remove(page_path)
-
-    # Go through and do the same for all the pages after this one
-    sibling_tracker = 0
-    for next_page_path in page["next_paths"]:
-        # Skip special paths that are added dynamically later
-        if next_page_path == "/summary":
+    graph = form_metadata["graph"]
+    # Pages still to visit, as the arguments for each page. Pages are visited depth first, so each page's children
+    # are visited in order, with everything below one child done before the next. A stack rather than recursion
+    # means very deep forms can't hit the recursion limit.
+    to_visit = [(page, form_json_page, this_idx, parent_hierarchy_level, place_in_siblings_list, is_form_heading)]
+    while to_visit:
+        visit = to_visit.pop()
+        page, form_json_page, this_idx, parent_hierarchy_level, place_in_siblings_list, is_form_heading = visit
+        page_path = page["path"]
+        # If we've already done this page, don't do it again or skip if page is summary page
+        if page_path not in pages_to_do or "summary.js" in form_json_page.get("controller", ""):
             continue
 
-        # Safely get the next page from all_pages
-        matching_pages = [p for p in form_metadata["all_pages"] if p["path"] == next_page_path]
-        if not matching_pages:
-            print(f"Warning: Page with path '{next_page_path}' referenced but not found in all_pages")
-            continue
+        title = strip_leading_numbers(form_json_page["title"])
 
-        next_page = matching_pages[0]
+        level_in_hrch = page_index[page_path]
+        hierarchy_difference = level_in_hrch - parent_hierarchy_level
 
-        # Safely get the next page from full_json["pages"]
-        matching_json_pages = [p for p in form_metadata["full_json"]["pages"] if p["path"] == next_page_path]
-        if not matching_json_pages:
-            print(f"Warning: Page with path '{next_page_path}' referenced but not found in full_json")
+        # If we are going up a level in the hierarchy, and this isn't the last branch
+        # that goes there, don't do it yet
+        all_siblings = set(prev for prev in page["direct_next_of_direct_previous"] if prev != page_path)
+        if pages_to_do.intersection(all_siblings) and hierarchy_difference < 0:
             continue
 
-        next_form_json_page = matching_json_pages[0]
-
-        generate_print_headings_for_page(
-            page=next_page,
-            form_metadata=form_metadata,
-            this_idx=new_heading_number,
-            form_json_page=next_form_json_page,
-            page_index=page_index,
-            parent_hierarchy_level=level_in_hrch,
-            pages_to_do=pages_to_do,
-            is_form_heading=False,
-            place_in_siblings_list=sibling_tracker,
-            index_of_printed_headers=index_of_printed_headers,
-            lang=lang,
-        )
-        sibling_tracker += 1
+        if pages_to_do.intersection(page["all_direct_previous"]) and hierarchy_difference < 0:
+            continue
+
+        # Work out the heading number for this page
+        base_heading_number = this_idx
+        if not is_form_heading:
+            if hierarchy_difference < 0:
+                # go back a level
+                base_heading_number = remove_lowest_in_hierarchy(base_heading_number)
+            elif hierarchy_difference > 0:
+                # increase level
+                base_heading_number = f"{this_idx}.{place_in_siblings_list}"
+
+        new_heading_number = increment_lowest_in_hierarchy(base_heading_number)
+
+        index_of_printed_headers[page_path] = {
+            "heading_number": new_heading_number,
+            "is_form_heading": is_form_heading,
+            "title": title,
+        }
+        # Make sure we don't do this page again
+        pages_to_do.remove(page_path)
+
+        # Go through and do the same for all the pages after this one
+        next_visits = []
+        for next_page_path in page["next_paths"]:
+            # Skip special paths that are added dynamically later
+            if next_page_path == "/summary":
+                continue
+
+            # Safely get the next page from the graph
+            next_page = graph.get_page(next_page_path)
+            if not next_page:
+                print(f"Warning: Page with path '{next_page_path}' referenced but not found in all_pages")
+                continue
+
+            next_visits.append(
+                (
+                    next_page,
+                    graph.page_json[next_page_path],
+                    new_heading_number,
+                    level_in_hrch,
+                    len(next_visits),
+                    False,
+                )
+            )
+        to_visit.extend(reversed(next_visits))
 
 
 def generate_print_data_for_form(section_idx: int, form_metadata: dict, form_idx: int, lang: str = "en"):
@@ -623,13 +508,13 @@ def generate_print_data_for_form(section_idx: int, form_metadata: dict, form_idx
     pages_to_do = set(p["path"] for p in form_metadata["all_pages"] if p["path"] != "/summary")
     start_page_path = form_metadata["start_page"]
     index = form_metadata["index"]
-    start_page_metadata = next(p for p in form_metadata["all_pages"] if p["path"] == start_page_path)
-    start_page_json = next(p for p in form_metadata["full_json"]["pages"] if p["path"] == start_page_path)
+    start_page_metadata = form_metadata["graph"].pages[start_page_path]
+    start_page_json = form_metadata["graph"].page_json[start_page_path]
 
     current_hierarchy_level = 0
     index_of_printed_headers = {}
-    # Generate the headings for the start page - this function is then recursive so goes down the
-    # entire tree in the form
+    # Generate the headings for the start page - this walks down from it with a stack of pages still to visit, so
+    # covers the entire tree in the form
     generate_print_headings_for_page(
         start_page_metadata,
         form_metadata,
@@ -645,13 +530,13 @@ def generate_print_data_for_form(section_idx: int, form_metadata: dict, form_idx
     )
 
     # For each page, generate the list of components to print
+    form_indexes = FormIndexes.from_form_json(form_metadata["full_json"])
     for page_path in index_of_printed_headers.keys():
-        full_json_page = next(p for p in form_metadata["full_json"]["pages"] if p["path"] == page_path)
+        full_json_page = form_metadata["graph"].page_json[page_path]
         component_display = build_components_from_page(
             full_page_json=full_json_page,
             include_html_components=(not determine_if_just_html_page(full_json_page["components"])),
-            form_lists=form_metadata["full_json"]["lists"],
-            form_conditions=form_metadata["full_json"]["conditions"],
+            form_indexes=form_indexes,
             index_of_printed_headers=index_of_printed_headers,
             lang=lang,
         )
@@ -712,6 +597,61 @@ def generate_assessment_display_info_for_fields(form_json: dict, form_name: str)
     return results
 
 
+@timed("all_questions")
+def get_print_data_for_form(form: dict, section_idx: int, form_idx: int, lang: str = "en") -> dict:
+    """Works out the hierarchy of the pages in this form and uses `generate_print_data_for_form()` to get
+    everything that needs to be printed for it.
+
+    If the form has a `hash` from the Form Store, the results are kept in `print_data_cache`, so rendering the
+    same published version of a form again doesn't need to go through its pages again. Print data from the cache
+    is shared between callers, so must not be modified.
+
+    Args:
+        form (dict): Form from the section data, with `form_data` holding the form json and optionally `hash`
+        section_idx (int): Index of the section this form is in
+        form_idx (int): Index of this form within the section
+        lang (str): Language string: `en` or `cy`
+
+    Returns:
+        dict: Print data for the form, as generated by `generate_print_data_for_form`
+    """
+    form_hash = form.get("hash")
+    cache_key = (form_hash, lang, section_idx, form_idx)
+    if form_hash:
+        print_data = print_data_cache.get(cache_key)
+        if print_data is not None:
+            return print_data
+
+    form_data = form["form_data"]
+    form_metadata = generate_metadata(form_data)
+    form_index = {}
+
+    graph = form_metadata["graph"]
+    first_page = graph.pages[graph.start_page]
+
+    # Work out what hierarchy level each page is on
+    build_hierarchy_levels_for_page(
+        page=first_page,
+        results=form_index,
+        idx=1,
+        graph=graph,
+        start_page=True,
+    )
+    form_metadata["index"] = form_index
+    form_metadata["full_json"] = form_data
+
+    print_data = generate_print_data_for_form(
+        section_idx=section_idx,
+        form_metadata=form_metadata,
+        form_idx=form_idx,
+        lang=lang,
+    )
+    if form_hash:
+        print_data_cache.set(cache_key, print_data, size=len(json.dumps(print_data)))
+    return print_data
+
+
+@timed("all_questions")
 def generate_print_data_for_sections(
     sections: list[dict],
     lang: str,
@@ -720,9 +660,7 @@ def generate_print_data_for_sections(
     """Creates a dictionary for this section containing the data to print for every form in each section
 
     Args:
-        sections (list[Section]): List of sections to generate print data
-        path_to_form_jsons (str): Absolute path to the form jsons directory
-            (eg. /dev/form-builder/fsd_config/form-jsons/cof_r2w3/en/)
+        sections (list[Section]): List of sections to generate print data, as generated by `prepare_section_data`
         lang (str): Language string: `en` or `cy`
         include_assessment_field_details (bool): Whether to include field details for display in assessment
 
@@ -747,28 +685,11 @@ def generate_print_data_for_sections(
         form_print_data = {}
         form_idx = 0
         for child_form in section["forms"]:
-            form_data = child_form["form_data"]
-            form_metadata = generate_metadata(form_data)
-            form_index = {}
-
-            first_page = next(p for p in form_metadata["all_pages"] if p["path"] == form_metadata["start_page"])
-
-            # Work out what hierarchy level each page is on
-            build_hierarchy_levels_for_page(
-                page=first_page,
-                results=form_index,
-                idx=1,
-                all_pages=form_metadata["all_pages"],
-                start_page=True,
-            )
-            form_metadata["index"] = form_index
-            form_metadata["full_json"] = form_data
-
             # Grab the print data for this form and add it to the results
             form_print_data.update(
-                generate_print_data_for_form(
+                get_print_data_for_form(
+                    child_form,
                     section_idx=section_idx,
-                    form_metadata=form_metadata,
                     form_idx=form_idx,
                     lang=lang,
                 )
@@ -791,15 +712,37 @@ def generate_print_data_for_sections(
 
 
 def prepare_section_data(round_id, api_service):
-    round_obj = get_round_by_id(round_id)
+    round_obj = get_round_graph_by_id(round_id)
     sections_in_round = round_obj.sections
+    published_forms = api_service.get_published_forms_bulk(
+        [form.url_path for section in sections_in_round for form in section.forms]
+    ).forms
+    return build_section_data(sections_in_round, published_forms)
+
+
+def build_section_data(sections_in_round, published_forms):
+    """
+    Pairs each form in the given sections with its published JSON, in the shape expected by
+    `generate_print_data_for_sections`.
+
+    Args:
+        sections_in_round (list[Section]): Sections of the round, in order
+        published_forms (dict[str, PublishedFormResponse]): Published forms keyed by URL path
+
+    Returns:
+        list[dict]: Title and forms for each section
+    """
     section_data = []
     for section in sections_in_round:
         forms = []
         for form in section.forms:
-            published_form_response = api_service.get_published_form(form.url_path)
-            if not published_form_response:
-                raise FormNotFoundError(url_path=form.url_path)
-            forms.append({"name": form.url_path, "form_data": published_form_response.published_json})
+            published_form_response = published_forms[form.url_path]
+            forms.append(
+                {
+                    "name": form.url_path,
+                    "form_data": published_form_response.published_json,
+                    "hash": published_form_response.hash,
+                }
+            )
         section_data.append({"section_title": section.name_in_apply_json["en"], "forms": forms})
     return section_data
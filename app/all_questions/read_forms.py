@@ -1,10 +1,12 @@
 import re
 
+from app.all_questions.form_indexes import FormIndexes
+
 
 def determine_display_value_for_condition(
     condition_value: str,
     list_name: str = None,
-    form_lists: list[dict] = None,
+    form_indexes: FormIndexes = None,
     lang: str = "en",
 ) -> str:
     """Determines the display value for the given condition string - either translating true/false into
@@ -14,24 +16,23 @@ def determine_display_value_for_condition(
     Args:
         condition_value (str): Value to translate
         list_name (str, optional): Name of the list for this field. Defaults to None.
-        form_lists (list[dict], optional): List of lists from the form_json to find value. Defaults to [].
+        form_indexes (FormIndexes, optional): Indexes of the lists in the form_json to find value. Defaults to no
+            lists.
         lang (str, optional): Language to use. Defaults to 'en'.
 
     Returns:
         str: The display value
     """
-    if form_lists is None:
-        form_lists = []
+    if form_indexes is None:
+        form_indexes = FormIndexes()
     if condition_value.casefold() == "true":
         return "Yes" if lang == "en" else "Ydy"
     elif condition_value.casefold() == "false":
         return "No" if lang == "en" else "Nac ydy"
     else:
         if list_name:
-            list_values = next((lizt["items"] for lizt in form_lists if lizt["name"] == list_name), None)
-            if list_values:
-                condition_text = next((item["text"] for item in list_values if item["value"] == condition_value), None)
-                return condition_text
+            if form_indexes.list_items.get(list_name):
+                return form_indexes.list_item_text[list_name].get(condition_value)
         return condition_value
 
 
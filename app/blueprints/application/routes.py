@@ -2,25 +2,30 @@ import os
 import secrets
 import shutil
 import string
+from http import HTTPStatus
+from typing import Callable, Iterator
 
 from flask import (
     Blueprint,
-    after_this_request,
+    Response,
+    abort,
+    make_response,
     redirect,
     render_template,
     request,
-    send_file,
+    stream_template,
+    stream_with_context,
     url_for,
 )
+from werkzeug.http import is_resource_modified
 
-from app.all_questions.metadata_utils import generate_print_data_for_sections, prepare_section_data
 from app.blueprints.application.forms import SectionForm, SelectApplicationForm
 from app.blueprints.application.services import create_export_zip
+from app.db.models import ExportJobStatus
 from app.db.models.application_config import Form
 from app.db.queries.application import (
     delete_form_from_section,
     delete_section_from_round,
-    get_form_by_id,
     get_section_by_id,
     insert_form,
     insert_new_section,
@@ -30,17 +35,15 @@ from app.db.queries.application import (
     move_section_up,
     update_section,
 )
+from app.db.queries.export_job import get_export_job
 from app.db.queries.fund import get_all_funds, get_fund_by_id
-from app.db.queries.round import get_round_by_id, update_round
-from app.export_config.generate_all_questions import generate_html
-from app.export_config.generate_assessment_config import (
-    generate_assessment_config_for_round,
-)
-from app.export_config.generate_fund_round_config import generate_config_for_round
-from app.export_config.generate_fund_round_form_jsons import (
-    generate_form_jsons_for_round,
-)
-from app.export_config.generate_fund_round_html import generate_all_round_html
+from app.db.queries.round import get_round_by_id, get_round_graph_by_id, update_round
+from app.export_config.all_questions_cache import QuestionHtml, get_form_question_html, get_round_question_html
+from app.export_config.export_cache import cache_export, cache_export_stream, get_cached_export, get_export_failure
+from app.export_config.export_context import ExportContext
+from app.export_config.export_jobs import enqueue_export, export_job_as_dict, start_export_worker
+from app.export_config.export_runner import run_export_generators, stream_export
+from app.shared.fingerprint import get_recent_round_fingerprint, remember_round_fingerprint
 from app.shared.form_store_api import FormNotFoundError, FormStoreAPIService
 from app.shared.forms import DeleteConfirmationForm, SelectFundForm
 from app.shared.helpers import flash_message
@@ -94,8 +97,8 @@ def build_application(round_id):
     """
     Renders a template displaying application configuration info for the chosen round
     """
-    round = get_round_by_id(round_id)
-    fund = get_fund_by_id(round.fund_id)
+    round = get_round_graph_by_id(round_id)
+    fund = round.fund
     back_link = (
         url_for("round_bp.round_details", round_id=round.round_id)
         if request.args.get("action") == "application_details"
@@ -153,50 +156,156 @@ def view_all_questions(round_id):
     """
     Generates the form data for all sections in the selected round, then uses that to generate the 'All Questions'
     data for that round and returns that to render in a template.
+
+    The HTML is only generated again when the round changes, and browsers revalidate their copy of the page with
+    the round's fingerprint. When it is generated, it's streamed to the browser a section at a time.
     """
-    api_service = FormStoreAPIService()
-    round = get_round_by_id(round_id)
-    fund = get_fund_by_id(round.fund_id)
-    section_data = prepare_section_data(round_id, api_service)
+    round = get_round_graph_by_id(round_id)
+    fund = round.fund
+    question_html = get_round_question_html(round, lang="en", stream=Config.ALL_QUESTIONS_STREAMING)
+
+    def render_page():
+        html = question_html.get_html()
+        render = render_template if isinstance(html, str) else stream_template
+        return render(
+            "view_questions.html",
+            round=round,
+            fund=fund,
+            question_html=html,
+            title=f"All Questions for {fund.short_name} - {round.short_name}",
+            all_questions_view=True,
+        )
 
-    print_data = generate_print_data_for_sections(
-        section_data,
-        lang="en",
-    )
-    html = generate_html(print_data)
-    return render_template(
-        "view_questions.html",
-        round=round,
-        fund=fund,
-        question_html=html,
-        title=f"All Questions for {fund.short_name} - {round.short_name}",
-        all_questions_view=True,
-    )
+    return _questions_response(question_html, render_page)
+
+
+def _questions_response(question_html: QuestionHtml, render: Callable[[], str | Iterator[str]]) -> Response:
+    # The page is only rendered, or got from the cache, if the browser's copy isn't current
+    if is_resource_modified(request.environ, etag=question_html.etag, last_modified=question_html.last_modified):
+        response = make_response(render())
+    else:
+        response = Response(status=HTTPStatus.NOT_MODIFIED)
+    response.set_etag(question_html.etag)
+    response.last_modified = question_html.last_modified
+    # Browsers check the page is current every time, but can show their copy while they do for a short while
+    response.cache_control.private = True
+    response.cache_control.max_age = 0
+    response.cache_control.stale_while_revalidate = Config.ALL_QUESTIONS_STALE_SECONDS
+    return response
 
 
 @application_bp.route("/<round_id>/sections/create_export_files", methods=["GET"])
 def create_export_files(round_id):
-    round_short_name = get_round_by_id(round_id).short_name
+    round = get_round_graph_by_id(round_id)
+    round_short_name = round.short_name
+    # Unchanged rounds have the same fingerprint, so it identifies the export for caching and conditional requests.
+    # It's remembered for a short while, so current exports are sent without going to the Form Store API.
+    fingerprint = get_recent_round_fingerprint(round)
+    if fingerprint is not None and (response := _current_export_response(fingerprint, round_short_name)):
+        return response
+
+    # Fetch the round's published forms once, for all of the generators to share
+    export_context = ExportContext.from_round(round)
+    fingerprint = export_context.fingerprint()
+    remember_round_fingerprint(round, fingerprint)
+    if response := _current_export_response(fingerprint, round_short_name):
+        return response
+
+    # Exports that have failed before are built first instead, so the failure is reported rather than the client
+    # being sent part of a zip file and then cut off
+    if Config.EXPORT_ZIP_STREAMING and get_export_failure(fingerprint) is None:
+        # Send the zip file as it's generated, without writing anything to disk. If the export fails part way, the
+        # response is cut off before the end of the zip file.
+        zip_stream = cache_export_stream(fingerprint, stream_export(round_id, export_context))
+        return _export_response(stream_with_context(zip_stream), fingerprint, round_short_name)
+
     # Construct the path to the output directory relative to this file's location
     random_post_fix = "".join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(5))
     base_output_dir = Config.TEMP_FILE_PATH / f"{round_short_name}-{random_post_fix}"
-    generate_form_jsons_for_round(round_id, base_output_dir)
-    generate_all_round_html(round_id, base_output_dir)
-    fund_config, round_config = generate_config_for_round(round_id, base_output_dir)
-    generate_assessment_config_for_round(fund_config, round_config, base_output_dir)
-    output_zip_path = create_export_zip(
-        directory_to_zip=base_output_dir, zip_file_name=round_short_name, random_post_fix=random_post_fix
-    )
-
-    # Ensure the file is removed after sending it
-    @after_this_request
-    def remove_file(response):
+    try:
+        run_export_generators(round_id, base_output_dir, export_context).raise_for_errors()
+        output_zip_path = create_export_zip(
+            directory_to_zip=base_output_dir, zip_file_name=round_short_name, random_post_fix=random_post_fix
+        )
+        with open(output_zip_path, "rb") as f:
+            zip_data = f.read()
         os.remove(output_zip_path)
-        shutil.rmtree(base_output_dir)
-        return response
+    finally:
+        shutil.rmtree(base_output_dir, ignore_errors=True)
+    cache_export(fingerprint, zip_data)
 
     # Return the zipped folder for the user to download
-    return send_file(output_zip_path, as_attachment=True, download_name=f"{round_short_name}.zip")
+    return _export_response(zip_data, fingerprint, round_short_name)
+
+
+def _current_export_response(fingerprint, round_short_name) -> Response | None:
+    """The response for an export that the client or the cache already has, if either does"""
+    if request.if_none_match.contains(fingerprint):
+        return _not_modified_response(fingerprint)
+    cached_zip = get_cached_export(fingerprint)
+    if cached_zip is not None:
+        return _export_response(cached_zip, fingerprint, round_short_name)
+    return None
+
+
+def _export_response(body, fingerprint, round_short_name) -> Response:
+    response = Response(
+        body,
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={round_short_name}.zip"},
+    )
+    response.set_etag(fingerprint)
+    # Let clients keep the export, but check it's still current before using it again
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def _not_modified_response(fingerprint) -> Response:
+    response = Response(status=HTTPStatus.NOT_MODIFIED)
+    del response.headers["Content-Type"]
+    response.set_etag(fingerprint)
+    return response
+
+
+@application_bp.route("/<round_id>/exports", methods=["POST"])
+def queue_export(round_id):
+    """Queues an export of the round to build in the background, returning the job to poll for its progress"""
+    export_job = enqueue_export(round_id)
+    return _export_job_status(export_job), HTTPStatus.ACCEPTED
+
+
+@application_bp.route("/<round_id>/exports/<uuid:export_job_id>", methods=["GET"])
+def export_status(round_id, export_job_id):
+    export_job = _get_export_job_or_404(round_id, export_job_id)
+    if export_job.status in (ExportJobStatus.QUEUED, ExportJobStatus.RUNNING):
+        # Makes sure a worker is running, e.g. after a restart left the job unfinished
+        start_export_worker()
+    return _export_job_status(export_job)
+
+
+@application_bp.route("/<round_id>/exports/<uuid:export_job_id>/download", methods=["GET"])
+def download_export(round_id, export_job_id):
+    export_job = _get_export_job_or_404(round_id, export_job_id)
+    if export_job.status != ExportJobStatus.COMPLETE:
+        return _export_job_status(export_job), HTTPStatus.CONFLICT
+    if request.if_none_match.contains(export_job.fingerprint):
+        return _not_modified_response(export_job.fingerprint)
+    return _export_response(export_job.artifact, export_job.fingerprint, export_job.round.short_name)
+
+
+def _get_export_job_or_404(round_id, export_job_id):
+    export_job = get_export_job(export_job_id)
+    if not export_job or str(export_job.round_id) != round_id:
+        abort(HTTPStatus.NOT_FOUND)
+    return export_job
+
+
+def _export_job_status(export_job) -> dict:
+    download_url = url_for(
+        "application_bp.download_export", round_id=export_job.round_id, export_job_id=export_job.export_job_id
+    )
+    return export_job_as_dict(export_job, download_url)
 
 
 @application_bp.route("/<round_id>/sections/create", methods=["GET", "POST"])
@@ -323,29 +432,21 @@ def view_form_questions(round_id, section_id, form_id):
     Generates the form data for this form, then uses that to generate the 'All Questions'
     data for that form and returns that to render in a template.
     """
-    api_service = FormStoreAPIService()
-    round = get_round_by_id(round_id)
-    fund = get_fund_by_id(round.fund_id)
-    form = get_form_by_id(form_id=form_id)
-    published_form_response = api_service.get_published_form(form.url_path)
-    if not published_form_response:
-        raise FormNotFoundError(url_path=form.url_path)
-    section_data = [
-        {
-            "section_title": "",  # Not used
-            "forms": [{"name": form.url_path, "form_data": published_form_response.published_json}],
-        }
-    ]
-    print_data = generate_print_data_for_sections(
-        section_data,
-        lang="en",
-    )
-    html = generate_html(print_data, False)
-    return render_template(
-        "view_questions.html",
-        round=round,
-        fund=fund,
-        question_html=html,
-        title=f"Preview of form [{published_form_response.display_name}]",
-        all_questions_view=False,
+    round = get_round_graph_by_id(round_id)
+    fund = round.fund
+    # The round's forms are already loaded, so the form is found among them rather than fetched again
+    form = next((form for section in round.sections for form in section.forms if str(form.form_id) == form_id), None)
+    if form is None:
+        abort(HTTPStatus.NOT_FOUND)
+    question_html = get_form_question_html(form, lang="en")
+    return _questions_response(
+        question_html,
+        lambda: render_template(
+            "view_questions.html",
+            round=round,
+            fund=fund,
+            question_html=question_html.get_html(),
+            title=f"Preview of form [{question_html.display_name}]",
+            all_questions_view=False,
+        ),
     )
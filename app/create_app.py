@@ -13,8 +13,12 @@ from app.blueprints.application.routes import application_bp
 from app.blueprints.fund.routes import fund_bp
 from app.blueprints.index.routes import index_bp
 from app.blueprints.round.routes import round_bp
+from app.export_config.export_jobs import export_jobs_cli
+from app.shared.cache import init_cache
 from app.shared.helpers import to_london_time
 from app.shared.page_tracker import PageTracker
+from app.shared.query_counter import init_query_counter
+from app.shared.server_timing import init_server_timing
 from config import Config
 
 PUBLIC_ROUTES = [
@@ -70,6 +74,18 @@ def create_app() -> Flask:
         compare_server_default=True,
     )
 
+    # Set up the shared cache backend chosen in config
+    init_cache(flask_app)
+
+    # Time where requests go, if SERVER_TIMING_ENABLED is set
+    init_server_timing(flask_app)
+
+    # Log how many queries each request runs, if QUERY_COUNTER_ENABLED is set
+    init_query_counter(flask_app)
+
+    # Add `flask export-jobs work`, to run background exports outside the web process
+    flask_app.cli.add_command(export_jobs_cli)
+
     if flask_app.config["FLASK_ENV"] == "development":
         from flask_debugtoolbar import DebugToolbarExtension
 
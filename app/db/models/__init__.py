@@ -3,6 +3,7 @@ from .application_config import (
     Form,
     Section,
 )
+from .export_job import ExportJob, ExportJobStatus
 from .fund import Fund, FundingType, Organisation
 from .round import Round
 
@@ -14,4 +15,6 @@ __all__ = [
     "ComponentType",
     "Organisation",
     "FundingType",
+    "ExportJob",
+    "ExportJobStatus",
 ]
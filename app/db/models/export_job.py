@@ -0,0 +1,63 @@
+import uuid
+from dataclasses import dataclass
+from enum import Enum
+
+from flask_sqlalchemy.model import DefaultMeta
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, text
+from sqlalchemy.dialects.postgresql import ENUM, UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db import db
+
+BaseModel: DefaultMeta = db.Model
+
+
+class ExportJobStatus(Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETE = "COMPLETE"
+    FAILED = "FAILED"
+
+
+@dataclass
+class ExportJob(BaseModel):
+    """An export of a round, run in the background and kept until it's downloaded.
+
+    Only one job that hasn't failed can exist for each fingerprint, so asking to export an unchanged round again
+    reuses the job that's already queued, running or complete.
+    """
+
+    __table_args__ = (
+        Index(
+            "uq_export_job_fingerprint_not_failed",
+            "fingerprint",
+            unique=True,
+            postgresql_where=text("status != 'FAILED'"),
+        ),
+    )
+    export_job_id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+    )
+    round_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("round.round_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    fingerprint = Column(String(64), nullable=False)
+    status = Column(ENUM(ExportJobStatus), default=ExportJobStatus.QUEUED, nullable=False)
+    progress = Column(Integer, default=0, nullable=False)
+    total = Column(Integer, default=0, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    artifact = Column(LargeBinary, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, onupdate=func.now(), nullable=True)
+    round = relationship("Round")
+
+    def __repr__(self):
+        return f"ExportJob({self.export_job_id}, {self.status}, {self.progress}/{self.total})"
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import func
+
+from app.db import db
+from app.db.models import ExportJob, ExportJobStatus
+
+# Export jobs are updated by workers while they use the session to read the round they are exporting, so job
+# changes made by workers go through their own connection rather than the session, which would expire the round
+# on commit.
+
+
+def get_export_job(export_job_id) -> ExportJob | None:
+    return db.session.get(ExportJob, export_job_id)
+
+
+def _get_export_job_by_fingerprint(fingerprint: str) -> ExportJob | None:
+    stmt = select(ExportJob).where(ExportJob.fingerprint == fingerprint, ExportJob.status != ExportJobStatus.FAILED)
+    return db.session.scalars(stmt).first()
+
+
+def get_or_create_export_job(round_id, fingerprint: str) -> ExportJob:
+    """
+    Gets the job that's exporting, or has exported, a round with this fingerprint, or queues a new one. Jobs that
+    failed are ignored, so asking again retries a failed export.
+
+    Args:
+        round_id (str): The unique identifier for the funding round.
+        fingerprint (str): Fingerprint of the round as it is now
+
+    Returns:
+        ExportJob: The queued, running or complete job
+    """
+    export_job = _get_export_job_by_fingerprint(fingerprint)
+    if export_job:
+        return export_job
+    export_job = ExportJob(round_id=round_id, fingerprint=fingerprint, status=ExportJobStatus.QUEUED)
+    db.session.add(export_job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Someone else queued the same export at the same time
+        db.session.rollback()
+        return _get_export_job_by_fingerprint(fingerprint)
+    current_app.logger.info(
+        "Export job queued with export_job_id: '{export_job_id}'.",
+        extra=dict(export_job_id=export_job.export_job_id),
+    )
+    return export_job
+
+
+def claim_next_export_job(stale_after: timedelta, max_attempts: int) -> tuple | None:
+    """
+    Claims the oldest queued job, marking it as running. Jobs left running by a worker that stopped sending
+    heartbeats, for example because it was restarted, are claimed again, until they have been tried max_attempts
+    times. Safe to call from several workers at once; each job is only claimed by one of them.
+
+    Args:
+        stale_after (timedelta): How long a running job can go without a heartbeat before it's claimed again
+        max_attempts (int): How many times a job is claimed before it's failed
+
+    Returns:
+        tuple | None: export_job_id, round_id and fingerprint of the claimed job, or None if there are no jobs to run
+    """
+    stale = and_(ExportJob.status == ExportJobStatus.RUNNING, ExportJob.heartbeat_at < func.now() - stale_after)
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(ExportJob)
+            .where(stale, ExportJob.attempts >= max_attempts)
+            .values(status=ExportJobStatus.FAILED, error=f"Export stopped responding {max_attempts} times")
+        )
+        claimed = connection.execute(
+            select(ExportJob.export_job_id, ExportJob.round_id, ExportJob.fingerprint)
+            .where(or_(ExportJob.status == ExportJobStatus.QUEUED, stale))
+            .order_by(ExportJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if claimed is None:
+            return None
+        connection.execute(
+            update(ExportJob)
+            .where(ExportJob.export_job_id == claimed.export_job_id)
+            .values(
+                status=ExportJobStatus.RUNNING,
+                attempts=ExportJob.attempts + 1,
+                progress=0,
+                error=None,
+                heartbeat_at=func.now(),
+            )
+        )
+    return tuple(claimed)
+
+
+def update_export_job(export_job_id, **values):
+    """Updates a job, which also counts as a heartbeat from the worker running it"""
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(ExportJob).where(ExportJob.export_job_id == export_job_id).values(heartbeat_at=func.now(), **values)
+        )
+
+
+def delete_expired_export_jobs(keep_for: timedelta) -> int:
+    """Deletes finished jobs, along with their exports, once they are older than keep_for"""
+    with db.engine.begin() as connection:
+        result = connection.execute(
+            delete(ExportJob).where(
+                ExportJob.status.in_([ExportJobStatus.COMPLETE, ExportJobStatus.FAILED]),
+                ExportJob.created_at < func.now() - keep_for,
+            )
+        )
+    return result.rowcount
@@ -0,0 +1,205 @@
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator
+
+from app.all_questions.metadata_utils import build_section_data
+from app.db.models import Form, Round
+from app.export_config.export_context import ExportContext
+from app.export_config.generate_all_questions import generate_html_for_sections, iter_html_for_sections
+from app.shared.cache import get_cache
+from app.shared.fingerprint import (
+    EXPORT_FORMAT_VERSION,
+    get_recent_round_fingerprint,
+    remember_round_fingerprint,
+    source_hash,
+)
+from app.shared.form_store_api import FormNotFoundError, FormStoreAPIService
+from config import Config
+
+# Rendered HTML is cached by what it's rendered from, so it never needs invalidating. To avoid going to the Form
+# Store API on every page load, the round's fingerprint is remembered for a while, so newly published forms can take
+# up to ALL_QUESTIONS_STALE_SECONDS to appear.
+
+
+@dataclass
+class QuestionHtml:
+    """All questions HTML rendered for a round or a form, with what's needed to validate cached copies of it. The
+    HTML is an iterator of chunks if it's being streamed, and None until `get_html()` is called if it's loaded only
+    when needed, so a request that the client's copy is still current doesn't render it."""
+
+    html: str | Iterator[str] | None
+    etag: str
+    last_modified: datetime
+    display_name: str | None = None
+    load_html: Callable[[], "QuestionHtml"] | None = field(default=None, repr=False, compare=False)
+
+    def get_html(self) -> str | Iterator[str]:
+        """The HTML, getting it from the cache or rendering it first if it hasn't been loaded yet"""
+        if self.html is None:
+            loaded = self.load_html()
+            # A form published since the ETag was worked out changes it
+            self.html, self.etag, self.last_modified = loaded.get_html(), loaded.etag, loaded.last_modified
+        return self.html
+
+
+def _load_when_needed(etag: str, load_html: Callable[[], QuestionHtml], **values) -> QuestionHtml:
+    """HTML that's only loaded by `load_html` once it's needed"""
+    return QuestionHtml(html=None, etag=etag, last_modified=_rendered_now(), load_html=load_html, **values)
+
+
+def _get_or_render(cache_key: str, render: Callable[[], QuestionHtml]) -> Callable[[], QuestionHtml]:
+    return lambda: get_cache().get_or_set(cache_key, render, ttl=Config.ALL_QUESTIONS_CACHE_TTL)
+
+
+def _rendered_now() -> datetime:
+    # HTTP dates only have whole seconds
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def get_round_question_html(round: Round, lang: str = "en", stream: bool = False) -> QuestionHtml:
+    """
+    Gets the all questions HTML for every section in a round, only rendering it when the round has changed.
+
+    Args:
+        round (Round): The round
+        lang (str): Language string: `en` or `cy`
+        stream (bool): If the HTML isn't cached, return it as an iterator of chunks rendered a section at a time,
+            rather than rendering it all first. It's cached once it has all been iterated.
+
+    Returns:
+        QuestionHtml: The HTML, with the round's fingerprint as its ETag. Unless it was cached or is being streamed,
+            it's only rendered by `get_html()`.
+    """
+    fingerprint = get_recent_round_fingerprint(round)
+    if fingerprint is not None:
+        question_html = get_cache().get(f"all-questions:{fingerprint}:{lang}")
+        if question_html is not None:
+            return question_html
+        if not stream:
+            # The ETag is known from the fingerprint, so the forms are only fetched if the page needs rendering
+            return _load_when_needed(
+                f"{fingerprint}-{lang}", lambda: _fetch_round_question_html(round, lang, stream=False)
+            )
+    return _fetch_round_question_html(round, lang, stream)
+
+
+def _fetch_round_question_html(round: Round, lang: str, stream: bool) -> QuestionHtml:
+    """Fetches the round's forms to get its all questions HTML, for when it isn't cached"""
+    cache = get_cache()
+    export_context = ExportContext.from_round(round)
+    fingerprint = export_context.fingerprint()
+    remember_round_fingerprint(round, fingerprint)
+    cache_key = f"all-questions:{fingerprint}:{lang}"
+
+    def render() -> QuestionHtml:
+        section_data = build_section_data(export_context.sections, export_context.published_forms)
+        return QuestionHtml(
+            html=(iter_html_for_sections if stream else generate_html_for_sections)(section_data, lang=lang),
+            etag=f"{fingerprint}-{lang}",
+            last_modified=_rendered_now(),
+        )
+
+    if not stream:
+        return _load_when_needed(f"{fingerprint}-{lang}", _get_or_render(cache_key, render))
+
+    question_html = cache.get(cache_key)
+    if question_html is None:
+        question_html = render()
+        question_html.html = _cache_html_stream(cache_key, question_html, question_html.html)
+    return question_html
+
+
+def _cache_html_stream(cache_key: str, question_html: QuestionHtml, chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Passes through the chunks of HTML as they're rendered, caching the whole page once it's complete. `chunks` must
+    be lazy, such as a generator, so nothing is rendered until this starts.
+
+    Like `get_or_set()`, only one request renders a page at a time. The lock is taken when streaming starts, so
+    responses that are never sent, such as a 304, don't hold it. Requests that start streaming while another is
+    rendering the page wait for it, then send the cached copy. If the page was too big to cache, they render it
+    themselves, one at a time.
+
+    Chunks are only kept while they fit within ALL_QUESTIONS_CACHE_MAX_BYTES, so streaming a bigger page still only
+    holds one section at a time. Nothing is cached if the stream fails or is abandoned part way through.
+    """
+    cache = get_cache()
+    cached = cache.get_or_lock(cache_key)
+    if cached is not None:
+        yield cached.html
+        return
+    try:
+        kept_chunks = []
+        kept_bytes = 0
+        for chunk in chunks:
+            if kept_chunks is not None:
+                kept_bytes += len(chunk)
+                if kept_bytes <= Config.ALL_QUESTIONS_CACHE_MAX_BYTES:
+                    kept_chunks.append(chunk)
+                else:
+                    kept_chunks = None
+            yield chunk
+        if kept_chunks is not None:
+            cache.set(cache_key, replace(question_html, html="".join(kept_chunks)), ttl=Config.ALL_QUESTIONS_CACHE_TTL)
+    finally:
+        cache.unlock(cache_key)
+
+
+def get_form_question_html(form: Form, lang: str = "en") -> QuestionHtml:
+    """
+    Gets the all questions HTML for a single form, only rendering it when a new version of the form is published.
+
+    Args:
+        form (Form): The form
+        lang (str): Language string: `en` or `cy`
+
+    Returns:
+        QuestionHtml: The HTML and the form's display name, with the published form's hash as its ETag. Unless it
+            was cached, it's only rendered by `get_html()`.
+
+    Raises:
+        FormNotFoundError: If the form isn't published in the Form Store
+    """
+    cache = get_cache()
+    form_hash_key = f"form-questions-hash:{form.url_path}"
+    form_hash = cache.get(form_hash_key)
+    if form_hash is not None:
+        question_html = cache.get(f"form-questions:{form_hash}:{lang}")
+        if question_html is not None:
+            return question_html
+
+    published_form_response = FormStoreAPIService().get_published_form(form.url_path)
+    if not published_form_response:
+        raise FormNotFoundError(url_path=form.url_path)
+    form_hash = source_hash(
+        EXPORT_FORMAT_VERSION,
+        form.url_path,
+        published_form_response.display_name,
+        published_form_response.hash or published_form_response.published_json,
+    )
+    cache.set(form_hash_key, form_hash, ttl=Config.ALL_QUESTIONS_STALE_SECONDS)
+
+    def render() -> QuestionHtml:
+        section_data = [
+            {
+                "section_title": "",  # Not used
+                "forms": [
+                    {
+                        "name": form.url_path,
+                        "form_data": published_form_response.published_json,
+                        "hash": published_form_response.hash,
+                    }
+                ],
+            }
+        ]
+        return QuestionHtml(
+            html=generate_html_for_sections(section_data, lang=lang, all_question_view=False),
+            etag=f"{form_hash}-{lang}",
+            last_modified=_rendered_now(),
+            display_name=published_form_response.display_name,
+        )
+
+    return _load_when_needed(
+        f"{form_hash}-{lang}",
+        _get_or_render(f"form-questions:{form_hash}:{lang}", render),
+        display_name=published_form_response.display_name,
+    )
@@ -0,0 +1,63 @@
+from typing import Iterable, Iterator
+
+from flask import current_app
+
+from app.shared.cache import get_cache
+from config import Config
+
+
+def _cache_key(fingerprint: str) -> str:
+    return f"export:{fingerprint}"
+
+
+def get_cached_export(fingerprint: str) -> bytes | None:
+    """Gets the zip file of an export previously built for this fingerprint"""
+    return get_cache().get(_cache_key(fingerprint))
+
+
+def cache_export(fingerprint: str, zip_data: bytes):
+    """Caches the zip file of an export under its fingerprint, unless it's bigger than EXPORT_CACHE_MAX_BYTES"""
+    if len(zip_data) > Config.EXPORT_CACHE_MAX_BYTES:
+        current_app.logger.info(
+            "Export {fingerprint} is too big to cache", extra=dict(fingerprint=fingerprint, size=len(zip_data))
+        )
+        return
+    get_cache().set(_cache_key(fingerprint), zip_data, ttl=Config.EXPORT_CACHE_TTL)
+
+
+def get_export_failure(fingerprint: str) -> str | None:
+    """Gets the error a stream of the export for this fingerprint failed with, if one has"""
+    return get_cache().get(f"export-failed:{fingerprint}")
+
+
+def cache_export_stream(fingerprint: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Passes through the chunks of a zip file being streamed, caching the whole file once it's complete.
+
+    Chunks are only kept while they fit within EXPORT_CACHE_MAX_BYTES, so streaming a bigger export still only
+    holds one chunk at a time. Nothing is cached if the stream fails or is abandoned part way through. If it fails,
+    the error is kept for `get_export_failure` instead.
+
+    Args:
+        fingerprint (str): Fingerprint of the export being streamed
+        chunks (Iterable[bytes]): The zip file being streamed
+
+    Yields:
+        bytes: The same chunks
+    """
+    kept_chunks = []
+    kept_bytes = 0
+    try:
+        for chunk in chunks:
+            if kept_chunks is not None:
+                kept_bytes += len(chunk)
+                if kept_bytes <= Config.EXPORT_CACHE_MAX_BYTES:
+                    kept_chunks.append(chunk)
+                else:
+                    kept_chunks = None
+            yield chunk
+    except Exception as e:
+        get_cache().set(f"export-failed:{fingerprint}", str(e), ttl=Config.EXPORT_CACHE_TTL)
+        raise
+    if kept_chunks is not None:
+        cache_export(fingerprint, b"".join(kept_chunks))
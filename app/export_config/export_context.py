@@ -0,0 +1,162 @@
+import copy
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable
+
+from flask import current_app
+from sqlalchemy import inspect
+
+from app.db import db
+from app.db.models import Form, Fund, Round, Section
+from app.db.queries.round import get_round_graph_by_id
+from app.shared.fingerprint import round_fingerprint
+from app.shared.form_store_api import FormStoreAPIService, PublishedFormResponse
+
+if TYPE_CHECKING:
+    from app.export_config.export_manifest import IncrementalExport
+
+
+class DetachedRow(SimpleNamespace):
+    """Plain copy of a row loaded from the database, with its columns and the relationships that had been loaded.
+    It isn't attached to a database session, so unlike the row it's safe to use from other threads. Relationships
+    that weren't loaded raise AttributeError rather than being loaded."""
+
+
+def _detach(row, detached: dict[int, DetachedRow]):
+    if not isinstance(row, db.Model):
+        # Not a database row, e.g. a mock in a test
+        return row
+    if id(row) in detached:
+        return detached[id(row)]
+    state = inspect(row)
+    detached_row = detached[id(row)] = DetachedRow()
+    for column in state.mapper.column_attrs:
+        # Read through the row, so anything expired is loaded now, on this thread
+        setattr(detached_row, column.key, copy.deepcopy(getattr(row, column.key)))
+    for relationship in state.mapper.relationships:
+        if relationship.key in state.unloaded:
+            continue
+        related = getattr(row, relationship.key)
+        if relationship.uselist:
+            related = [_detach(related_row, detached) for related_row in related]
+        elif related is not None:
+            related = _detach(related, detached)
+        setattr(detached_row, relationship.key, related)
+    return detached_row
+
+
+@dataclass
+class ExportContext:
+    """Everything needed to export a round, loaded once and shared by all of the export generators so none of
+    them go back to the database or the Form Store API.
+
+    Sections are in index order, and the forms within them in section_index order. The generators run in other
+    threads, so they're given a `detached()` copy.
+    """
+
+    round: Round
+    fund: Fund
+    sections: list[Section]
+    published_forms: dict[str, PublishedFormResponse]
+    # Set while exporting incrementally, to reuse outputs of forms that haven't changed since the last export
+    incremental_export: "IncrementalExport" = None
+    # Called after each form output is reused or generated, e.g. to record the progress of an export job
+    on_form_output: Callable[[], None] = None
+
+    @classmethod
+    def load(cls, round_id, api_service: FormStoreAPIService = None) -> "ExportContext":
+        """
+        Loads a round with its fund, sections and forms, and fetches the published JSON for every form in it.
+
+        Args:
+            round_id (str): The unique identifier for the funding round.
+            api_service (FormStoreAPIService, optional): Service to fetch the forms with. Defaults to a new one.
+
+        Returns:
+            ExportContext: The loaded round
+
+        Raises:
+            FormNotFoundError: If any of the round's forms aren't published in the Form Store
+        """
+        if not round_id:
+            raise ValueError("Round ID is required to export a round.")
+        return cls.from_round(get_round_graph_by_id(round_id), api_service)
+
+    @classmethod
+    def from_round(cls, round: Round, api_service: FormStoreAPIService = None) -> "ExportContext":
+        """
+        Fetches the published JSON for every form in a round that's already been loaded, as by
+        `get_round_graph_by_id`, so a page that has the round doesn't load it again.
+
+        Args:
+            round (Round): The round, with its fund, sections and forms loaded
+            api_service (FormStoreAPIService, optional): Service to fetch the forms with. Defaults to a new one.
+
+        Returns:
+            ExportContext: The loaded round
+
+        Raises:
+            FormNotFoundError: If any of the round's forms aren't published in the Form Store
+        """
+        api_service = api_service or FormStoreAPIService()
+        current_app.logger.info("Loading round {round_id} for export", extra=dict(round_id=round.round_id))
+        sections = list(round.sections)
+        published_forms = api_service.get_published_forms_bulk(
+            [form.url_path for section in sections for form in section.forms]
+        ).forms
+        return cls(round=round, fund=round.fund, sections=sections, published_forms=published_forms)
+
+    def detached(self) -> "ExportContext":
+        """
+        Copies the round, its fund, sections and forms out of the database session, so they can be used from other
+        threads. ORM rows belong to the session of the thread that loaded them, so this must be called on that
+        thread, while the session is still open.
+
+        Returns:
+            ExportContext: The copy, or this context if it's already detached
+        """
+        if isinstance(self.round, DetachedRow):
+            return self
+        detached = {}
+        return replace(
+            self,
+            round=_detach(self.round, detached),
+            fund=_detach(self.fund, detached),
+            sections=[_detach(section, detached) for section in self.sections],
+        )
+
+    @property
+    def forms(self) -> list[Form]:
+        """All forms in the round, in section order"""
+        return [form for section in self.sections for form in section.forms]
+
+    def form_output(self, output: str, output_source_hash: str, generate: Callable[[], Any]) -> Any:
+        """
+        Gets one of the outputs generated for a form, reusing it from the last export of the round when exporting
+        incrementally and its source hasn't changed.
+
+        Args:
+            output (str): Name of the output, unique within the round, e.g. `form_runner/about-your-org`
+            output_source_hash (str): Hash of everything the output is generated from
+            generate (Callable[[], Any]): Generates the output
+
+        Returns:
+            Any: The reused or generated output
+        """
+        if self.incremental_export is None:
+            form_output = generate()
+        else:
+            form_output = self.incremental_export.get_or_generate(output, output_source_hash, generate)
+        if self.on_form_output is not None:
+            self.on_form_output()
+        return form_output
+
+    def fingerprint(self) -> str:
+        """Hash of everything the export is generated from, used to cache the export and as its ETag. See
+        `round_fingerprint`."""
+        return round_fingerprint(
+            self.round,
+            self.fund,
+            self.sections,
+            {url_path: form.hash for url_path, form in self.published_forms.items()},
+        )
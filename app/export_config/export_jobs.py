@@ -0,0 +1,250 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy.exc import IntegrityError
+
+from app.db.models import ExportJob, ExportJobStatus
+from app.db.queries.export_job import (
+    claim_next_export_job,
+    delete_expired_export_jobs,
+    get_or_create_export_job,
+    update_export_job,
+)
+from app.db.queries.round import get_round_graph_by_id
+from app.export_config.export_cache import cache_export, get_cached_export
+from app.export_config.export_context import ExportContext
+from app.export_config.export_runner import stream_export
+from app.shared.fingerprint import get_round_fingerprint, remember_round_fingerprint
+from config import Config
+
+export_jobs_cli = AppGroup("export-jobs", help="Run exports queued in the background.")
+
+_executor = None
+_active_workers = 0
+_executor_lock = threading.Lock()
+
+# Outputs generated for each form: its Form Runner JSON, its HTML fragment and its assessment sub criteria
+FORM_OUTPUTS = 3
+
+
+def enqueue_export(round_id) -> ExportJob:
+    """
+    Queues an export of a round as it is now. If the round hasn't changed since it was last exported, the job
+    that's already queued, running or complete for it is returned instead. The export itself is left to the worker,
+    so only the round's fingerprint is worked out here.
+
+    Args:
+        round_id (str): The unique identifier for the funding round.
+
+    Returns:
+        ExportJob: The job exporting the round
+    """
+    fingerprint = get_round_fingerprint(get_round_graph_by_id(round_id))
+    export_job = get_or_create_export_job(round_id, fingerprint)
+    if export_job.status in (ExportJobStatus.QUEUED, ExportJobStatus.RUNNING):
+        start_export_worker()
+    return export_job
+
+
+def run_export_job(export_job_id, round_id, fingerprint: str):
+    """
+    Builds the export for a claimed job, recording progress as each form output is generated and as each file is
+    added to the zip, and stores the zip on the job once it's complete. If the round has changed since the job was
+    queued, the round as it is now is exported, and the job's fingerprint updated to match. The job is failed if the
+    export fails.
+
+    Args:
+        export_job_id (str): The job to run
+        round_id (str): The round to export
+        fingerprint (str): Fingerprint of the round when the job was queued
+    """
+    current_app.logger.info("Running export job {export_job_id}", extra=dict(export_job_id=export_job_id))
+    try:
+        with _heartbeat(export_job_id):
+            zip_data = get_cached_export(fingerprint)
+            if zip_data is None:
+                export_context = ExportContext.load(round_id)
+                if export_context.fingerprint() != fingerprint:
+                    fingerprint = _record_changed_fingerprint(export_job_id, export_context)
+                # Each form's outputs, then one file per form, the round's HTML, the fund and round config and the
+                # assessment config
+                progress = _JobProgress(export_job_id, total=len(export_context.forms) * (FORM_OUTPUTS + 1) + 3)
+                export_context.on_form_output = progress.advance
+                chunks = []
+                for chunk in stream_export(round_id, export_context):
+                    chunks.append(chunk)
+                    progress.advance()
+                zip_data = b"".join(chunks)
+                cache_export(fingerprint, zip_data)
+    except Exception as e:
+        current_app.logger.error(
+            "Export job {export_job_id} failed: {error}", extra=dict(export_job_id=export_job_id, error=str(e))
+        )
+        update_export_job(export_job_id, status=ExportJobStatus.FAILED, error=str(e))
+        return
+    update_export_job(
+        export_job_id, status=ExportJobStatus.COMPLETE, artifact=zip_data, progress=ExportJob.total, error=None
+    )
+    current_app.logger.info("Export job {export_job_id} complete", extra=dict(export_job_id=export_job_id))
+
+
+def _record_changed_fingerprint(export_job_id, export_context: ExportContext) -> str:
+    """Records the fingerprint of the round as it's actually being exported, for a round that's changed since the
+    job was queued"""
+    fingerprint = export_context.fingerprint()
+    current_app.logger.info(
+        "Round changed since export job {export_job_id} was queued, exporting it as it is now",
+        extra=dict(export_job_id=export_job_id),
+    )
+    try:
+        update_export_job(export_job_id, fingerprint=fingerprint)
+    except IntegrityError as e:
+        raise ValueError("Round has changed since the export was queued, and is already being exported.") from e
+    remember_round_fingerprint(export_context.round, fingerprint)
+    return fingerprint
+
+
+class _JobProgress:
+    """Counts the steps of a job as they're done, from whichever thread does them, recording each on the job"""
+
+    def __init__(self, export_job_id, total: int):
+        self.export_job_id = export_job_id
+        self.total = total
+        self.done = 0
+        self._lock = threading.Lock()
+        update_export_job(export_job_id, total=total)
+
+    def advance(self):
+        with self._lock:
+            self.done += 1
+            # Held while recording, so progress never goes backwards
+            update_export_job(self.export_job_id, progress=min(self.done, self.total))
+
+
+@contextmanager
+def _heartbeat(export_job_id):
+    """Sends heartbeats for a job every EXPORT_JOB_HEARTBEAT_SECONDS while it runs, so a step that takes longer
+    than EXPORT_JOB_STALE_SECONDS doesn't let another worker reclaim it"""
+    app = current_app._get_current_object()
+    stopped = threading.Event()
+
+    def send_heartbeats():
+        with app.app_context():
+            while not stopped.wait(Config.EXPORT_JOB_HEARTBEAT_SECONDS):
+                try:
+                    update_export_job(export_job_id)
+                except Exception as e:
+                    app.logger.error(
+                        "Heartbeat for export job {export_job_id} failed: {error}",
+                        extra=dict(export_job_id=export_job_id, error=str(e)),
+                    )
+
+    heartbeat = threading.Thread(target=send_heartbeats, name="export-job-heartbeat", daemon=True)
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        heartbeat.join()
+
+
+def process_export_jobs() -> int:
+    """
+    Runs queued jobs, one at a time, until there are none left.
+
+    Returns:
+        int: The number of jobs run
+    """
+    jobs_run = 0
+    while claimed := claim_next_export_job(
+        timedelta(seconds=Config.EXPORT_JOB_STALE_SECONDS), Config.EXPORT_JOB_MAX_ATTEMPTS
+    ):
+        run_export_job(*claimed)
+        jobs_run += 1
+    return jobs_run
+
+
+def start_export_worker():
+    """
+    Runs queued jobs in a background thread of this process, if EXPORT_JOBS_RUN_IN_PROCESS is on. By default it's
+    off, and they're left to the worker processes of `flask export-jobs work`. At most EXPORT_JOB_WORKERS threads
+    are started, however often this is called. Expired jobs are deleted once the queue is empty, as there may be no
+    `flask export-jobs work` to do it.
+    """
+    global _executor, _active_workers
+    if not Config.EXPORT_JOBS_RUN_IN_PROCESS:
+        return
+    app = current_app._get_current_object()
+
+    def work():
+        global _active_workers
+        try:
+            with app.app_context():
+                process_export_jobs()
+                delete_expired_export_jobs(timedelta(seconds=Config.EXPORT_JOB_RETENTION_SECONDS))
+        except Exception as e:
+            app.logger.error("Export worker failed: {error}", extra=dict(error=str(e)))
+        finally:
+            with _executor_lock:
+                _active_workers -= 1
+
+    with _executor_lock:
+        if _active_workers >= Config.EXPORT_JOB_WORKERS:
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.EXPORT_JOB_WORKERS, thread_name_prefix="export-job")
+        _active_workers += 1
+        _executor.submit(work)
+
+
+def work_on_export_jobs(poll_interval: float):
+    """Runs queued jobs forever, checking for new ones every poll_interval seconds, and deletes expired jobs"""
+    keep_for = timedelta(seconds=Config.EXPORT_JOB_RETENTION_SECONDS)
+    while True:
+        if not process_export_jobs():
+            delete_expired_export_jobs(keep_for)
+            time.sleep(poll_interval)
+
+
+def _work_in_process(poll_interval: float):
+    from app.create_app import app
+
+    with app.app_context():
+        work_on_export_jobs(poll_interval)
+
+
+@export_jobs_cli.command("work")
+@click.option("--processes", default=1, show_default=True, help="Number of worker processes to run.")
+@click.option("--poll-interval", default=2.0, show_default=True, help="Seconds to wait between checks for jobs.")
+def work(processes, poll_interval):
+    """Run queued exports until stopped. Jobs left running by a stopped worker are picked up again."""
+    if processes == 1:
+        work_on_export_jobs(poll_interval)
+        return
+    # Each process creates its own app, so none of them share database or HTTP connections
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_work_in_process, args=(poll_interval,)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def export_job_as_dict(export_job: ExportJob, download_url: str) -> dict:
+    """Status of a job, as returned when it's queued and polled"""
+    return {
+        "export_job_id": str(export_job.export_job_id),
+        "round_id": str(export_job.round_id),
+        "status": export_job.status.value,
+        "progress": export_job.progress,
+        "total": export_job.total,
+        "error": export_job.error,
+        "download_url": download_url if export_job.status == ExportJobStatus.COMPLETE else None,
+    }
@@ -0,0 +1,88 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from flask import current_app
+
+from app.shared.cache import get_cache
+from app.shared.fingerprint import EXPORT_FORMAT_VERSION
+from config import Config
+
+
+@dataclass
+class ExportManifest:
+    """Source hash of each per-form output in the last complete export of a round, keyed by output name, e.g.
+    `form_runner/about-your-org`."""
+
+    round_id: str
+    outputs: dict[str, str] = field(default_factory=dict)
+
+    @staticmethod
+    def _cache_key(round_id) -> str:
+        return f"export-manifest:{EXPORT_FORMAT_VERSION}:{round_id}"
+
+    @classmethod
+    def load(cls, round_id) -> "ExportManifest":
+        """Gets the manifest of the round's last export, or an empty one if it hasn't been exported"""
+        outputs = get_cache().get(cls._cache_key(round_id))
+        return cls(round_id=round_id, outputs=outputs or {})
+
+    def save(self):
+        get_cache().set(self._cache_key(self.round_id), self.outputs, ttl=Config.EXPORT_CACHE_TTL)
+
+
+class IncrementalExport:
+    """Keeps the per-form outputs of an export, so the next export of the round only regenerates outputs for
+    forms that have changed and reuses the rest.
+
+    Every output generated is cached by its name and source hash, and recorded in a new manifest. When `reuse` is
+    on, outputs whose source hash matches the manifest of the last export are taken from the cache instead of being
+    generated again. Generators run in parallel, so outputs can be added from several threads at once.
+    """
+
+    def __init__(self, round_id, reuse: bool = True):
+        self.previous_manifest = ExportManifest.load(round_id) if reuse else ExportManifest(round_id=round_id)
+        self.manifest = ExportManifest(round_id=round_id)
+        self.regenerated = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(output: str, output_source_hash: str) -> str:
+        return f"export-output:{EXPORT_FORMAT_VERSION}:{output}:{output_source_hash}"
+
+    def get_or_generate(self, output: str, output_source_hash: str, generate: Callable[[], Any]) -> Any:
+        """
+        Reuses an output from the last export if its source hasn't changed, otherwise generates it.
+
+        Args:
+            output (str): Name of the output, unique within the round
+            output_source_hash (str): Hash of everything the output is generated from
+            generate (Callable[[], Any]): Generates the output
+
+        Returns:
+            Any: The reused or generated output
+        """
+        cache_key = self._cache_key(output, output_source_hash)
+        value = None
+        if self.previous_manifest.outputs.get(output) == output_source_hash:
+            value = get_cache().get(cache_key)
+        if value is None:
+            value = generate()
+            get_cache().set(cache_key, value, ttl=Config.EXPORT_CACHE_TTL)
+            with self._lock:
+                self.regenerated.append(output)
+        with self._lock:
+            self.manifest.outputs[output] = output_source_hash
+        return value
+
+    def save(self):
+        """Saves the manifest once the export is complete, for the next export of the round to compare against"""
+        self.manifest.save()
+        current_app.logger.info(
+            "Export of round {round_id} regenerated {regenerated} of {total} form outputs",
+            extra=dict(
+                round_id=self.manifest.round_id,
+                regenerated=len(self.regenerated),
+                total=len(self.manifest.outputs),
+            ),
+        )
@@ -0,0 +1,148 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from flask import current_app
+
+from app.export_config.export_context import ExportContext
+from app.export_config.export_manifest import IncrementalExport
+from app.export_config.generate_assessment_config import generate_assessment_config_for_round
+from app.export_config.generate_fund_round_config import generate_config_for_round
+from app.export_config.generate_fund_round_form_jsons import generate_form_jsons_for_round
+from app.export_config.generate_fund_round_html import generate_all_round_html
+from app.export_config.zip_stream import ZipStream
+from config import Config
+
+
+class ExportError(Exception):
+    """Raised when one or more of the export generators fail"""
+
+    def __init__(self, errors: dict[str, Exception]):
+        self.errors = errors
+        self.message = "Export failed in: " + ", ".join(f"{name} ({error!r})" for name, error in errors.items())
+        super().__init__(self.message)
+
+
+@dataclass
+class ExportResults:
+    """Outputs and errors of the export generators, keyed by generator name in the order they were given"""
+
+    outputs: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    def raise_for_errors(self):
+        """Raises a single ExportError listing every generator that failed"""
+        if self.errors:
+            raise ExportError(self.errors) from next(iter(self.errors.values()))
+
+
+def run_generators(generators: dict[str, Callable[[], Any]]) -> ExportResults:
+    """
+    Runs export generators at the same time, one per worker thread. Each worker has its own app context, so
+    generators get their own database session and can log as usual. Database rows loaded on the calling thread
+    mustn't be shared with them; give them a `detached()` ExportContext instead.
+
+    A failing generator doesn't stop the others; its error is returned alongside their outputs.
+
+    Args:
+        generators (dict[str, Callable[[], Any]]): Generators to run, keyed by name
+
+    Returns:
+        ExportResults: The output or error of each generator
+    """
+    app = current_app._get_current_object()
+
+    def run(generator: Callable[[], Any]) -> Any:
+        with app.app_context():
+            return generator()
+
+    results = ExportResults()
+    if not generators:
+        return results
+    with ThreadPoolExecutor(max_workers=len(generators), thread_name_prefix="export") as executor:
+        futures = {name: executor.submit(run, generator) for name, generator in generators.items()}
+    for name, future in futures.items():
+        try:
+            results.outputs[name] = future.result()
+        except Exception as e:
+            current_app.logger.error(
+                "Export generator {generator} failed: {error}", extra=dict(generator=name, error=str(e))
+            )
+            results.errors[name] = e
+    return results
+
+
+def run_export_generators(
+    round_id, base_output_dir, export_context: ExportContext, incremental: bool = None
+) -> ExportResults:
+    """
+    Writes all of the export files for a round, running the generators in parallel.
+
+    The assessment config needs the fund and round config, so it's generated straight after them in the same
+    worker. Everything else is independent.
+
+    The outputs generated for each form are kept, along with a manifest of what they were generated from, so an
+    incremental export only regenerates them for forms that have changed since the round was last exported.
+
+    Args:
+        round_id (str): The unique identifier for the funding round.
+        base_output_dir (Path | ZipStream): Directory to write the export files to, or zip stream to add them to
+        export_context (ExportContext): The round loaded for export, on this thread or already detached
+        incremental (bool, optional): Whether to reuse outputs of unchanged forms. Defaults to EXPORT_INCREMENTAL.
+
+    Returns:
+        ExportResults: The output or error of each generator. The "config" output is the fund and round config.
+    """
+    incremental = Config.EXPORT_INCREMENTAL if incremental is None else incremental
+    export_context = export_context.detached()
+    export_context.incremental_export = IncrementalExport(round_id, reuse=incremental)
+
+    def generate_config_and_assessment():
+        fund_config, round_config = generate_config_for_round(round_id, base_output_dir, export_context)
+        generate_assessment_config_for_round(fund_config, round_config, base_output_dir, export_context)
+        return fund_config, round_config
+
+    results = run_generators(
+        {
+            "form_jsons": lambda: generate_form_jsons_for_round(round_id, base_output_dir, export_context),
+            "html": lambda: generate_all_round_html(round_id, base_output_dir, export_context),
+            "config": generate_config_and_assessment,
+        }
+    )
+    if not results.errors:
+        export_context.incremental_export.save()
+    return results
+
+
+def stream_export(round_id, export_context: ExportContext) -> ZipStream:
+    """
+    Starts generating the export files for a round in the background, straight into a zip stream.
+
+    Args:
+        round_id (str): The unique identifier for the funding round.
+        export_context (ExportContext): The round loaded for export
+
+    Returns:
+        ZipStream: The zip file, to iterate over as it's generated. Iterating raises an ExportError, without
+            finishing the zip, if any generator fails.
+    """
+    zip_stream = ZipStream()
+    app = current_app._get_current_object()
+    # The stream is generated in the background, and can outlive the request's database session
+    export_context = export_context.detached()
+
+    def generate():
+        with app.app_context():
+            try:
+                run_export_generators(round_id, zip_stream, export_context).raise_for_errors()
+            except Exception as e:
+                current_app.logger.error(
+                    "Streamed export of round {round_id} failed: {error}", extra=dict(round_id=round_id, error=str(e))
+                )
+                zip_stream.fail(e)
+            else:
+                zip_stream.finish()
+
+    threading.Thread(target=generate, name="export-stream", daemon=True).start()
+    return zip_stream
@@ -1,4 +1,17 @@
-from airium import Airium
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from app.all_questions.metadata_utils import get_print_data_for_form
+from app.all_questions.read_forms import build_section_header
+from app.export_config.html_writer import HtmlWriter
+from app.shared.lru_cache import LRUCache
+from app.shared.server_timing import timed
+from config import Config
+
+# Rendered HTML for each published form, keyed by (form hash, lang, heading number prefix)
+form_fragment_cache = LRUCache(max_bytes=Config.FORM_FRAGMENT_CACHE_MAX_BYTES)
+
+SECTION_BREAK_CLASS = "govuk-section-break govuk-section-break--l govuk-section-break--visible"
 
 # --------------------------
 # Boilerplate HTML Templates
@@ -27,7 +40,7 @@ BOILERPLATE_END = """
 # --------------------------
 # Table of Contents Section
 # --------------------------
-def generate_table_of_contents(air, sections):
+def generate_table_of_contents(html: HtmlWriter, sections):
     """
     Generates a table of contents from the given sections.
 
@@ -38,19 +51,19 @@ def generate_table_of_contents(air, sections):
         <li><a class="govuk-link" href="#section2">Section 2</a></li>
     </ol>
     """
-    with air.h2(klass="govuk-heading-m"):
-        air("Table of contents")
-    with air.ol(klass="govuk-list govuk-list--number"):
-        for anchor, details in sections.items():
-            with air.li():
-                with air.a(klass="govuk-link", href=f"#{anchor}"):
-                    air(details["title_text"])
+    html.element("h2", "Table of contents", klass="govuk-heading-m")
+    html.open("ol", klass="govuk-list govuk-list--number")
+    for anchor, details in sections.items():
+        html.open("li")
+        html.element("a", details["title_text"], klass="govuk-link", href=f"#{anchor}")
+        html.close("li")
+    html.close("ol")
 
 
 # --------------------------
 # Component Rendering Section
 # --------------------------
-def render_components(air, components):
+def render_components(html: HtmlWriter, components):
     """
     Renders components within a page.
 
@@ -69,25 +82,25 @@ def render_components(air, components):
         text_list = component.get("text", [])
 
         if (title and not component.get("hide_title")) or text_list:
-            with air.div(klass="govuk-body"):
-                if title and not component.get("hide_title"):
-                    with air.p(klass="govuk-body"):
-                        air(title)
-
-                for text in text_list:
-                    if isinstance(text, list):
-                        with air.ul(klass="govuk-list govuk-list--bullet"):
-                            for bullet in text:
-                                with air.li():
-                                    air(bullet)
-                    else:
-                        with air.p(klass="govuk-body"):
-                            air(text)
+            html.open("div", klass="govuk-body")
+            if title and not component.get("hide_title"):
+                html.element("p", title, klass="govuk-body")
+
+            for text in text_list:
+                if isinstance(text, list):
+                    html.open("ul", klass="govuk-list govuk-list--bullet")
+                    for bullet in text:
+                        html.element("li", bullet)
+                    html.close("ul")
+                else:
+                    html.element("p", text, klass="govuk-body")
+            html.close("div")
 
 
 # --------------------------
 # Main HTML Generation Section
 # --------------------------
+@timed("all_questions")
 def generate_html(sections, all_question_view=True):
     """
     Generates an HTML document for the given sections.
@@ -99,30 +112,190 @@ def generate_html(sections, all_question_view=True):
         <p class="govuk-body">Question Text</p>
     </div>
     """
-    air = Airium()
-    with air.div(klass="govuk-!-margin-bottom-8"):
+    html = HtmlWriter()
+    html.open("div", klass="govuk-!-margin-bottom-8")
+    if all_question_view:
+        generate_table_of_contents(html, sections)
+        html.void("hr", klass=SECTION_BREAK_CLASS)
+
+    for idx, (anchor, details) in enumerate(sections.items(), start=1):
+        if anchor == "assessment_display_info":
+            continue
+
         if all_question_view:
-            generate_table_of_contents(air, sections)
-            air.hr(klass="govuk-section-break govuk-section-break--l govuk-section-break--visible")
+            html.element("h2", f"{idx}. {details['title_text']}", klass="govuk-heading-l", id=anchor)
+
+        render_headings(html, details["form_print_data"])
+    html.close("div")
+
+    return str(html)
+
+
+def render_headings(html: HtmlWriter, form_print_data):
+    """
+    Renders the headings of the pages in one or more forms, each followed by its components, in heading number
+    order.
+    """
+    for _, header_info in _sorted_headings(form_print_data):
+        tag = "h3" if header_info["is_form_heading"] else "h4"
+        html.element(tag, header_info["title"], klass=f"govuk-heading-{'m' if tag == 'h3' else 's'}")
+
+        render_components(html, header_info["components"])
+        html.void("hr", klass=SECTION_BREAK_CLASS)
+
+
+def _sorted_headings(form_print_data: dict) -> list:
+    return sorted(form_print_data.items(), key=lambda item: str(item[1]["heading_number"]))
+
+
+# --------------------------
+# Per Form Fragment Section
+# --------------------------
+@dataclass
+class FormFragment:
+    """HTML for the headings of a single form, as it appears inside the page for a whole round, along with the
+    page path and heading number of each heading so fragments can be put in order"""
+
+    html: str
+    headings: list[tuple[str, str]]
+
+
+def _render_fragment(render: Callable[[HtmlWriter], None]) -> str:
+    # Fragments sit directly inside the page's outer div, so are indented one level
+    html = HtmlWriter(level=1)
+    render(html)
+    return str(html)
 
-        for idx, (anchor, details) in enumerate(sections.items(), start=1):
-            if anchor == "assessment_display_info":
-                continue
 
-            if all_question_view:
-                with air.h2(klass="govuk-heading-l", id=anchor):
-                    air(f"{idx}. {details['title_text']}")
+def get_form_fragment(form: dict, section_idx: int, form_idx: int, lang: str = "en") -> FormFragment:
+    """
+    Renders the HTML for one form, numbered for its place in the round.
+
+    If the form has a `hash` from the Form Store, the fragment is kept in `form_fragment_cache`, so the same
+    published version of a form in the same place is only rendered once.
+
+    Args:
+        form (dict): Form from the section data, with `form_data` holding the form json and optionally `hash`
+        section_idx (int): Index of the section this form is in
+        form_idx (int): Index of this form within the section
+        lang (str): Language string: `en` or `cy`
+
+    Returns:
+        FormFragment: The form's HTML
+    """
+    form_hash = form.get("hash")
+    cache_key = (form_hash, lang, f"{section_idx}.{form_idx}")
+    if form_hash:
+        fragment = form_fragment_cache.get(cache_key)
+        if fragment is not None:
+            return fragment
+
+    form_print_data = get_print_data_for_form(form, section_idx=section_idx, form_idx=form_idx, lang=lang)
+    fragment = FormFragment(
+        html=_render_fragment(lambda html: render_headings(html, form_print_data)),
+        headings=[(path, str(header_info["heading_number"])) for path, header_info in form_print_data.items()],
+    )
+    if form_hash:
+        form_fragment_cache.set(cache_key, fragment, size=len(fragment.html))
+    return fragment
+
+
+def _render_section_forms(section: dict, fragments: list[FormFragment], section_idx: int, lang: str) -> list[str]:
+    """Puts the fragments for the forms in a section in the order `generate_html` renders their headings"""
+    headings = [(form_no, heading) for form_no, fragment in enumerate(fragments) for heading in fragment.headings]
+    page_paths = [path for fragment in fragments for path, _ in fragment.headings]
+    form_order = []
+    for form_no, _ in sorted(headings, key=lambda item: item[1][1]):
+        if not form_order or form_order[-1] != form_no:
+            form_order.append(form_no)
+    if len(page_paths) == len(set(page_paths)) and len(form_order) == len(set(form_order)):
+        return [fragments[form_no].html for form_no in form_order]
+
+    # Forms in this section share page paths, and only the last page with each path is shown, or their headings
+    # are interleaved, so render the section as a whole
+    form_print_data = {}
+    for form_idx, form in enumerate(section["forms"]):
+        form_print_data.update(get_print_data_for_form(form, section_idx=section_idx, form_idx=form_idx, lang=lang))
+    return [_render_fragment(lambda html: render_headings(html, form_print_data))]
+
+
+@timed("all_questions")
+def generate_html_for_sections(
+    sections: list[dict],
+    lang: str = "en",
+    all_question_view: bool = True,
+    get_fragment: Callable[..., FormFragment] = None,
+) -> str:
+    """
+    Generates the same HTML as `generate_html` does for the print data of these sections, but from HTML rendered
+    for each form separately. Forms that have been rendered before, in the same place, aren't rendered again.
+
+    Args:
+        sections (list[dict]): Sections as generated by `build_section_data`
+        lang (str): Language string: `en` or `cy`
+        all_question_view (bool): Whether to include the table of contents and section headings
+        get_fragment (Callable[..., FormFragment], optional): Gets the HTML for each form, taking the same
+            arguments as `get_form_fragment`. Defaults to `get_form_fragment`.
+
+    Returns:
+        str: The HTML
+    """
+    return "".join(iter_html_for_sections(sections, lang, all_question_view, get_fragment))
+
 
-            for _, header_info in sorted(
-                details["form_print_data"].items(), key=lambda item: str(item[1]["heading_number"])
-            ):
-                tag = "h3" if header_info["is_form_heading"] else "h4"
-                heading_text = header_info["title"]
+def iter_html_for_sections(
+    sections: list[dict],
+    lang: str = "en",
+    all_question_view: bool = True,
+    get_fragment: Callable[..., FormFragment] = None,
+) -> Iterator[str]:
+    """
+    Generates the HTML `generate_html_for_sections` does a section at a time, so it can be sent as it's rendered.
+    The forms in each section aren't rendered until that section is reached, so only one section's HTML is held at
+    once.
 
-                with getattr(air, tag)(klass=f"govuk-heading-{'m' if tag == 'h3' else 's'}"):
-                    air(heading_text)
+    Args:
+        sections (list[dict]): Sections as generated by `build_section_data`
+        lang (str): Language string: `en` or `cy`
+        all_question_view (bool): Whether to include the table of contents and section headings
+        get_fragment (Callable[..., FormFragment], optional): Gets the HTML for each form, taking the same
+            arguments as `get_form_fragment`. Defaults to `get_form_fragment`.
+
+    Yields:
+        str: Chunks of the HTML, which joined together are the whole page
+    """
+    get_fragment = get_fragment or get_form_fragment
+    # Keyed by anchor like the print data, so a section with the same title as an earlier one is shown in its place
+    sections_by_anchor = {}
+    for section_idx, section in enumerate(sections, start=1):
+        anchor, text = build_section_header(section["section_title"], lang=lang)
+        sections_by_anchor[anchor] = (text, section_idx, section)
+
+    def render_table_of_contents(html):
+        generate_table_of_contents(
+            html, {anchor: {"title_text": text} for anchor, (text, _, _) in sections_by_anchor.items()}
+        )
+        html.void("hr", klass=SECTION_BREAK_CLASS)
+
+    yield '<div class="govuk-!-margin-bottom-8">'
+    if all_question_view:
+        yield "\n" + _render_fragment(render_table_of_contents)
+    for idx, (anchor, (text, section_idx, section)) in enumerate(sections_by_anchor.items(), start=1):
+        if anchor == "assessment_display_info":
+            continue
+        if all_question_view:
+            yield "\n" + _render_section_heading(anchor, f"{idx}. {text}")
+        fragments = [
+            get_fragment(form, section_idx=section_idx, form_idx=form_idx, lang=lang)
+            for form_idx, form in enumerate(section["forms"])
+        ]
+        for part in _render_section_forms(section, fragments, section_idx, lang):
+            if part:
+                yield "\n" + part
+    yield "\n</div>"
 
-                render_components(air, header_info["components"])
-                air.hr(klass="govuk-section-break govuk-section-break--l govuk-section-break--visible")
 
-    return str(air)
+def _render_section_heading(anchor: str, heading_text: str) -> str:
+    html = HtmlWriter(level=1)
+    html.element("h2", heading_text, klass="govuk-heading-l", id=anchor)
+    return str(html)
@@ -2,11 +2,12 @@ import copy
 import json
 
 from app.all_questions.metadata_utils import form_json_to_assessment_display_types
-from app.db import db
-from app.db.models import Form, Section
+from app.db.models import Form
 from app.db.models.application_config import READ_ONLY_COMPONENTS, ComponentType
 from app.export_config import helpers
-from app.shared.form_store_api import FormNotFoundError, FormStoreAPIService
+from app.export_config.export_context import ExportContext
+from app.shared.fingerprint import source_hash
+from app.shared.form_store_api import PublishedFormResponse
 from app.shared.helpers import find_enum, human_to_kebab_case
 
 
@@ -17,15 +18,48 @@ def _get_component_type(component: dict) -> ComponentType:
     return established_component_type
 
 
-def generate_assessment_config_for_round(fund_config, round_config, base_output_dir):
+def _generate_sub_criteria(form: Form, published_form_response: PublishedFormResponse) -> dict:
+    """Generates the sub-criteria for a form, with a theme for each of its pages"""
+    sc = {
+        "id": form.url_path,
+        "name": published_form_response.display_name,
+        "themes": [],
+    }
+    for page in published_form_response.published_json.get("pages"):
+        page: dict
+        if page.get("path").lstrip("/") == "summary":
+            continue
+        theme = {
+            "id": human_to_kebab_case(page.get("title")),
+            "name": page.get("title"),
+            "answers": [],
+        }
+        for component in page.get("components"):
+            component: dict
+            component_type = _get_component_type(component)
+            if component_type in READ_ONLY_COMPONENTS:
+                continue
+            answer = {
+                "field_id": component.get("name"),
+                "form_name": form.url_path,
+                "field_type": component_type.value[0].lower() + component_type.value[1:],
+                "presentation_type": form_json_to_assessment_display_types.get(component_type.name, "text"),
+                "question": component.get("title"),
+            }
+            theme["answers"].append(answer)
+        sc["themes"].append(theme)
+    return sc
+
+
+def generate_assessment_config_for_round(
+    fund_config, round_config, base_output_dir, export_context: ExportContext = None
+):
     # The following config is not tested for production use
     # It is generated to make local testing easier - you can add an application to fab and export it with a basic
     # auto-generated assessment config.
     # Each form is a sub-critiera, each page a theme. Half scored, half unscored.
     # The output in the assessment_store folder needs to be added to the
     # assessment_mapping_fund_round file in assessment-store
-    api_service = FormStoreAPIService()
-
     fund_id = fund_config["id"]
     round_id = round_config["id"]
     fund_short_name = fund_config["short_name"]
@@ -33,11 +67,10 @@ def generate_assessment_config_for_round(fund_config, round_config, base_output_
     fund_round = f"{str.upper(fund_short_name)}{str.upper(round_short_name)}"
     fund_round_ids = f"{fund_id}:{round_id}"
 
+    export_context = export_context or ExportContext.load(round_id)
+
     unscored = []
-    sections: list[Section] = (
-        db.session.query(Section).filter(Section.round_id == round_id).order_by(Section.index).all()
-    )
-    for _i, section in enumerate(sections, start=1):
+    for _i, section in enumerate(export_context.sections, start=1):
         criteria = {
             "id": human_to_kebab_case(section.name_in_apply_json["en"]),
             "name": section.name_in_apply_json["en"],
@@ -47,38 +80,15 @@ def generate_assessment_config_for_round(fund_config, round_config, base_output_
 
         for form in section.forms:
             form: Form
-            published_form_response = api_service.get_published_form(form.url_path)
-            if not published_form_response:
-                raise FormNotFoundError(url_path=form.url_path)
-            sc = {
-                "id": form.url_path,
-                "name": published_form_response.display_name,
-                "themes": [],
-            }
-            for page in published_form_response.published_json.get("pages"):
-                page: dict
-                if page.get("path").lstrip("/") == "summary":
-                    continue
-                theme = {
-                    "id": human_to_kebab_case(page.get("title")),
-                    "name": page.get("title"),
-                    "answers": [],
-                }
-                for component in page.get("components"):
-                    component: dict
-                    component_type = _get_component_type(component)
-                    if component_type in READ_ONLY_COMPONENTS:
-                        continue
-                    answer = {
-                        "field_id": component.get("name"),
-                        "form_name": form.url_path,
-                        "field_type": component_type.value[0].lower() + component_type.value[1:],
-                        "presentation_type": form_json_to_assessment_display_types.get(component_type.name, "text"),
-                        "question": component.get("title"),
-                    }
-                    theme["answers"].append(answer)
-                sc["themes"].append(theme)
-            criteria["sub_criteria"].append(sc)
+            published_form_response = export_context.published_forms[form.url_path]
+            sub_criteria = export_context.form_output(
+                f"assessment_store/{form.url_path}",
+                source_hash(published_form_response.hash, form.url_path, published_form_response.display_name),
+                lambda form=form, published_form_response=published_form_response: _generate_sub_criteria(
+                    form, published_form_response
+                ),
+            )
+            criteria["sub_criteria"].append(sub_criteria)
     assess_output = copy.deepcopy(helpers.assess_output)
     assess_output = assess_output.substitute(
         fund_round=fund_round,
@@ -2,13 +2,10 @@ import copy
 
 from flask import current_app
 
-from app.db import db
-from app.db.models import Form, Section
-from app.db.queries.fund import get_fund_by_id
-from app.db.queries.round import get_round_by_id
+from app.export_config.export_context import ExportContext
 from app.export_config.helpers import write_config
 from app.shared.data_classes import FundExport, FundSectionForm, FundSectionSection, RoundExport
-from app.shared.form_store_api import FormNotFoundError, FormStoreAPIService
+from app.shared.form_store_api import FormNotFoundError
 
 # TODO : The Round path might be better as a placeholder to avoid conflict in the actual fund store.
 # Decide on this further down the line.
@@ -32,19 +29,18 @@ ROUND_BASE_PATHS = {
 TEMPLATE_FUND_ROUND_EXPORT = {"sections_config": [], "fund_config": {}, "round_config": [], "base_path": None}
 
 
-def generate_application_display_config(round_id):
-    api_service = FormStoreAPIService()
+def generate_application_display_config(round_id, export_context: ExportContext = None):
+    export_context = export_context or ExportContext.load(round_id)
 
     ordered_sections = []
     # get round
-    round = get_round_by_id(round_id)
+    round = export_context.round
     round_base_path = (
         round.section_base_path
     )  # ROUND_BASE_PATHS.get(round.short_name, 0)  # so this works for dummy data
     application_base_path = f"{round_base_path}.1"
-    TEMPLATE_FUND_ROUND_EXPORT["base_path"] = round_base_path
-    "sort by Section.index"
-    sections = db.session.query(Section).filter(Section.round_id == round_id).order_by(Section.index).all()
+    # export_context.sections are already sorted by Section.index
+    sections = export_context.sections
     current_app.logger.info("Generating application display config for round {round_id}", extra=dict(round_id=round_id))
 
     for original_section in sections:
@@ -59,11 +55,11 @@ def generate_application_display_config(round_id):
                 section_name=section.name_in_apply_json, tree_path=f"{application_base_path}.{section.index}"
             ).as_dict()
         )
-        forms = db.session.query(Form).filter(Form.section_id == section.section_id).order_by(Form.section_index).all()
-        for original_form in forms:
+        for original_form in original_section.forms:
             # Create a deep copy of the form object
             form = copy.deepcopy(original_form)
-            display_name = api_service.get_display_name_from_url_path(form.url_path)
+            published_form = export_context.published_forms.get(form.url_path)
+            display_name = published_form.display_name if published_form else None
             if not display_name:
                 raise FormNotFoundError(url_path=form.url_path)
             name_in_apply_json = {"en": f"{section.index}.{form.section_index} {display_name}", "cy": ""}
@@ -81,10 +77,10 @@ def generate_application_display_config(round_id):
     return ordered_sections
 
 
-def generate_fund_config(round_id):
-    round = get_round_by_id(round_id)
-    fund_id = round.fund_id
-    fund = get_fund_by_id(fund_id)
+def generate_fund_config(round_id, export_context: ExportContext = None):
+    export_context = export_context or ExportContext.load(round_id)
+    fund_id = export_context.round.fund_id
+    fund = export_context.fund
     current_app.logger.info("Generating fund config for fund {fund_id}", extra=dict(fund_id=fund_id))
 
     fund_export = FundExport(
@@ -100,8 +96,9 @@ def generate_fund_config(round_id):
     return fund_export.as_dict()
 
 
-def generate_round_config(round_id):
-    round = get_round_by_id(round_id)
+def generate_round_config(round_id, export_context: ExportContext = None):
+    export_context = export_context or ExportContext.load(round_id)
+    round = export_context.round
     current_app.logger.info("Generating round config for round {round_id}", extra=dict(round_id=round_id))
 
     round_export = RoundExport(
@@ -137,7 +134,7 @@ def generate_round_config(round_id):
     return round_export.as_dict()
 
 
-def generate_config_for_round(round_id, base_output_dir=None):
+def generate_config_for_round(round_id, base_output_dir=None, export_context: ExportContext = None):
     """
     Generates configuration for a specific funding round.
 
@@ -147,6 +144,7 @@ def generate_config_for_round(round_id, base_output_dir=None):
 
     Args:
         round_id (str): The unique identifier for the funding round.
+        export_context (ExportContext, optional): The round already loaded for export. Loaded if not given.
 
     The functions called within this function are:
     - generate_fund_config: Generates the fund configuration for the given round ID.
@@ -155,13 +153,16 @@ def generate_config_for_round(round_id, base_output_dir=None):
     """
     if round_id is None:
         raise ValueError("Valid round ID is required to generate configuration.")
-    fund_config = generate_fund_config(round_id)
-    TEMPLATE_FUND_ROUND_EXPORT["fund_config"] = fund_config
-    round_config = generate_round_config(round_id)
-    TEMPLATE_FUND_ROUND_EXPORT["round_config"] = round_config
-    round_display_config = generate_application_display_config(round_id)
-    TEMPLATE_FUND_ROUND_EXPORT["sections_config"] = round_display_config
-    fund_round_export = TEMPLATE_FUND_ROUND_EXPORT
+    export_context = export_context or ExportContext.load(round_id)
+    # Exports run concurrently, so each one fills in its own copy of the template
+    fund_round_export = copy.deepcopy(TEMPLATE_FUND_ROUND_EXPORT)
+    fund_round_export["base_path"] = export_context.round.section_base_path
+    fund_config = generate_fund_config(round_id, export_context)
+    fund_round_export["fund_config"] = fund_config
+    round_config = generate_round_config(round_id, export_context)
+    fund_round_export["round_config"] = round_config
+    round_display_config = generate_application_display_config(round_id, export_context)
+    fund_round_export["sections_config"] = round_display_config
     write_config(
         fund_round_export,
         fund_config["short_name"],
@@ -3,13 +3,13 @@ import json
 from flask import current_app
 from jsonschema import ValidationError
 
-from app.db.queries.round import get_round_by_id
+from app.export_config.export_context import ExportContext
 from app.export_config.helpers import write_config
-from app.shared.form_store_api import FormNotFoundError, FormStoreAPIService
+from app.shared.fingerprint import source_hash
 from app.shared.json_validation import validate_form_json
 
 
-def generate_form_jsons_for_round(round_id, base_output_dir=None):
+def generate_form_jsons_for_round(round_id, base_output_dir=None, export_context: ExportContext = None):
     """
     Generates JSON configurations for all forms associated with a given funding round.
 
@@ -19,26 +19,33 @@ def generate_form_jsons_for_round(round_id, base_output_dir=None):
 
     Args:
         round_id (str): The unique identifier for the funding round.
+        export_context (ExportContext, optional): The round already loaded for export. Loaded if not given.
 
     The generated files are named after the form names and are stored in a directory
     corresponding to the round's short name.
     """
-    api_service = FormStoreAPIService()
     if not round_id:
         raise ValueError("Round ID is required to generate form JSONs.")
-    round = get_round_by_id(round_id)
+    export_context = export_context or ExportContext.load(round_id)
+    round = export_context.round
     current_app.logger.info("Generating form JSONs for round {round_id}", extra=dict(round_id=round_id))
-    for section in round.sections:
+    for section in export_context.sections:
         for form in section.forms:
-            published_form_response = api_service.get_published_form(form.url_path)
-            if not published_form_response:
-                raise FormNotFoundError(url_path=form.url_path)
+            published_form_response = export_context.published_forms[form.url_path]
             try:
-                validate_form_json(published_form_response.published_json)
-                form_json = json.dumps(published_form_response.published_json, indent=4)
+                form_json = export_context.form_output(
+                    f"form_runner/{form.url_path}",
+                    source_hash(published_form_response.hash),
+                    lambda published_json=published_form_response.published_json: _render_form_json(published_json),
+                )
                 write_config(form_json, form.url_path, round.short_name, "form_json", base_output_dir)
             except ValidationError:
                 current_app.logger.error(
                     "Form JSON for {url_path} is invalid.",
                     extra=dict(url_path=form.url_path),
                 )
+
+
+def _render_form_json(published_json: dict) -> str:
+    validate_form_json(published_json)
+    return json.dumps(published_json, indent=4)
@@ -1,11 +1,10 @@
 from flask import current_app
 
-from app.all_questions.metadata_utils import generate_print_data_for_sections, prepare_section_data
-from app.db.queries.fund import get_fund_by_id
-from app.db.queries.round import get_round_by_id
-from app.export_config.generate_all_questions import generate_html
+from app.all_questions.metadata_utils import build_section_data
+from app.export_config.export_context import ExportContext
+from app.export_config.generate_all_questions import FormFragment, generate_html_for_sections, get_form_fragment
 from app.export_config.helpers import write_config
-from app.shared.form_store_api import FormStoreAPIService
+from app.shared.fingerprint import source_hash
 
 frontend_html_prefix = """
 {% extends "apply/base.html" %}
@@ -29,7 +28,7 @@ frontend_html_suffix = """
 """
 
 
-def generate_all_round_html(round_id, base_output_dir=None):
+def generate_all_round_html(round_id, base_output_dir=None, export_context: ExportContext = None):
     """
     Generates an HTML representation for a specific funding round.
 
@@ -40,32 +39,37 @@ def generate_all_round_html(round_id, base_output_dir=None):
 
     Args:
         round_id (str): The unique identifier for the funding round.
+        export_context (ExportContext, optional): The round already loaded for export. Loaded if not given.
 
     The process involves:
     1. Fetching the round details using its ID.
     2. Collecting data for each section and its forms within the round.
-    3. Generating print data for the sections.
-    4. Converting the print data into HTML content.
+    3. Rendering HTML for each form, reusing any forms rendered before in the same place.
+    4. Putting the HTML for the forms together into the HTML content for the round.
     5. Writing the HTML content to a file named 'html_full' within a directory
        corresponding to the round's short name.
 
     The generated HTML is intended to provide a comprehensive overview of the round,
     including details of each section and form, for printing or web display purposes.
     """
-    api_service = FormStoreAPIService()
     if not round_id:
         raise ValueError("Round ID is required to generate HTML.")
     current_app.logger.info("Generating HTML for round {round_id}", extra=dict(round_id=round_id))
-    round = get_round_by_id(round_id)
-    fund = get_fund_by_id(round.fund_id)
-    section_data = prepare_section_data(round_id, api_service)
+    export_context = export_context or ExportContext.load(round_id)
+    round = export_context.round
+    fund = export_context.fund
+    section_data = build_section_data(export_context.sections, export_context.published_forms)
+
+    def get_fragment(form: dict, section_idx: int, form_idx: int, lang: str) -> FormFragment:
+        # Fragments are numbered by where the form is in the round, so moving a form changes them too
+        return export_context.form_output(
+            f"html/{form['name']}",
+            source_hash(form["hash"], lang, section_idx, form_idx),
+            lambda: get_form_fragment(form, section_idx=section_idx, form_idx=form_idx, lang=lang),
+        )
 
-    print_data = generate_print_data_for_sections(
-        section_data,
-        lang="en",
-    )
     html_content = frontend_html_prefix
-    html_content += generate_html(print_data)
+    html_content += generate_html_for_sections(section_data, lang="en", get_fragment=get_fragment)
     html_content += frontend_html_suffix
     write_config(
         html_content,
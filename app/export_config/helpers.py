@@ -1,19 +1,26 @@
 import os
+from pathlib import PurePosixPath
 from string import Template
 
+from app.export_config.zip_stream import ZipStream
 from app.shared.helpers import convert_to_dict, human_to_kebab_case, human_to_snake_case
 from config import Config
 
 
-def write_config(config, filename, round_short_name, config_type, base_output_dir=None):
-    # Get the directory of the current file
+def render_config(config, filename, config_type) -> tuple[PurePosixPath, str]:
+    """
+    Renders a generated config as the contents of an export file.
 
-    # Construct the path to the output directory relative to this file's location
-    if base_output_dir is None:
-        base_output_dir = Config.TEMP_FILE_PATH / round_short_name
+    Args:
+        config: The generated config
+        filename (str): Name of the file, without its directory
+        config_type (str): One of form_json, python_file, html or assessment
 
+    Returns:
+        tuple[PurePosixPath, str]: Path of the file within the export, and its contents
+    """
     if config_type == "form_json":
-        output_dir = base_output_dir / "form_runner"
+        output_dir = PurePosixPath("form_runner")
         content_to_write = config
         # Ensure the filename ends with .json
         if not filename.endswith(".json"):
@@ -24,34 +31,54 @@ def write_config(config, filename, round_short_name, config_type, base_output_di
             filename = f"{filename}.json"
         file_path = output_dir / f"{human_to_kebab_case(filename)}"
     elif config_type == "python_file":
-        output_dir = base_output_dir / "fund_store"
+        output_dir = PurePosixPath("fund_store")
         config_dict = convert_to_dict(config)  # Convert config to dict for non-JSON types
         content_to_write = "LOADER_CONFIG="
         content_to_write += str(config_dict)
+        content_to_write += "\n"  # Printed rather than written, so ends with a newline
         file_path = output_dir / f"{human_to_snake_case(filename)}.py"
     elif config_type == "html":
-        output_dir = base_output_dir / "html"
+        output_dir = PurePosixPath("html")
         content_to_write = config
         file_path = output_dir / f"{filename}_all_questions_en.html"
-
     elif config_type == "assessment":
-        output_dir = base_output_dir / "assessment_store"
+        output_dir = PurePosixPath("assessment_store")
         content_to_write = str(config)
         file_path = output_dir / f"{human_to_snake_case(filename)}.py"
+    else:
+        raise ValueError(f"Unknown config type: {config_type}")
+    return file_path, content_to_write
+
+
+def write_config(config, filename, round_short_name, config_type, base_output_dir=None):
+    """
+    Writes a generated config to its export file.
+
+    Args:
+        config: The generated config
+        filename (str): Name of the file, without its directory
+        round_short_name (str): Short name of the round, used for the directory if base_output_dir isn't given
+        config_type (str): One of form_json, python_file, html or assessment
+        base_output_dir (Path | ZipStream, optional): Directory to write the file under, or a zip stream to add
+            it to. Defaults to a directory named after the round in TEMP_FILE_PATH.
+    """
+    relative_path, content_to_write = render_config(config, filename, config_type)
+
+    if isinstance(base_output_dir, ZipStream):
+        base_output_dir.write(relative_path, content_to_write)
+        return
+
+    # Construct the path to the output directory relative to this file's location
+    if base_output_dir is None:
+        base_output_dir = Config.TEMP_FILE_PATH / round_short_name
+    file_path = base_output_dir / relative_path
 
     # Ensure the output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(file_path.parent, exist_ok=True)
 
     # Write the content to the file
     with open(file_path, "w") as f:
-        if config_type == "form_json":
-            f.write(content_to_write)  # Write JSON string directly
-        elif config_type == "python_file":
-            print(content_to_write, file=f)  # Print the dictionary for non-JSON types
-        elif config_type == "html":
-            f.write(content_to_write)
-        elif config_type == "assessment":
-            f.write(content_to_write)
+        f.write(content_to_write)
 
 
 assess_output = Template(
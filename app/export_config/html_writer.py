@@ -0,0 +1,62 @@
+ATTRIBUTE_NAMES = {"klass": "class"}
+# Airium writes these values the way they'd be written in JSON
+ATTRIBUTE_VALUES = {"True": "true", "False": "false", "None": "null"}
+
+
+class HtmlWriter:
+    """Writes HTML a line at a time into a list, laid out exactly as Airium lays it out: every tag and piece of text
+    on its own line, indented two spaces for each enclosing tag. Text is written as it is, without escaping.
+
+    Used for the all questions pages, which can have thousands of elements. Airium creates a context manager and a
+    class for each of them, where this only appends a string.
+    """
+
+    __slots__ = ("lines", "level", "_indent")
+
+    def __init__(self, level: int = 0):
+        """
+        Args:
+            level (int, optional): How many levels to indent everything by. Defaults to 0.
+        """
+        self.lines = []
+        self.level = level
+        self._indent = "  " * level
+
+    def __str__(self) -> str:
+        return "\n".join(self.lines)
+
+    def _set_level(self, level: int):
+        self.level = level
+        self._indent = "  " * level
+
+    def open(self, tag: str, **attributes):
+        """Writes an opening tag, indenting what follows until it's closed"""
+        self.lines.append(f"{self._indent}<{tag}{_attributes(attributes)}>")
+        self._set_level(self.level + 1)
+
+    def close(self, tag: str):
+        self._set_level(self.level - 1)
+        self.lines.append(f"{self._indent}</{tag}>")
+
+    def text(self, text):
+        self.lines.append(f"{self._indent}{text}")
+
+    def element(self, tag: str, text, **attributes):
+        """Writes a tag containing only text, as `with air.<tag>(**attributes): air(text)` would"""
+        indent = self._indent
+        self.lines.append(f"{indent}<{tag}{_attributes(attributes)}>")
+        self.lines.append(f"{indent}  {text}")
+        self.lines.append(f"{indent}</{tag}>")
+
+    def void(self, tag: str, **attributes):
+        """Writes a tag that can't have content, e.g. `<hr />`"""
+        self.lines.append(f"{self._indent}<{tag}{_attributes(attributes)} />")
+
+
+def _attributes(attributes: dict) -> str:
+    written = ""
+    for name, value in attributes.items():
+        value = str(value)
+        value = ATTRIBUTE_VALUES.get(value, value).replace('"', "&quot;")
+        written += f' {ATTRIBUTE_NAMES.get(name, name)}="{value}"'
+    return written
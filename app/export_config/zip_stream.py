@@ -0,0 +1,82 @@
+import queue
+import zipfile
+from pathlib import PurePosixPath
+from typing import Iterator
+
+_END = object()
+
+
+class _ChunkBuffer:
+    """Write-only file object that collects what zipfile writes until it's taken to be sent"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipStream:
+    """Zip file built from files written by the export generators, produced in chunks as the files arrive so it can
+    be sent as the response is generated without touching the disk.
+
+    Generators call `write()` from their own threads, and whoever is producing them calls `finish()` or `fail()` once
+    they're done. The response iterates over the stream to get the zip file in chunks. At most `max_pending_files`
+    files are held waiting to be zipped; writers block when there are more, which keeps memory bounded however
+    big the export is.
+    """
+
+    def __init__(self, max_pending_files: int = 8, put_timeout: float = 0.1):
+        self._pending = queue.Queue(maxsize=max_pending_files)
+        self._put_timeout = put_timeout
+        self._abandoned = False
+
+    def write(self, path: PurePosixPath | str, content: str | bytes):
+        """Adds a file to the zip. Blocks while the stream is too far behind."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self._put((str(path), content))
+
+    def finish(self):
+        """Ends the zip once every file has been written"""
+        self._put(_END)
+
+    def fail(self, error: Exception):
+        """Stops the zip without finishing it, so a partial export can't be mistaken for a complete one"""
+        self._put(error)
+
+    def _put(self, item):
+        # Stop waiting if nobody is reading the stream any more, e.g. the client has gone away
+        while not self._abandoned:
+            try:
+                self._pending.put(item, timeout=self._put_timeout)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self) -> Iterator[bytes]:
+        buffer = _ChunkBuffer()
+        zip_file = zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED)
+        try:
+            while (item := self._pending.get()) is not _END:
+                if isinstance(item, Exception):
+                    # Deliberately don't close the zip file, so no central directory is written
+                    raise item
+                path, content = item
+                zip_file.writestr(path, content)
+                yield buffer.take()
+            zip_file.close()
+            yield buffer.take()
+        finally:
+            self._abandoned = True
+            while not self._pending.empty():
+                self._pending.get_nowait()
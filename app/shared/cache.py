@@ -0,0 +1,311 @@
+import hashlib
+import os
+import pickle
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from threading import Lock
+from time import sleep, time
+from typing import Any, Callable
+
+from flask import Flask, current_app
+
+from app.shared.lru_cache import LRUCache
+
+
+class Cache(ABC):
+    """Base class for the cache backends. Values are pickled, so anything picklable can be cached, and backends
+    only ever deal with bytes.
+
+    `None` can't be cached, as it's what `get()` returns for a miss.
+    """
+
+    def __init__(self, default_ttl: int | None = None, lock_timeout: int = 30, lock_poll_interval: float = 0.05):
+        """
+        Args:
+            default_ttl (int, optional): Seconds values live for when `set()` isn't given a ttl. Defaults to None,
+                meaning values don't expire.
+            lock_timeout (int, optional): Seconds a `get_or_set()` lock is held for before another caller is
+                allowed to build the value instead. Defaults to 30.
+            lock_poll_interval (float, optional): Seconds between checks for a value being built by another caller.
+                Defaults to 0.05.
+        """
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        self.lock_poll_interval = lock_poll_interval
+
+    def get(self, key: str) -> Any:
+        data = self._get(key)
+        return None if data is None else pickle.loads(data)
+
+    def set(self, key: str, value: Any, ttl: int | None = None):
+        self._set(key, pickle.dumps(value), self._ttl(ttl))
+
+    def add(self, key: str, value: Any, ttl: int | None = None) -> bool:
+        """Stores a value only if there isn't already one for this key.
+
+        Returns:
+            bool: Whether the value was stored
+        """
+        return self._add(key, pickle.dumps(value), self._ttl(ttl))
+
+    def get_or_set(self, key: str, create: Callable[[], Any], ttl: int | None = None) -> Any:
+        """Gets a value from the cache, or uses `create` to build and cache it if it isn't there.
+
+        Only one caller builds a missing value at a time, whichever process it is in: everyone else waits for that
+        value to appear rather than all building it at once. If the caller building it dies, the others carry on
+        once its lock times out.
+
+        Args:
+            key (str): Key for the value
+            create (Callable[[], Any]): Builds the value if it isn't in the cache
+            ttl (int, optional): Seconds the value lives for. Defaults to the cache's default_ttl.
+
+        Returns:
+            Any: The cached or newly built value
+        """
+        value = self.get_or_lock(key)
+        if value is not None:
+            return value
+        try:
+            value = create()
+            if value is not None:
+                self.set(key, value, ttl)
+        finally:
+            self.unlock(key)
+        return value
+
+    def get_or_lock(self, key: str) -> Any:
+        """Gets a value from the cache or, if it isn't there, the lock for building it, for values built in a way
+        `get_or_set()` can't wrap, such as a response streamed as it's built.
+
+        While another caller holds the lock, this waits for the value they're building to appear, or for their lock
+        to be released or time out.
+
+        Args:
+            key (str): Key for the value
+
+        Returns:
+            Any: The cached value, or None if the caller now holds the lock, and must build the value and then call
+                `unlock()`
+        """
+        value = self.get(key)
+        while value is None:
+            if self.add(self._lock_key(key), True, ttl=self.lock_timeout):
+                return None
+            sleep(self.lock_poll_interval)
+            value = self.get(key)
+        return value
+
+    def unlock(self, key: str):
+        """Releases the lock taken by `get_or_lock()` for building a value"""
+        self.delete(self._lock_key(key))
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"{key}:lock"
+
+    def _ttl(self, ttl: int | None) -> int | None:
+        return self.default_ttl if ttl is None else ttl
+
+    @abstractmethod
+    def _get(self, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, data: bytes, ttl: int | None):
+        pass
+
+    @abstractmethod
+    def _add(self, key: str, data: bytes, ttl: int | None) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class NullCache(Cache):
+    """Cache that never stores anything, for turning caching off"""
+
+    def _get(self, key: str) -> bytes | None:
+        return None
+
+    def _set(self, key: str, data: bytes, ttl: int | None):
+        pass
+
+    def _add(self, key: str, data: bytes, ttl: int | None) -> bool:
+        return True
+
+    def delete(self, key: str):
+        pass
+
+    def clear(self):
+        pass
+
+
+class MemoryCache(Cache):
+    """In-process least recently used cache, bounded by the total size of the pickled values it holds.
+    Each gunicorn worker has its own."""
+
+    def __init__(self, max_bytes: int, **kwargs):
+        super().__init__(**kwargs)
+        self._entries = LRUCache(max_bytes=max_bytes)
+        self._add_lock = Lock()
+
+    def _get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at is not None and expires_at <= time():
+            self._entries.delete(key)
+            return None
+        return data
+
+    def _set(self, key: str, data: bytes, ttl: int | None):
+        expires_at = time() + ttl if ttl else None
+        self._entries.set(key, (expires_at, data), size=len(data))
+
+    def _add(self, key: str, data: bytes, ttl: int | None) -> bool:
+        with self._add_lock:
+            if self._get(key) is not None:
+                return False
+            self._set(key, data, ttl)
+            return True
+
+    def delete(self, key: str):
+        self._entries.delete(key)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class FilesystemCache(Cache):
+    """Cache stored as files in a directory, shared by every process that can see that directory.
+    Each file holds the expiry time on the first line, followed by the pickled value."""
+
+    def __init__(self, directory: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = Path(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / hashlib.sha256(key.encode()).hexdigest()
+
+    def _get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at = float(f.readline())
+                data = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+        if expires_at and expires_at <= time():
+            self._remove(path)
+            return None
+        return data
+
+    def _contents(self, data: bytes, ttl: int | None) -> bytes:
+        expires_at = time() + ttl if ttl else 0
+        return f"{expires_at}\n".encode() + data
+
+    def _set(self, key: str, data: bytes, ttl: int | None):
+        # Write to a temporary file and move it into place, so readers never see a partly written value
+        path = self._path(key)
+        temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(self._contents(data, ttl))
+        os.replace(temp_path, path)
+
+    def _add(self, key: str, data: bytes, ttl: int | None) -> bool:
+        # Clears out an expired value first, then relies on O_EXCL so only one process can create the file
+        if self._get(key) is not None:
+            return False
+        try:
+            fd = os.open(self._path(key), os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "wb") as f:
+            f.write(self._contents(data, ttl))
+        return True
+
+    def delete(self, key: str):
+        self._remove(self._path(key))
+
+    def clear(self):
+        for path in self.directory.iterdir():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class RedisCache(Cache):
+    """Cache stored in Redis (or anything that speaks the Redis protocol), shared by every process that can
+    connect to it. Keys are namespaced with `key_prefix` so `clear()` only removes FAB's keys."""
+
+    def __init__(self, client, key_prefix: str = "fab:", **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisCache":
+        import redis
+
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _get(self, key: str) -> bytes | None:
+        return self.client.get(self.key_prefix + key)
+
+    def _set(self, key: str, data: bytes, ttl: int | None):
+        self.client.set(self.key_prefix + key, data, ex=ttl or None)
+
+    def _add(self, key: str, data: bytes, ttl: int | None) -> bool:
+        return bool(self.client.set(self.key_prefix + key, data, ex=ttl or None, nx=True))
+
+    def delete(self, key: str):
+        self.client.delete(self.key_prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.key_prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_cache(config) -> Cache:
+    """Creates the cache backend chosen by `CACHE_BACKEND` in the config: one of `memory`, `filesystem`,
+    `redis` or `null`"""
+    backend = config["CACHE_BACKEND"]
+    options = {
+        "default_ttl": config["CACHE_DEFAULT_TTL"],
+        "lock_timeout": config["CACHE_LOCK_TIMEOUT"],
+    }
+    match backend:
+        case "memory":
+            return MemoryCache(max_bytes=config["CACHE_MEMORY_MAX_BYTES"], **options)
+        case "filesystem":
+            return FilesystemCache(directory=config["CACHE_DIR"], **options)
+        case "redis":
+            return RedisCache.from_url(config["CACHE_REDIS_URL"], key_prefix=config["CACHE_KEY_PREFIX"], **options)
+        case "null":
+            return NullCache(**options)
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+def init_cache(app: Flask):
+    app.extensions["fab_cache"] = create_cache(app.config)
+
+
+def get_cache() -> Cache:
+    """Gets the cache backend for the current app"""
+    return current_app.extensions["fab_cache"]
@@ -0,0 +1,120 @@
+import hashlib
+import json
+
+from app.db.models import Fund, Round, Section
+from app.shared.cache import get_cache
+from app.shared.form_store_api import FormStoreAPIService
+from config import Config
+
+# Bump whenever a change to the export generators changes the files they export, so exports cached by earlier
+# versions aren't served for unchanged rounds
+EXPORT_FORMAT_VERSION = 1
+
+
+def source_hash(*sources) -> str:
+    """Hash of everything an export output is generated from"""
+    return hashlib.sha256(json.dumps(sources, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def round_structure(round: Round, fund: Fund, sections: list[Section]) -> dict:
+    """The parts of a round's fingerprint that come from the database, which can be worked out without going to the
+    Form Store API"""
+    return {
+        "round": [round.round_id, round.updated_at],
+        "fund": [fund.fund_id, fund.updated_at],
+        "sections": [
+            [
+                section.section_id,
+                section.index,
+                section.name_in_apply_json,
+                [[form.form_id, form.url_path, form.section_index, form.updated_at] for form in section.forms],
+            ]
+            for section in sections
+        ],
+    }
+
+
+def round_fingerprint(round: Round, fund: Fund, sections: list[Section], published_form_hashes: dict[str, str]) -> str:
+    """
+    Hash of everything a round's export is generated from: when each row in the round was last updated, how the
+    sections and forms are arranged, and the hash of each published form. Unchanged rounds always have the same
+    fingerprint, so it can be used to cache what's generated from the round and as its ETag.
+
+    Args:
+        round (Round): The round
+        fund (Fund): The round's fund
+        sections (list[Section]): The round's sections, with their forms
+        published_form_hashes (dict[str, str]): Hash of each of the round's published forms, by url_path
+
+    Returns:
+        str: The fingerprint
+    """
+    fingerprint_data = {
+        **round_structure(round, fund, sections),
+        "version": EXPORT_FORMAT_VERSION,
+        "published_forms": published_form_hashes,
+    }
+    return hashlib.sha256(json.dumps(fingerprint_data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# The Form Store API has to be asked for the published form hashes, so a round's fingerprint is remembered for
+# ALL_QUESTIONS_STALE_SECONDS. Changes in the database show straight away, as the fingerprint is remembered by the
+# round's structure, but newly published forms can take that long to be noticed.
+
+
+def _recent_fingerprint_key(round: Round) -> str:
+    return f"round-fingerprint:{round.round_id}:{source_hash(round_structure(round, round.fund, round.sections))}"
+
+
+def get_recent_round_fingerprint(round: Round) -> str | None:
+    """
+    Gets the fingerprint remembered for a round, if its structure hasn't changed since.
+
+    Args:
+        round (Round): The round, with its fund, sections and forms loaded
+
+    Returns:
+        str | None: The fingerprint, or None if there isn't a recent one
+    """
+    return get_cache().get(_recent_fingerprint_key(round))
+
+
+def remember_round_fingerprint(round: Round, fingerprint: str) -> None:
+    """
+    Remembers the fingerprint worked out for a round, so pages and exports of it don't need to go to the Form Store
+    API again for a while.
+
+    Args:
+        round (Round): The round, with its fund, sections and forms loaded
+        fingerprint (str): The round's fingerprint
+    """
+    get_cache().set(_recent_fingerprint_key(round), fingerprint, ttl=Config.ALL_QUESTIONS_STALE_SECONDS)
+
+
+def get_round_fingerprint(round: Round, api_service: FormStoreAPIService = None) -> str:
+    """
+    Gets a round's fingerprint, only going to the Form Store API if it wasn't remembered recently. Only the hashes
+    of the published forms are kept, for callers that need the fingerprint but not the forms.
+
+    Args:
+        round (Round): The round, with its fund, sections and forms loaded
+        api_service (FormStoreAPIService, optional): Service to fetch the forms with. Defaults to a new one.
+
+    Returns:
+        str: The fingerprint
+
+    Raises:
+        FormNotFoundError: If any of the round's forms aren't published in the Form Store
+    """
+    fingerprint = get_recent_round_fingerprint(round)
+    if fingerprint is None:
+        api_service = api_service or FormStoreAPIService()
+        sections = list(round.sections)
+        published_forms = api_service.get_published_forms_bulk(
+            [form.url_path for section in sections for form in section.forms]
+        ).forms
+        fingerprint = round_fingerprint(
+            round, round.fund, sections, {url_path: form.hash for url_path, form in published_forms.items()}
+        )
+        remember_round_fingerprint(round, fingerprint)
+    return fingerprint
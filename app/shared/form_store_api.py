@@ -1,17 +1,77 @@
-from dataclasses import dataclass
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from http import HTTPStatus
+from threading import Lock
 from typing import Any
 
 import requests
 from flask import current_app, g
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.shared.server_timing import timed
+from config import Config
+
+RETRY_STATUSES = (
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = Lock()
+
+
+def create_session() -> requests.Session:
+    """Creates a session for talking to the Form Store API, which keeps a pool of open connections and retries
+    GETs that fail to connect or get a 5xx response, backing off between attempts.
+
+    Returns:
+        requests.Session: The configured session
+    """
+    retry = Retry(
+        total=Config.FORM_STORE_API_RETRIES,
+        backoff_factor=Config.FORM_STORE_API_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        # Hand back the last response once retries run out, so raise_for_status() reports it as usual
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.FORM_STORE_API_POOL_SIZE,
+        pool_maxsize=Config.FORM_STORE_API_POOL_SIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json", "Accept-Encoding": "gzip"})
+    return session
+
+
+def get_session() -> requests.Session:
+    """Gets the session shared by every FormStoreAPIService in this process. A new one is created after a fork, as
+    pooled connections can't be shared between processes."""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = create_session()
+            _session_pid = os.getpid()
+        return _session
 
 
 class FormNotFoundError(Exception):
     """Raised when a form cannot be found in the Form Store API"""
 
-    def __init__(self, url_path: str = None, message: str = None):
+    def __init__(self, url_path: str = None, message: str = None, url_paths: list[str] = None):
+        self.url_paths = url_paths or ([url_path] if url_path is not None else [])
         if message is not None:
             self.message = message
+        elif url_paths:
+            self.message = f"Published forms not found for URL paths: {', '.join(url_paths)}"
         elif url_path is not None:
             self.message = f"Published form not found for URL path: {url_path}"
         else:
@@ -66,6 +126,19 @@ class PublishedFormResponse(FormResponse):
         )
 
 
+@dataclass
+class BulkPublishedFormsResponse:
+    """Results of fetching several published forms at once, keyed by URL path in the order they were asked for"""
+
+    forms: dict[str, PublishedFormResponse] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    def raise_for_missing(self):
+        """Raises a single FormNotFoundError listing every form that couldn't be fetched"""
+        if self.errors:
+            raise FormNotFoundError(url_paths=list(self.errors))
+
+
 class FormStoreAPIService:
     """Service class for interacting with the Form Store API"""
 
@@ -73,7 +146,10 @@ class FormStoreAPIService:
         self.base_url = current_app.config.get("FORM_STORE_API_HOST")
         if not self.base_url:
             raise ValueError("FORM_STORE_API_HOST configuration is required")
+        self.session = get_session()
+        self.timeout = (Config.FORM_STORE_API_CONNECT_TIMEOUT, Config.FORM_STORE_API_READ_TIMEOUT)
 
+    @timed("form_store")
     def get_published_forms(self) -> list[FormResponse]:
         """
         Fetch all forms from the Form Store API and filter to only those with published_json populated, with
@@ -84,7 +160,7 @@ class FormStoreAPIService:
             return g._published_forms_cache
 
         try:
-            response = requests.get(self.base_url, timeout=30, headers={"Content-Type": "application/json"})
+            response = self.session.get(self.base_url, timeout=self.timeout)
             response.raise_for_status()
             result = response.json()
             all_forms = [FormResponse.from_dict(item) for item in result]
@@ -97,20 +173,74 @@ class FormStoreAPIService:
             current_app.logger.error("Error fetching forms from Form Store API: %s", e)
             return []
 
+    @timed("form_store")
     def get_published_form(self, url_path: str) -> PublishedFormResponse | None:
         try:
-            response = requests.get(f"{self.base_url}/{url_path}/published")
+            return self._fetch_published_form(url_path)
+        except Exception as e:
+            self._log_fetch_error(url_path, e)
+        return None
+
+    @timed("form_store")
+    def get_published_forms_bulk(
+        self, url_paths: list[str], raise_on_missing: bool = True
+    ) -> BulkPublishedFormsResponse:
+        """
+        Fetch several published forms from the Form Store API at once, using up to FORM_STORE_API_POOL_SIZE
+        concurrent requests.
+
+        Args:
+            url_paths (list[str]): URL paths of the forms to fetch
+            raise_on_missing (bool, optional): Whether to raise if any form can't be fetched. Defaults to True.
+
+        Returns:
+            BulkPublishedFormsResponse: The fetched forms and the error for each form that couldn't be fetched, both
+                in the same order as url_paths
+
+        Raises:
+            FormNotFoundError: Listing every form that couldn't be fetched, if raise_on_missing is set
+        """
+        url_paths = list(dict.fromkeys(url_paths))
+        bulk_response = BulkPublishedFormsResponse()
+        if not url_paths:
+            return bulk_response
+
+        def fetch(url_path: str) -> PublishedFormResponse | Exception:
+            try:
+                return self._fetch_published_form(url_path)
+            except Exception as e:
+                return e
+
+        max_workers = min(Config.FORM_STORE_API_POOL_SIZE, len(url_paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(fetch, url_paths)
+
+        for url_path, result in zip(url_paths, results, strict=True):
+            if isinstance(result, Exception):
+                self._log_fetch_error(url_path, result)
+                bulk_response.errors[url_path] = result
+            else:
+                bulk_response.forms[url_path] = result
+        if raise_on_missing:
+            bulk_response.raise_for_missing()
+        return bulk_response
+
+    def _fetch_published_form(self, url_path: str) -> PublishedFormResponse:
+        try:
+            response = self.session.get(f"{self.base_url}/{url_path}/published", timeout=self.timeout)
             response.raise_for_status()
-            result = response.json()
-            return PublishedFormResponse.from_dict(result)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == HTTPStatus.NOT_FOUND:
-                current_app.logger.info("Form '%s' not found", url_path)
-            else:
-                current_app.logger.error("Error fetching form %s from Form Store API: %s", url_path, e)
-        except Exception as e:
-            current_app.logger.error("Error fetching form %s from Form Store API: %s", url_path, e)
-        return None
+                raise FormNotFoundError(url_path=url_path) from e
+            raise
+        return PublishedFormResponse.from_dict(response.json())
+
+    @staticmethod
+    def _log_fetch_error(url_path: str, error: Exception):
+        if isinstance(error, FormNotFoundError):
+            current_app.logger.info("Form '%s' not found", url_path)
+        else:
+            current_app.logger.error("Error fetching form %s from Form Store API: %s", url_path, error)
 
     def get_display_name_from_url_path(self, url_path: str) -> str | None:
         published_forms = self.get_published_forms()
@@ -1,6 +1,6 @@
 from flask import request, session
 
-from app.blueprints.application.routes import application_bp
+from app.blueprints.application.routes import application_bp, download_export, export_status, queue_export
 from app.blueprints.fund.routes import fund_bp, view_all_funds
 from app.blueprints.index.routes import dashboard, go_back, index_bp, preview_form
 from app.blueprints.round.routes import round_bp, view_all_rounds
@@ -12,6 +12,9 @@ class PageTracker:
         self.ignore_endpoints = {
             f"{index_bp.name}.{go_back.__name__}",
             f"{index_bp.name}.{preview_form.__name__}",
+            f"{application_bp.name}.{queue_export.__name__}",
+            f"{application_bp.name}.{export_status.__name__}",
+            f"{application_bp.name}.{download_export.__name__}",
         }
         self.reset_endpoints = {
             f"{index_bp.name}.{dashboard.__name__}",
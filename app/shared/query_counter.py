@@ -0,0 +1,91 @@
+from collections import Counter
+from contextvars import ContextVar
+
+from flask import Flask, Response, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Counters counting the queries run in this context, innermost last. Each thread has its own context, so queries
+# run by background threads aren't counted against the request or test that started them.
+_active_counters: ContextVar[tuple["QueryCounter", ...]] = ContextVar("active_query_counters", default=())
+
+
+class QueryCounter:
+    """
+    Counts the database queries run while it's active, by their SQL. Queries are run with their parameters bound
+    separately, so a query run once for each item in a list - an N+1 - shows up as the same SQL run many times.
+
+    Use as a context manager:
+    ```
+        with QueryCounter() as query_counter:
+            ...
+        query_counter.count
+    ```
+    """
+
+    def __init__(self):
+        self.statements = Counter()
+
+    def __enter__(self) -> "QueryCounter":
+        if not event.contains(Engine, "after_cursor_execute", _count_query):
+            event.listen(Engine, "after_cursor_execute", _count_query)
+        _active_counters.set(_active_counters.get() + (self,))
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_counters.set(tuple(counter for counter in _active_counters.get() if counter is not self))
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def repeated(self, times: int = 2) -> dict[str, int]:
+        """Queries run at least this many times, most often first, which may be N+1s"""
+        return {statement: count for statement, count in self.statements.most_common() if count >= times}
+
+    def summary(self) -> str:
+        """Each query run, most often first, with how many times it was run"""
+        return "\n".join(
+            f"{count} x {' '.join(statement.split())}" for statement, count in self.statements.most_common()
+        )
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    for query_counter in _active_counters.get():
+        query_counter.statements[statement] += 1
+
+
+def init_query_counter(app: Flask):
+    """
+    Counts the queries each request to the app runs, if QUERY_COUNTER_ENABLED is set, logging the count for the
+    endpoint and a warning for each query run QUERY_COUNTER_REPEAT_THRESHOLD times or more, as it may be an N+1.
+    Nothing is registered if it isn't set.
+    """
+    if not app.config.get("QUERY_COUNTER_ENABLED"):
+        return
+
+    @app.before_request
+    def start_query_counter():
+        g.query_counter = QueryCounter().__enter__()
+
+    @app.after_request
+    def log_query_count(response: Response) -> Response:
+        query_counter = g.get("query_counter")
+        if query_counter is None:
+            return response
+        current_app.logger.info(
+            "{endpoint} ran {query_count} queries",
+            extra=dict(endpoint=request.endpoint, query_count=query_counter.count, path=request.path),
+        )
+        for statement, times in query_counter.repeated(app.config["QUERY_COUNTER_REPEAT_THRESHOLD"]).items():
+            current_app.logger.warning(
+                "{endpoint} ran the same query {times} times, which may be an N+1: {statement}",
+                extra=dict(endpoint=request.endpoint, times=times, statement=" ".join(statement.split())),
+            )
+        return response
+
+    @app.teardown_request
+    def stop_query_counter(error=None):
+        query_counter = g.pop("query_counter", None)
+        if query_counter is not None:
+            query_counter.__exit__(None, None, None)
@@ -0,0 +1,156 @@
+import time
+from functools import wraps
+from typing import Callable
+
+from flask import Flask, Response, before_render_template, current_app, g, has_app_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Metrics in the order they're sent, with their descriptions. `total` is the whole request.
+METRICS = {
+    "sql": "Database queries",
+    "form_store": "Form Store API",
+    "all_questions": "All questions engine",
+    "template": "Templates",
+    "total": "Total",
+}
+
+# Set once any app turns timing on, so until then timed functions don't even need to look in `g`
+_enabled = False
+
+
+class RequestTimings:
+    """How long a request has spent on each metric, and how many times it has been timed.
+
+    Time spent on a metric within something else already being timed on the same metric isn't counted again, e.g.
+    the all questions engine generating print data for the HTML it's rendering.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.counts = {}
+        self.active = set()
+
+    def add(self, metric: str, seconds: float):
+        self.durations[metric] = self.durations.get(metric, 0.0) + seconds
+        self.counts[metric] = self.counts.get(metric, 0) + 1
+
+    def header(self) -> str:
+        """The `Server-Timing` header value, with durations in milliseconds as the header expects"""
+        entries = []
+        for metric, description in METRICS.items():
+            if metric in self.durations:
+                if metric != "total":
+                    description = f"{description} ({self.counts[metric]})"
+                entries.append(f'{metric};dur={self.durations[metric] * 1000:.2f};desc="{description}"')
+        return ", ".join(entries)
+
+    def log_fields(self) -> dict:
+        fields = {}
+        for metric in METRICS:
+            if metric in self.durations:
+                fields[f"{metric}_ms"] = round(self.durations[metric] * 1000, 2)
+                if metric != "total":
+                    fields[f"{metric}_count"] = self.counts[metric]
+        return fields
+
+
+def current_timings() -> RequestTimings | None:
+    """The timings of the request being handled, or None if it isn't being timed - because SERVER_TIMING_ENABLED is
+    off, or this isn't the thread handling a request"""
+    if not _enabled or not has_app_context():
+        return None
+    return g.get("request_timings")
+
+
+def timed(metric: str) -> Callable[[Callable], Callable]:
+    """Decorates a function to add the time spent in it to a metric of the request being handled. When requests
+    aren't being timed, it only costs a check of a flag.
+
+    Args:
+        metric (str): One of the METRICS
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = current_timings()
+            if timings is None or metric in timings.active:
+                return func(*args, **kwargs)
+            timings.active.add(metric)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.add(metric, time.perf_counter() - started)
+                timings.active.discard(metric)
+
+        return wrapper
+
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_timings() is not None:
+        conn.info.setdefault("server_timing_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = current_timings()
+    started = conn.info.get("server_timing_started")
+    if timings is not None and started:
+        timings.add("sql", time.perf_counter() - started.pop())
+
+
+def _before_render_template(sender, template, context, **extra):
+    if current_timings() is not None:
+        g.setdefault("template_started", []).append(time.perf_counter())
+
+
+def _template_rendered(sender, template, context, **extra):
+    timings = current_timings()
+    # Streamed templates finish rendering after the response has been sent, so only count those that haven't
+    started = g.get("template_started")
+    if timings is not None and started:
+        timings.add("template", time.perf_counter() - started.pop())
+
+
+def init_server_timing(app: Flask):
+    """
+    Times where each request to the app goes, if SERVER_TIMING_ENABLED is set, sending the timings in a
+    `Server-Timing` header and logging them when the request is finished. Nothing is registered if it isn't set.
+
+    Database queries are timed for every engine, and templates from when they start rendering to when they finish.
+    Functions decorated with `timed()` are timed against their metric.
+
+    Only what's run by the thread handling the request is timed, so not work done in background threads, or after
+    a streamed response has started to be sent.
+    """
+    global _enabled
+    if not app.config.get("SERVER_TIMING_ENABLED"):
+        return
+    _enabled = True
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    before_render_template.connect(_before_render_template, app)
+    template_rendered.connect(_template_rendered, app)
+
+    @app.before_request
+    def start_request_timings():
+        g.request_timings = RequestTimings()
+
+    @app.after_request
+    def send_request_timings(response: Response) -> Response:
+        timings = g.pop("request_timings", None)
+        if timings is None:
+            return response
+        timings.add("total", time.perf_counter() - timings.started)
+        response.headers["Server-Timing"] = timings.header()
+        current_app.logger.info(
+            "Timings for {method} {path}",
+            extra=dict(method=request.method, path=request.path, status=response.status_code, **timings.log_fields()),
+        )
+        return response
@@ -28,11 +28,61 @@ class DefaultConfig(object):
         "FORM_DESIGNER_EXTERNAL_HOST", "https://form-designer.communities.gov.localhost:3000"
     )
     FORM_STORE_API_HOST = getenv("FORM_STORE_API_HOST", "https://api.communities.gov.localhost:4004/forms")
+    FORM_STORE_API_POOL_SIZE = int(getenv("FORM_STORE_API_POOL_SIZE", 10))
+    FORM_STORE_API_RETRIES = int(getenv("FORM_STORE_API_RETRIES", 3))
+    FORM_STORE_API_BACKOFF_FACTOR = float(getenv("FORM_STORE_API_BACKOFF_FACTOR", 0.5))
+    FORM_STORE_API_CONNECT_TIMEOUT = float(getenv("FORM_STORE_API_CONNECT_TIMEOUT", 5))
+    FORM_STORE_API_READ_TIMEOUT = float(getenv("FORM_STORE_API_READ_TIMEOUT", 30))
     SQLALCHEMY_DATABASE_URI = environ.get("DATABASE_URL")
 
     TEMP_FILE_PATH = Path("/tmp")
+    PRINT_DATA_CACHE_MAX_BYTES = int(getenv("PRINT_DATA_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    FORM_FRAGMENT_CACHE_MAX_BYTES = int(getenv("FORM_FRAGMENT_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    HTML_TEXT_CACHE_MAX_BYTES = int(getenv("HTML_TEXT_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+    # Rendered all questions pages and exports are cached in the shared cache. Newly published forms can take up to
+    # ALL_QUESTIONS_STALE_SECONDS to appear in them, as that's how long a round's fingerprint is remembered for.
+    ALL_QUESTIONS_CACHE_TTL = int(getenv("ALL_QUESTIONS_CACHE_TTL", 24 * 60 * 60))
+    ALL_QUESTIONS_STALE_SECONDS = int(getenv("ALL_QUESTIONS_STALE_SECONDS", 30))
+    # Send all questions pages as they're rendered, rather than rendering the whole page first. Streamed pages are
+    # cached once they're complete, unless they're bigger than ALL_QUESTIONS_CACHE_MAX_BYTES.
+    ALL_QUESTIONS_STREAMING = getenv("ALL_QUESTIONS_STREAMING", "true").lower() in ("true", "1", "t", "yes", "y")
+    ALL_QUESTIONS_CACHE_MAX_BYTES = int(getenv("ALL_QUESTIONS_CACHE_MAX_BYTES", 20 * 1024 * 1024))
+    # Stream export zips straight to the response rather than building them in TEMP_FILE_PATH
+    EXPORT_ZIP_STREAMING = getenv("EXPORT_ZIP_STREAMING", "true").lower() in ("true", "1", "t", "yes", "y")
+    # Built export zips are cached in the shared cache, keyed by a fingerprint of the round
+    EXPORT_CACHE_TTL = int(getenv("EXPORT_CACHE_TTL", 24 * 60 * 60))
+    EXPORT_CACHE_MAX_BYTES = int(getenv("EXPORT_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+    # Only regenerate the outputs of forms that have changed since a round was last exported
+    EXPORT_INCREMENTAL = getenv("EXPORT_INCREMENTAL", "true").lower() in ("true", "1", "t", "yes", "y")
+    # Background export jobs are run by `flask export-jobs work`, in worker processes separate from the web process.
+    # Turning this on runs them in threads of the web process instead, where they compete with requests for the GIL.
+    EXPORT_JOBS_RUN_IN_PROCESS = getenv("EXPORT_JOBS_RUN_IN_PROCESS", "false").lower() in ("true", "1", "t", "yes", "y")
+    EXPORT_JOB_WORKERS = int(getenv("EXPORT_JOB_WORKERS", 2))
+    # Running jobs send a heartbeat this often, and are reclaimed by another worker once they've missed
+    # EXPORT_JOB_STALE_SECONDS of them
+    EXPORT_JOB_HEARTBEAT_SECONDS = int(getenv("EXPORT_JOB_HEARTBEAT_SECONDS", 60))
+    EXPORT_JOB_STALE_SECONDS = int(getenv("EXPORT_JOB_STALE_SECONDS", 5 * 60))
+    EXPORT_JOB_MAX_ATTEMPTS = int(getenv("EXPORT_JOB_MAX_ATTEMPTS", 3))
+    EXPORT_JOB_RETENTION_SECONDS = int(getenv("EXPORT_JOB_RETENTION_SECONDS", 7 * 24 * 60 * 60))
+
+    # Shared cache - CACHE_BACKEND is one of memory, filesystem, redis or null
+    CACHE_BACKEND = getenv("CACHE_BACKEND", "memory")
+    CACHE_DEFAULT_TTL = int(getenv("CACHE_DEFAULT_TTL", 300))
+    CACHE_LOCK_TIMEOUT = int(getenv("CACHE_LOCK_TIMEOUT", 30))
+    CACHE_MEMORY_MAX_BYTES = int(getenv("CACHE_MEMORY_MAX_BYTES", 64 * 1024 * 1024))
+    CACHE_DIR = Path(getenv("CACHE_DIR", "/tmp/fab-cache"))
+    CACHE_REDIS_URL = getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_KEY_PREFIX = getenv("CACHE_KEY_PREFIX", "fab:")
     GENERATE_LOCAL_CONFIG = False
 
+    # Time where each request goes - database queries, Form Store API calls, the all questions engine and templates -
+    # and send it in a Server-Timing header and the request's log
+    SERVER_TIMING_ENABLED = getenv("SERVER_TIMING_ENABLED", "false").lower() in ("true", "1", "t", "yes", "y")
+    # Log how many queries each request runs, warning about any query run QUERY_COUNTER_REPEAT_THRESHOLD times or more
+    # as it may be an N+1
+    QUERY_COUNTER_ENABLED = getenv("QUERY_COUNTER_ENABLED", "false").lower() in ("true", "1", "t", "yes", "y")
+    QUERY_COUNTER_REPEAT_THRESHOLD = int(getenv("QUERY_COUNTER_REPEAT_THRESHOLD", 3))
+
     FSD_USER_TOKEN_COOKIE_NAME = "fsd_user_token"
     AUTHENTICATOR_HOST = getenv("AUTHENTICATOR_HOST", "https://authenticator.communities.gov.localhost:4004")
     LOGOUT_URL_OVERRIDE = f"{AUTHENTICATOR_HOST}/sessions/sign-out?return_app=fund-application-builder&return_path=/"  # noqa: E501
@@ -0,0 +1,128 @@
+"""
+Benchmarks rendering the all questions HTML for a large round against the Airium renderer it used to be built with,
+and checks that both render exactly the same HTML.
+
+Airium is a dev dependency, so run with the dev group installed:
+
+    uv run python scripts/benchmark_all_questions_html.py --sections 10 --forms 10 --pages 10 --components 3
+"""
+
+import argparse
+import sys
+import timeit
+
+from airium import Airium
+
+from app.export_config.generate_all_questions import SECTION_BREAK_CLASS, _sorted_headings, generate_html
+
+
+# --------------------------
+# Airium renderer, as it was
+# --------------------------
+def airium_generate_html(sections, all_question_view=True):
+    air = Airium()
+    with air.div(klass="govuk-!-margin-bottom-8"):
+        if all_question_view:
+            with air.h2(klass="govuk-heading-m"):
+                air("Table of contents")
+            with air.ol(klass="govuk-list govuk-list--number"):
+                for anchor, details in sections.items():
+                    with air.li():
+                        with air.a(klass="govuk-link", href=f"#{anchor}"):
+                            air(details["title_text"])
+            air.hr(klass=SECTION_BREAK_CLASS)
+
+        for idx, (anchor, details) in enumerate(sections.items(), start=1):
+            if anchor == "assessment_display_info":
+                continue
+            if all_question_view:
+                with air.h2(klass="govuk-heading-l", id=anchor):
+                    air(f"{idx}. {details['title_text']}")
+            for _, header_info in _sorted_headings(details["form_print_data"]):
+                tag = "h3" if header_info["is_form_heading"] else "h4"
+                with getattr(air, tag)(klass=f"govuk-heading-{'m' if tag == 'h3' else 's'}"):
+                    air(header_info["title"])
+                airium_render_components(air, header_info["components"])
+                air.hr(klass=SECTION_BREAK_CLASS)
+
+    return str(air)
+
+
+def airium_render_components(air, components):
+    for component in components:
+        title = component.get("title")
+        text_list = component.get("text", [])
+        if (title and not component.get("hide_title")) or text_list:
+            with air.div(klass="govuk-body"):
+                if title and not component.get("hide_title"):
+                    with air.p(klass="govuk-body"):
+                        air(title)
+                for text in text_list:
+                    if isinstance(text, list):
+                        with air.ul(klass="govuk-list govuk-list--bullet"):
+                            for bullet in text:
+                                with air.li():
+                                    air(bullet)
+                    else:
+                        with air.p(klass="govuk-body"):
+                            air(text)
+
+
+def build_print_data(sections: int, forms: int, pages: int, components: int) -> dict:
+    """Builds print data for a round of this size, in the shape `generate_print_data_for_sections` returns"""
+    print_data = {}
+    for section_idx in range(1, sections + 1):
+        form_print_data = {}
+        for form_idx in range(forms):
+            for page_idx in range(pages):
+                heading_number = f"{section_idx}.{form_idx + 1}" + (f".{page_idx}" if page_idx else "")
+                form_print_data[f"/form-{form_idx}-page-{page_idx}"] = {
+                    "heading_number": heading_number,
+                    "is_form_heading": page_idx == 0,
+                    "title": f"{heading_number} Page {page_idx} of form {form_idx}",
+                    "components": [
+                        {
+                            "title": f'Question {component_idx} about the <em>project</em> & its "outcomes"',
+                            "text": [
+                                "Select all that apply",
+                                [f"Option {option}" for option in range(4)],
+                                "Other (describe it)",
+                            ],
+                            "hide_title": component_idx % 5 == 4,
+                        }
+                        for component_idx in range(components)
+                    ],
+                }
+        print_data[f"section-{section_idx}"] = {
+            "title_text": f'Section {section_idx} "details"',
+            "form_print_data": form_print_data,
+        }
+    return print_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sections", type=int, default=10)
+    parser.add_argument("--forms", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--components", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print_data = build_print_data(args.sections, args.forms, args.pages, args.components)
+    total_components = args.sections * args.forms * args.pages * args.components
+    print(f"{args.sections} sections, {args.sections * args.forms} forms, {total_components} components")
+
+    for all_question_view in (True, False):
+        if generate_html(print_data, all_question_view) != airium_generate_html(print_data, all_question_view):
+            sys.exit(f"HTML differs from the Airium renderer (all_question_view={all_question_view})")
+
+    results = {}
+    for name, render in (("airium", airium_generate_html), ("html_writer", generate_html)):
+        results[name] = min(timeit.repeat(lambda render=render: render(print_data), number=1, repeat=args.repeat))
+        print(f"{name:>12}: {results[name] * 1000:.1f}ms")
+    print(f"{'speedup':>12}: {results['airium'] / results['html_writer']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import random
+
+HINTS = [
+    "Enter a reference number",
+    "<p>Tell us about:</p><ul><li>what you'll do</li><li>who will benefit</li><li>how you'll measure it</li></ul>",
+    "This must match your registered legal <b>organisation name</b>",
+    "<p>You can select more than one.</p>\n<p>Max 250 words.</p>",
+]
+
+
+def generate_form_json(
+    pages: int = 20,
+    branching_factor: int = 2,
+    branch_length: int = 2,
+    diamond_every: int = 3,
+    loops: int = 0,
+    lists: int = 3,
+    list_items: int = 5,
+    components_per_page: int = 3,
+    seed: int = 0,
+) -> dict:
+    """Generates a synthetic form json, in the shape Form Designer exports, of a given size and shape.
+
+    The form is a chain of pages. Every `diamond_every` pages along the chain, a page asks a radios question and
+    branches to `branching_factor` routes of `branch_length` pages, with a condition on each route's answer, and
+    the routes all merge back together at the next page on the chain. Loops go back from the end of a branch to
+    the question it branched on, as an "add another" page would. The same seed always generates the same form.
+
+    Args:
+        pages (int): Number of pages, roughly - the last diamond is finished even if it takes the form over this
+        branching_factor (int): Number of routes from each branching question
+        branch_length (int): Number of pages on each route
+        diamond_every (int): How many pages along the chain each branching question is. 0 for no branching
+        loops (int): Number of branches that loop back to their question
+        lists (int): Number of lists, each used by a radios or checkboxes question
+        list_items (int): Number of items in each list
+        components_per_page (int): Number of components on each page
+        seed (int): Seed for the choice of component types and hints
+
+    Returns:
+        dict: The form json
+    """
+    generator = _FormGenerator(branching_factor, list_items, components_per_page, random.Random(seed))
+    for list_idx in range(max(lists, 1 if diamond_every else 0)):
+        generator.add_list(f"list-{list_idx}")
+
+    chain_idx = 0
+    branching_pages = []
+    while len(generator.pages) < pages:
+        if diamond_every and chain_idx % diamond_every == diamond_every - 1:
+            branching_pages.append(generator.add_diamond(branch_length))
+        else:
+            generator.add_page()
+        chain_idx += 1
+    generator.pages[-1]["next"] = [{"path": "/summary"}]
+
+    # Spread the loops across the diamonds, so they don't all go through the same pages
+    for loop_idx in range(min(loops, len(branching_pages) * branching_factor)):
+        question_page, branch_ends = branching_pages[loop_idx % len(branching_pages)]
+        branch_end = branch_ends[(loop_idx // len(branching_pages)) % len(branch_ends)]
+        branch_end["next"].append({"path": question_page["path"], "condition": generator.add_yes_condition(branch_end)})
+
+    return {
+        "startPage": generator.pages[0]["path"],
+        "pages": generator.pages,
+        "lists": generator.lists,
+        "conditions": generator.conditions,
+        "sections": [],
+        "fees": [],
+        "outputs": [],
+        "version": 2,
+        "skipSummary": False,
+        "name": f"Synthetic form with {len(generator.pages)} pages",
+    }
+
+
+class _FormGenerator:
+    """Builds up the pages, lists and conditions of a synthetic form, linking each new page on from the last"""
+
+    def __init__(self, branching_factor: int, list_items: int, components_per_page: int, rng: random.Random):
+        self.branching_factor = branching_factor
+        self.list_items = list_items
+        self.components_per_page = components_per_page
+        self.rng = rng
+        self.pages = []
+        self.lists = []
+        self.conditions = []
+        # Pages that should go on to the next page added
+        self.open_ends = []
+
+    def add_list(self, name: str):
+        self.lists.append(
+            {
+                "name": name,
+                "title": f"Options for {name}",
+                "type": "string",
+                "items": [
+                    {"text": f"Option {item_idx} of {name}", "value": f"{name}-{item_idx}"}
+                    for item_idx in range(self.list_items)
+                ],
+            }
+        )
+
+    def add_page(self, components: list[dict] = None) -> dict:
+        page_idx = len(self.pages)
+        page = {
+            "path": f"/page-{page_idx}",
+            "title": f"Page {page_idx}",
+            "components": components if components is not None else self._components(page_idx),
+            "next": [],
+        }
+        for open_end in self.open_ends:
+            open_end["next"].append({"path": page["path"]})
+        self.open_ends = [page]
+        self.pages.append(page)
+        return page
+
+    def add_diamond(self, branch_length: int) -> tuple[dict, list[dict]]:
+        """Adds a radios question that branches out to some routes, which merge back at the next page added
+
+        Returns:
+            tuple[dict, list[dict]]: The question page, and the last page of each route
+        """
+        list_name = self.lists[len(self.pages) % len(self.lists)]["name"]
+        field_name = f"branch{len(self.pages)}"
+        question_page = self.add_page(
+            [
+                {
+                    "name": field_name,
+                    "type": "RadiosField",
+                    "title": f"Which route for page {len(self.pages)}?",
+                    "list": list_name,
+                    "options": {},
+                    "schema": {},
+                }
+            ]
+        )
+        branch_ends = []
+        for branch_idx in range(self.branching_factor):
+            value = f"{list_name}-{branch_idx % self.list_items}"
+            condition_name = self._add_condition(field_name, "RadiosField", value)
+            self.open_ends = []
+            branch_start = self.add_page()
+            question_page["next"].append({"path": branch_start["path"], "condition": condition_name})
+            for _ in range(branch_length - 1):
+                self.add_page()
+            branch_ends.append(self.pages[-1])
+        self.open_ends = branch_ends
+        return question_page, branch_ends
+
+    def add_yes_condition(self, page: dict) -> str:
+        """Adds a yes/no question to a page, and a condition for it being answered yes"""
+        field_name = f"again{len(self.conditions)}"
+        page["components"].append(
+            {"name": field_name, "type": "YesNoField", "title": "Do you need to add another?", "options": {}}
+        )
+        return self._add_condition(field_name, "YesNoField", "true")
+
+    def _add_condition(self, field_name: str, field_type: str, value: str) -> str:
+        condition_name = f"condition{len(self.conditions)}"
+        self.conditions.append(
+            {
+                "name": condition_name,
+                "displayName": f"{field_name} is {value}",
+                "value": {
+                    "name": f"{field_name} is {value}",
+                    "conditions": [
+                        {
+                            "field": {"name": field_name, "type": field_type, "display": field_name},
+                            "operator": "is",
+                            "value": {"type": "Value", "value": value, "display": value},
+                        }
+                    ],
+                },
+            }
+        )
+        return condition_name
+
+    def _components(self, page_idx: int) -> list[dict]:
+        components = []
+        for component_idx in range(self.components_per_page):
+            component = {
+                "name": f"field{page_idx}x{component_idx}",
+                "title": f"Question {component_idx} on page {page_idx}",
+                "options": {},
+                "schema": {},
+            }
+            kind = self.rng.choice(("text", "text", "html", "list") if self.lists else ("text", "html"))
+            if kind == "text":
+                component.update(type="TextField", hint=self.rng.choice(HINTS))
+            elif kind == "html":
+                component.update(type="Html", content=self.rng.choice(HINTS))
+            else:
+                component.update(
+                    type=self.rng.choice(("CheckboxesField", "RadiosField")),
+                    list=self.rng.choice(self.lists)["name"],
+                )
+            components.append(component)
+        return components
@@ -0,0 +1,109 @@
+"""
+A stand-in for the Form Store API, for benchmarking without the real one. Every form is published, with a synthetic
+form json from `generate_form_json`, and each request waits for a given latency before it's answered.
+
+Run it on its own, and point FORM_STORE_API_HOST at it, to try the app against a slow Form Store:
+
+    uv run python -m tests.benchmarks.form_store_fake --port 8081 --latency-ms 50 --pages 100
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+
+from flask import Flask, Response
+from werkzeug.serving import make_server
+
+from tests.benchmarks.form_generator import generate_form_json
+
+TIMESTAMP = "2025-01-01T00:00:00Z"
+
+
+def create_form_store_fake(url_paths: list[str] = (), latency_seconds: float = 0.0, **form_shape) -> Flask:
+    """Creates the fake Form Store API, serving `/forms` and `/forms/<url_path>/published`
+
+    Args:
+        url_paths (list[str]): URL paths of the forms listed by `/forms`. Any other form can still be fetched.
+        latency_seconds (float): How long to wait before answering each request
+        **form_shape: Arguments for `generate_form_json`, to set the size of each published form. The seed is
+            taken from the URL path, so forms differ but are the same every time they're fetched.
+
+    Returns:
+        Flask: The WSGI app
+    """
+    app = Flask(__name__)
+
+    @lru_cache(maxsize=None)
+    def published_form(url_path: str) -> bytes:
+        published_json = generate_form_json(**{"seed": zlib.crc32(url_path.encode()), **form_shape})
+        form_json = json.dumps(
+            {
+                **form_metadata(url_path),
+                "published_json": published_json,
+                "hash": hashlib.sha256(json.dumps(published_json, sort_keys=True).encode()).hexdigest(),
+            }
+        )
+        return form_json.encode()
+
+    @app.before_request
+    def wait():
+        time.sleep(latency_seconds)
+
+    @app.route("/forms")
+    def get_forms():
+        return Response(json.dumps([form_metadata(url_path) for url_path in url_paths]), mimetype="application/json")
+
+    @app.route("/forms/<path:url_path>/published")
+    def get_published_form(url_path):
+        return Response(published_form(url_path), mimetype="application/json")
+
+    return app
+
+
+def form_metadata(url_path: str) -> dict:
+    return {
+        "id": f"form-{url_path}",
+        "url_path": url_path,
+        "display_name": url_path.replace("-", " ").capitalize(),
+        "created_at": TIMESTAMP,
+        "updated_at": TIMESTAMP,
+        "published_at": TIMESTAMP,
+        "is_published": True,
+    }
+
+
+@contextmanager
+def run_form_store_fake(app: Flask) -> Iterator[str]:
+    """Serves the fake on a free local port in a background thread, until the context exits
+
+    Yields:
+        str: The URL to use as FORM_STORE_API_HOST
+    """
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name="form-store-fake", daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/forms"
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+
+    create_form_store_fake(latency_seconds=args.latency_ms / 1000, pages=args.pages).run(port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import pytest
+
+from app.all_questions import html_text, metadata_utils
+from app.all_questions.metadata_utils import (
+    build_hierarchy_levels_for_page,
+    generate_metadata,
+    generate_print_data_for_sections,
+)
+from app.export_config.generate_all_questions import generate_html
+from tests.benchmarks.form_generator import generate_form_json
+
+FORM_SHAPES = {
+    "chain": dict(pages=200, diamond_every=0),
+    "diamonds": dict(pages=200, branching_factor=2, branch_length=2),
+    "wide_diamonds": dict(pages=200, branching_factor=6, branch_length=1, diamond_every=2),
+    "loops": dict(pages=200, branching_factor=2, branch_length=2, loops=20),
+    "large": dict(pages=1000, branching_factor=3, branch_length=3, lists=20, list_items=50),
+}
+FORMS_PER_SECTION = 3
+SECTIONS = 2
+# Rounds for benchmarks that clear the caches before each round, which pytest-benchmark can't calibrate itself
+ROUNDS = 10
+
+
+@pytest.fixture(params=FORM_SHAPES.values(), ids=FORM_SHAPES.keys())
+def form_shape(request) -> dict:
+    return request.param
+
+
+@pytest.fixture
+def form_json(form_shape, benchmark) -> dict:
+    form_json = generate_form_json(**form_shape)
+    benchmark.extra_info.update(
+        pages=len(form_json["pages"]),
+        components=sum(len(page["components"]) for page in form_json["pages"]),
+        conditions=len(form_json["conditions"]),
+        lists=len(form_json["lists"]),
+    )
+    return form_json
+
+
+@pytest.fixture
+def sections(form_shape, benchmark) -> list[dict]:
+    sections = [
+        {
+            "section_title": f"Section {section_idx}",
+            "forms": [
+                {
+                    "name": f"form-{section_idx}-{form_idx}",
+                    "form_data": generate_form_json(**form_shape, seed=section_idx * FORMS_PER_SECTION + form_idx),
+                }
+                for form_idx in range(FORMS_PER_SECTION)
+            ],
+        }
+        for section_idx in range(SECTIONS)
+    ]
+    benchmark.extra_info.update(
+        forms=SECTIONS * FORMS_PER_SECTION,
+        pages=sum(len(form["form_data"]["pages"]) for section in sections for form in section["forms"]),
+    )
+    return sections
+
+
+def clear_caches():
+    metadata_utils.print_data_cache.clear()
+    html_text.html_text_cache.clear()
+
+
+def test_generate_metadata(benchmark, form_json):
+    metadata = benchmark(generate_metadata, form_json)
+
+    assert len(metadata["all_pages"]) == len(form_json["pages"])
+
+
+def test_build_hierarchy_levels_for_page(benchmark, form_json):
+    graph = generate_metadata(form_json)["graph"]
+
+    def build_hierarchy_levels():
+        results = {}
+        build_hierarchy_levels_for_page(graph.pages[graph.start_page], results, 1, graph, start_page=True)
+        return results
+
+    results = benchmark(build_hierarchy_levels)
+
+    assert len(results) == len(form_json["pages"])
+
+
+def test_generate_print_data_for_sections(app, benchmark, sections):
+    # Clear the caches before every round, so this times rendering forms that haven't been seen before
+    print_data = benchmark.pedantic(
+        generate_print_data_for_sections, args=(sections, "en"), setup=clear_caches, rounds=ROUNDS, warmup_rounds=1
+    )
+
+    assert len(print_data) == SECTIONS
+
+
+def test_generate_html(app, benchmark, sections):
+    print_data = generate_print_data_for_sections(sections, "en")
+    benchmark.extra_info["html_bytes"] = len(generate_html(print_data))
+
+    html = benchmark(generate_html, print_data)
+
+    assert html.startswith("<div")
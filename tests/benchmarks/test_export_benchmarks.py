@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.all_questions import html_text, metadata_utils
+from app.export_config import generate_all_questions
+from app.shared.cache import get_cache
+from tests.benchmarks.form_store_fake import create_form_store_fake, run_form_store_fake
+from tests.benchmarks.timing_breakdown import TimingBreakdown
+from tests.seed_test_data import init_large_round_data
+
+SECTIONS = 10
+FORMS_PER_SECTION = 10
+FORM_STORE_LATENCY_SECONDS = 0.05
+FORM_SHAPE = dict(pages=40, branching_factor=2, branch_length=2, loops=2)
+ROUNDS = 5
+
+
+@pytest.fixture
+def form_store(app):
+    fake = create_form_store_fake(latency_seconds=FORM_STORE_LATENCY_SECONDS, **FORM_SHAPE)
+    with run_form_store_fake(fake) as form_store_url, patch.dict(app.config, FORM_STORE_API_HOST=form_store_url):
+        yield fake
+
+
+def clear_caches():
+    get_cache().clear()
+    metadata_utils.print_data_cache.clear()
+    generate_all_questions.form_fragment_cache.clear()
+    html_text.html_text_cache.clear()
+
+
+@pytest.mark.seed_config(init_large_round_data(sections=SECTIONS, forms_per_section=FORMS_PER_SECTION))
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user", "form_store")
+def test_create_export_files(benchmark, flask_test_client, seed_dynamic_data, _db):
+    url = f"/rounds/{seed_dynamic_data['rounds'][0].round_id}/sections/create_export_files"
+
+    def export() -> bytes:
+        response = flask_test_client.get(url)
+        assert response.status_code == 200
+        return response.data
+
+    # Clear the caches before every round, so each export is of a round that hasn't been exported before
+    zip_data = benchmark.pedantic(export, setup=clear_caches, rounds=ROUNDS, warmup_rounds=1)
+
+    # Export once more to see where the time goes, without the timing of each part slowing down the benchmark
+    clear_caches()
+    breakdown = TimingBreakdown()
+    with breakdown.record(_db.engine):
+        export()
+    benchmark.extra_info.update(
+        forms=SECTIONS * FORMS_PER_SECTION,
+        form_store_latency_ms=FORM_STORE_LATENCY_SECONDS * 1000,
+        zip_bytes=len(zip_data),
+        **breakdown.timings,
+    )
+    assert breakdown.timings["http"]["GET /forms/<url_path>/published"]["count"] == SECTIONS * FORMS_PER_SECTION
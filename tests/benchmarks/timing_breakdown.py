@@ -0,0 +1,83 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.export_config import export_runner
+from app.shared.form_store_api import get_session
+
+PUBLISHED_FORM_PATH = re.compile(r"/forms/.+/published$")
+
+
+class TimingBreakdown:
+    """Adds up how long an export spends in each export generator, each kind of Form Store API call and each
+    database query, while `record()` is active.
+
+    `timings` holds the count, total and slowest time of each, keyed by the kind of thing timed and then its name:
+    ```
+        {
+            "generators": {"html": {"count": 1, "total_ms": 812.3, "max_ms": 812.3}, ...},
+            "http": {"GET /forms/<url_path>/published": {"count": 100, ...}},
+            "db": {"SELECT round.round_id, ...": {"count": 1, ...}},
+        }
+    ```
+    """
+
+    def __init__(self):
+        self.timings = {"generators": {}, "http": {}, "db": {}}
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, name: str, seconds: float):
+        milliseconds = seconds * 1000
+        with self._lock:
+            timing = self.timings[kind].setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            timing["count"] += 1
+            timing["total_ms"] += milliseconds
+            timing["max_ms"] = max(timing["max_ms"], milliseconds)
+
+    @contextmanager
+    def record(self, engine: Engine) -> Iterator["TimingBreakdown"]:
+        """Times the export generators, Form Store API calls and queries on this engine until the context exits"""
+        run_generators = export_runner.run_generators
+
+        def timed_run_generators(generators: dict[str, Callable[[], Any]]):
+            return run_generators({name: self._timed(name, generator) for name, generator in generators.items()})
+
+        def time_response(response, *args, **kwargs):
+            path = PUBLISHED_FORM_PATH.sub("/forms/<url_path>/published", urlparse(response.url).path)
+            self.add("http", f"{response.request.method} {path}", response.elapsed.total_seconds())
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info["query_started"].pop()
+            self.add("db", " ".join(statement.split())[:120], time.perf_counter() - started)
+
+        response_hooks = get_session().hooks["response"]
+        response_hooks.append(time_response)
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+        try:
+            with patch.object(export_runner, "run_generators", timed_run_generators):
+                yield self
+        finally:
+            event.remove(engine, "after_cursor_execute", after_cursor_execute)
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+            response_hooks.remove(time_response)
+
+    def _timed(self, name: str, generator: Callable[[], Any]) -> Callable[[], Any]:
+        def timed_generator():
+            started = time.perf_counter()
+            try:
+                return generator()
+            finally:
+                self.add("generators", name, time.perf_counter() - started)
+
+        return timed_generator
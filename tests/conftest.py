@@ -1,7 +1,8 @@
 import json
 import os
 import shutil
-from unittest.mock import patch
+from contextlib import ExitStack, contextmanager
+from unittest.mock import MagicMock, patch
 
 import pytest
 from flask import current_app
@@ -9,8 +10,16 @@ from flask_migrate import upgrade
 from sqlalchemy import text
 
 from app.create_app import create_app
+from app.shared.cache import get_cache
+from app.shared.form_store_api import BulkPublishedFormsResponse, PublishedFormResponse
+from app.shared.query_counter import QueryCounter
 from config import Config
-from tests.seed_test_data import fund_without_assessment, init_unit_test_data, insert_test_data
+from tests.seed_test_data import (
+    ABOUT_YOUR_ORG_FORM_JSON,
+    fund_without_assessment,
+    init_unit_test_data,
+    insert_test_data,
+)
 
 pytest_plugins = ["fsd_test_utils.fixtures.db_fixtures"]
 
@@ -152,6 +161,58 @@ def patch_validate_token_rs256_disallowed_domain_user():
         yield mock_validate_token_rs256
 
 
+@pytest.fixture
+def assert_max_queries():
+    """Checks the code run in a `with assert_max_queries(n):` block runs no more than n database queries, e.g. to
+    keep a route from going back to the database for every item it shows"""
+
+    @contextmanager
+    def assert_max_queries(max_queries: int):
+        with QueryCounter() as query_counter:
+            yield query_counter
+        assert query_counter.count <= max_queries, (
+            f"Ran {query_counter.count} queries, more than the {max_queries} allowed:\n{query_counter.summary()}"
+        )
+
+    return assert_max_queries
+
+
+@pytest.fixture
+def mock_published_forms(app):
+    """Mocks the Form Store API for exports and all questions pages, serving every form asked for as a published
+    copy of the about your organisation form, and clears the cache so nothing from an earlier test is reused.
+
+    Yields the mocked FormStoreAPIService, with the form it serves as `published_form`, so a test can change its
+    hash to publish a new version.
+    """
+    published_form = PublishedFormResponse(
+        id="test-form-id",
+        url_path="about-your-org",
+        display_name="About your organisation",
+        created_at=None,
+        updated_at=None,
+        published_at=None,
+        is_published=True,
+        published_json=ABOUT_YOUR_ORG_FORM_JSON,
+        hash="test-hash-123",
+    )
+    mock_form_store_service = MagicMock(published_form=published_form)
+    mock_form_store_service.return_value.get_published_forms_bulk.side_effect = (
+        lambda url_paths: BulkPublishedFormsResponse(forms={url_path: published_form for url_path in url_paths})
+    )
+    mock_form_store_service.return_value.get_published_form.return_value = published_form
+    get_cache().clear()
+    with ExitStack() as stack:
+        for module in (
+            "app.export_config.export_context",
+            "app.export_config.all_questions_cache",
+            "app.shared.fingerprint",
+        ):
+            stack.enter_context(patch(f"{module}.FormStoreAPIService", mock_form_store_service))
+        yield mock_form_store_service
+    get_cache().clear()
+
+
 def pytest_addoption(parser):
     parser.addoption("--e2e", action="store_true", default=False, help="Run end-to-end tests")
     parser.addoption(
@@ -0,0 +1,93 @@
+import fnmatch
+import socketserver
+import threading
+import time
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    """Minimal in-memory server speaking the Redis protocol, supporting just the commands used by `RedisCache`
+    (GET, SET with EX/PX/NX, DEL, SCAN and PING) plus HELLO, so clients can use either RESP2 or RESP3.
+    Listens on a random local port until `shutdown()` is called.
+
+    Expiry times are read from `clock`, so tests can move time on without waiting.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, clock=time.time):
+        super().__init__(("127.0.0.1", 0), _FakeRedisHandler)
+        self.clock = clock
+        self.data = {}
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def shutdown(self):
+        super().shutdown()
+        self.server_close()
+
+    def execute(self, command: str, args: list[bytes], null: bytes) -> bytes:
+        with self.lock:
+            self._expire()
+            match command:
+                case "PING":
+                    return b"+PONG\r\n"
+                case "GET":
+                    value = self.data.get(args[0])
+                    return _bulk(value[0]) if value else null
+                case "SET":
+                    return self._set(args) or null
+                case "DEL":
+                    return f":{sum(self.data.pop(key, None) is not None for key in args)}\r\n".encode()
+                case "SCAN":
+                    pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+                    keys = [key for key in self.data if fnmatch.fnmatchcase(key.decode(), pattern)]
+                    return b"*2\r\n" + _bulk(b"0") + f"*{len(keys)}\r\n".encode() + b"".join(_bulk(k) for k in keys)
+            return f"-ERR unknown command '{command}'\r\n".encode()
+
+    def _set(self, args: list[bytes]) -> bytes | None:
+        key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+        if b"NX" in options and key in self.data:
+            return None
+        expires_at = None
+        if b"EX" in options:
+            expires_at = self.clock() + int(options[options.index(b"EX") + 1])
+        elif b"PX" in options:
+            expires_at = self.clock() + int(options[options.index(b"PX") + 1]) / 1000
+        self.data[key] = (value, expires_at)
+        return b"+OK\r\n"
+
+    def _expire(self):
+        now = self.clock()
+        for key in [k for k, (_, expires_at) in self.data.items() if expires_at is not None and expires_at <= now]:
+            del self.data[key]
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        protocol = 2
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            command = args[0].decode().upper()
+            if command == "HELLO":
+                protocol = int(args[1]) if len(args) > 1 else protocol
+                header = b"%1\r\n" if protocol == 3 else b"*2\r\n"
+                self.wfile.write(header + _bulk(b"proto") + f":{protocol}\r\n".encode())
+                continue
+            null = b"_\r\n" if protocol == 3 else b"$-1\r\n"
+            self.wfile.write(self.server.execute(command, args[1:], null))
+
+
+def _bulk(value: bytes) -> bytes:
+    return f"${len(value)}\r\n".encode() + value + b"\r\n"
@@ -347,6 +347,47 @@ def init_unit_test_data() -> dict:
     }
 
 
+def init_large_round_data(sections: int = 10, forms_per_section: int = 10) -> dict:
+    """Unit test data with a round of many sections and forms, for benchmarking. Each form has its own URL path."""
+    test_data = init_unit_test_data()
+    round_id = test_data["rounds"][0].round_id
+    test_data["sections"] = [
+        Section(
+            section_id=uuid4(),
+            index=section_idx,
+            round_id=round_id,
+            name_in_apply_json={"en": f"Benchmark section {section_idx}"},
+        )
+        for section_idx in range(1, sections + 1)
+    ]
+    test_data["forms"] = [
+        Form(
+            form_id=uuid4(),
+            section_id=section.section_id,
+            section_index=form_idx,
+            url_path=f"benchmark-form-{section.index}-{form_idx}",
+        )
+        for section in test_data["sections"]
+        for form_idx in range(1, forms_per_section + 1)
+    ]
+    return test_data
+
+
+def init_many_funds_data(funds: int = 5) -> dict:
+    """Unit test data with several funds, each with its own round, for checking listings don't run a query per row.
+    Only the first round has sections and forms."""
+    test_data = init_unit_test_data()
+    for fund_idx in range(2, funds + 1):
+        fund_data = init_unit_test_data()
+        fund = fund_data["funds"][0]
+        fund.short_name = f"UTF-MANY-{fund_idx}"
+        fund.name_json = {"en": f"Unit Test Fund {fund_idx}"}
+        test_data["organisations"] += fund_data["organisations"]
+        test_data["funds"].append(fund)
+        test_data["rounds"] += fund_data["rounds"]
+    return test_data
+
+
 # NOSONAR Ignore since this data is related to unit tests
 def fund_without_assessment() -> dict:
     organisation_uuid = uuid4()
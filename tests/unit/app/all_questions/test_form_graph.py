@@ -0,0 +1,85 @@
+from app.all_questions.form_graph import FormGraph
+
+BRANCHING_FORM_JSON = {
+    "startPage": "/start",
+    "pages": [
+        {"path": "/start", "next": [{"path": "/yes"}, {"path": "/no"}]},
+        {"path": "/yes", "next": [{"path": "/end"}]},
+        {"path": "/no", "next": [{"path": "/end"}, {"path": "/end"}]},
+        {"path": "/end", "next": [{"path": "/summary"}]},
+    ],
+}
+
+
+def test_from_form_json_indexes_pages_by_path():
+    graph = FormGraph.from_form_json(BRANCHING_FORM_JSON)
+
+    assert graph.start_page == "/start"
+    assert list(graph.pages) == ["/start", "/yes", "/no", "/end"]
+    assert graph.get_page("/yes") == {"path": "/yes", "next_paths": ["/end"]}
+    assert graph.get_page("/summary") is None
+    assert "/end" in graph
+    assert "/summary" not in graph
+    assert graph.page_json["/yes"] is BRANCHING_FORM_JSON["pages"][1]
+
+
+def test_from_form_json_builds_forward_and_reverse_adjacency():
+    graph = FormGraph.from_form_json(BRANCHING_FORM_JSON)
+
+    assert graph.next_paths["/start"] == ["/yes", "/no"]
+    assert graph.previous_paths["/end"] == ["/yes", "/no"]
+    assert graph.previous_paths["/summary"] == ["/end"]
+    assert "/start" not in graph.previous_paths
+
+
+LOOPING_FORM_JSON = {
+    "startPage": "/start",
+    "pages": [
+        {"path": "/start", "next": [{"path": "/add-item"}]},
+        {"path": "/add-item", "next": [{"path": "/check-items"}]},
+        {"path": "/check-items", "next": [{"path": "/add-item"}, {"path": "/end"}]},
+        {"path": "/end", "next": [{"path": "/summary"}]},
+    ],
+}
+
+
+def test_strongly_connected_components_are_in_reverse_topological_order():
+    graph = FormGraph.from_form_json(LOOPING_FORM_JSON)
+
+    components = graph.strongly_connected_components()
+
+    assert [sorted(c) for c in components] == [["/summary"], ["/end"], ["/add-item", "/check-items"], ["/start"]]
+
+
+def test_transitive_closure_for_branching_form():
+    graph = FormGraph.from_form_json(BRANCHING_FORM_JSON)
+
+    closure = graph.transitive_closure()
+
+    assert closure.to_paths(closure.after["/start"]) == ["/yes", "/no", "/end", "/summary"]
+    assert closure.to_paths(closure.after["/no"]) == ["/end", "/summary"]
+    assert closure.to_paths(closure.previous["/end"]) == ["/start", "/yes", "/no"]
+    assert closure.to_paths(closure.previous["/start"]) == []
+    assert "/summary" not in closure.after
+
+
+def test_transitive_closure_terminates_for_pages_that_loop_back():
+    graph = FormGraph.from_form_json(LOOPING_FORM_JSON)
+
+    closure = graph.transitive_closure()
+
+    # Pages in a loop can come both before and after themselves
+    assert closure.to_paths(closure.after["/add-item"]) == ["/add-item", "/check-items", "/end", "/summary"]
+    assert closure.to_paths(closure.previous["/add-item"]) == ["/start", "/add-item", "/check-items"]
+    assert closure.to_paths(closure.after["/end"]) == ["/summary"]
+    assert closure.to_paths(closure.previous["/end"]) == ["/start", "/add-item", "/check-items"]
+
+
+def test_transitive_closure_handles_long_forms_without_recursion():
+    pages = [{"path": f"/page-{i}", "next": [{"path": f"/page-{i + 1}"}]} for i in range(5000)]
+    graph = FormGraph.from_form_json({"startPage": "/page-0", "pages": pages})
+
+    closure = graph.transitive_closure()
+
+    assert len(closure.to_paths(closure.after["/page-0"])) == 5000
+    assert closure.to_paths(closure.previous["/page-1"]) == ["/page-0"]
@@ -0,0 +1,69 @@
+import pytest
+
+from app.all_questions.form_indexes import FormIndexes
+from app.all_questions.read_forms import determine_display_value_for_condition
+
+FORM_JSON = {
+    "lists": [
+        {"name": "colours", "items": [{"value": "r", "text": "Red"}, {"value": "r", "text": "Rouge"}]},
+        {"name": "colours", "items": [{"value": "b", "text": "Blue"}]},
+        {"name": "empty", "items": []},
+    ],
+    "conditions": [
+        {
+            "name": "likes-red",
+            "value": {
+                "conditions": [
+                    {"field": {"name": "colour"}, "value": {"value": "r"}},
+                    {"field": {"name": "size"}, "value": {"value": "big"}, "coordinator": "and"},
+                ]
+            },
+        },
+        {"name": "likes-red", "value": {"conditions": [{"field": {"name": "shape"}, "value": {"value": "round"}}]}},
+    ],
+}
+
+
+def test_from_form_json_indexes_lists_by_name():
+    indexes = FormIndexes.from_form_json(FORM_JSON)
+
+    # The first list and item with each name or value is used
+    assert indexes.list_items["colours"] == FORM_JSON["lists"][0]["items"]
+    assert indexes.list_item_text["colours"] == {"r": "Red"}
+    assert indexes.list_items["empty"] == []
+
+
+def test_from_form_json_indexes_conditions_by_name_and_field():
+    indexes = FormIndexes.from_form_json(FORM_JSON)
+
+    assert indexes.conditions["likes-red"] is FORM_JSON["conditions"][0]
+    assert indexes.conditions_for_field("likes-red", "size") == [FORM_JSON["conditions"][0]["value"]["conditions"][1]]
+    # Fields tested by any condition have conditions, but only the first condition with a name is used
+    assert indexes.has_conditions("shape")
+    assert indexes.conditions_for_field("likes-red", "shape") == []
+    assert not indexes.has_conditions("name")
+    with pytest.raises(KeyError):
+        indexes.conditions_for_field("missing", "colour")
+
+
+def test_from_form_json_without_lists_or_conditions():
+    indexes = FormIndexes.from_form_json({})
+
+    assert indexes.list_items == {}
+    assert indexes.conditions == {}
+
+
+@pytest.mark.parametrize(
+    "condition_value, list_name, expected",
+    [
+        ("true", None, "Yes"),
+        ("r", "colours", "Red"),
+        ("x", "colours", None),
+        ("x", "empty", "x"),
+        ("x", "missing", "x"),
+    ],
+)
+def test_determine_display_value_for_condition(condition_value, list_name, expected):
+    indexes = FormIndexes.from_form_json(FORM_JSON)
+
+    assert determine_display_value_for_condition(condition_value, list_name, indexes) == expected
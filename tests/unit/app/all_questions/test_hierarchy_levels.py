@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.all_questions.metadata_utils import (
+    build_hierarchy_levels_for_page,
+    generate_metadata,
+    generate_print_data_for_sections,
+)
+
+TEST_DATA_DIR = Path(__file__).parent.parent.parent.parent / "test_data"
+
+# Generated from the original recursive implementation of build_hierarchy_levels_for_page
+with open(TEST_DATA_DIR / "expected" / "hierarchy_levels.json", "r") as f:
+    EXPECTED = json.load(f)
+
+
+def build_hierarchy_levels(form_json: dict) -> dict:
+    metadata = generate_metadata(form_json)
+    graph = metadata["graph"]
+    results = {}
+    build_hierarchy_levels_for_page(graph.pages[graph.start_page], results, 1, graph, start_page=True)
+    return results
+
+
+@pytest.mark.parametrize("filename", sorted(p.name for p in TEST_DATA_DIR.glob("*.json")))
+def test_hierarchy_levels_match_expected(filename):
+    with open(TEST_DATA_DIR / filename, "r") as f:
+        form_json = json.load(f)
+
+    assert build_hierarchy_levels(form_json) == EXPECTED[filename]["hierarchy_levels"]
+
+
+@pytest.mark.parametrize("filename", sorted(name for name, e in EXPECTED.items() if "heading_numbers" in e))
+def test_heading_numbers_match_expected(app, filename):
+    with open(TEST_DATA_DIR / filename, "r") as f:
+        form_json = json.load(f)
+
+    print_data = generate_print_data_for_sections(
+        [{"section_title": "1. Section", "forms": [{"name": filename, "form_data": form_json}]}], lang="en"
+    )
+
+    heading_numbers = {path: d["heading_number"] for path, d in print_data["section"]["form_print_data"].items()}
+    assert heading_numbers == EXPECTED[filename]["heading_numbers"]
+
+
+def test_hierarchy_levels_for_long_linear_form():
+    pages = [{"path": f"/page-{i}", "next": [{"path": f"/page-{i + 1}"}]} for i in range(1500)]
+    pages.append({"path": "/page-1500", "next": [{"path": "/summary"}]})
+
+    results = build_hierarchy_levels({"startPage": "/page-0", "pages": pages})
+
+    assert results["/page-0"] == 1
+    assert results["/page-1"] == 2
+    assert results["/page-1500"] == 2
+
+
+def test_hierarchy_levels_for_form_that_loops_back():
+    form_json = {
+        "startPage": "/start",
+        "pages": [
+            {"path": "/start", "next": [{"path": "/add-item"}]},
+            {"path": "/add-item", "next": [{"path": "/check-items"}]},
+            {"path": "/check-items", "next": [{"path": "/add-item"}, {"path": "/end"}]},
+            {"path": "/end", "next": [{"path": "/summary"}]},
+        ],
+    }
+
+    assert build_hierarchy_levels(form_json) == {"/start": 1, "/add-item": 2, "/check-items": 1, "/end": 2}
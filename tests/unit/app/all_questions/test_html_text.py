@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.all_questions import html_text
+from app.all_questions.html_text import extract_text_from_html
+
+
+@pytest.fixture(autouse=True)
+def clear_html_text_cache():
+    html_text.html_text_cache.clear()
+    yield
+    html_text.html_text_cache.clear()
+
+
+@pytest.mark.parametrize(
+    "html, expected",
+    [
+        ("<p>Hello <b>world</b>!</p>", ["Hello", "world", "!"]),
+        (
+            "<p>Tell us about:</p><ul><li>your <b>project</b></li>\n<li>its costs</li></ul><p>Max 500 words</p>",
+            ["Tell us about:", ["your project", "its costs"], "Max 500 words"],
+        ),
+        ("<ul>Loose<li>one</li><li><!-- comment -->two</li><li>  </li></ul>", [["Loose", "one", "two"]]),
+        ("<ul><li>outer<ul><li>inner</li></ul></li></ul>", [["outerinner"]]),
+        ("<ul></ul>", [[]]),
+        ("<p>Fish &amp; chips&nbsp;&#150; &#x2014; &unknown;</p>", ["Fish & chips\xa0– — &unknown"]),
+        ("<p>Line<br>break</br>after</p>", ["Line", "breakafter"]),
+        ("<!-- hidden --><p><![CDATA[kept]]></p><script>var x;</script>", ["kept"]),
+        ("<pre>  </pre><p>  </p>", []),
+        ("<ul><li>unclosed<li>next</ul>after", [["unclosednext"], "after"]),
+        ("Plain text", ["Plain text"]),
+    ],
+)
+def test_extract_text_from_html(html, expected):
+    assert extract_text_from_html(html) == expected
+
+
+def test_extract_text_from_html_is_cached():
+    html = "<p>Intro</p><ul><li>one</li></ul>"
+
+    with patch.object(html_text, "HtmlTextExtractor", wraps=html_text.HtmlTextExtractor) as mock_extractor:
+        first = extract_text_from_html(html)
+        # Callers change what they're given, which mustn't change what's cached
+        first.append("changed")
+        first[1].append("changed")
+        second = extract_text_from_html(html)
+
+    mock_extractor.assert_called_once()
+    assert second == ["Intro", ["one"]]
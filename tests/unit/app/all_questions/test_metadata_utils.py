@@ -0,0 +1,72 @@
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from app.all_questions import metadata_utils
+from app.all_questions.metadata_utils import get_print_data_for_form
+from tests.seed_test_data import ABOUT_YOUR_ORG_FORM_JSON
+
+
+@pytest.fixture(autouse=True)
+def clear_print_data_cache():
+    metadata_utils.print_data_cache.clear()
+    yield
+    metadata_utils.print_data_cache.clear()
+
+
+def test_get_print_data_for_form_caches_by_hash(app):
+    form = {"name": "about-your-org", "form_data": ABOUT_YOUR_ORG_FORM_JSON, "hash": "hash-1"}
+
+    with patch.object(metadata_utils, "generate_metadata", wraps=metadata_utils.generate_metadata) as mock_metadata:
+        first = get_print_data_for_form(form, section_idx=1, form_idx=0)
+        second = get_print_data_for_form(form, section_idx=1, form_idx=0)
+
+    assert first == second
+    assert first["/organisation-name"]["heading_number"] == "1.1"
+    mock_metadata.assert_called_once()
+
+
+def test_get_print_data_for_form_cache_key_includes_position_lang_and_hash(app):
+    form = {"name": "about-your-org", "form_data": ABOUT_YOUR_ORG_FORM_JSON, "hash": "hash-1"}
+
+    with patch.object(metadata_utils, "generate_metadata", wraps=metadata_utils.generate_metadata) as mock_metadata:
+        first = get_print_data_for_form(form, section_idx=1, form_idx=0)
+        moved = get_print_data_for_form(form, section_idx=2, form_idx=3)
+        get_print_data_for_form(form, section_idx=1, form_idx=0, lang="cy")
+        get_print_data_for_form({**form, "hash": "hash-2"}, section_idx=1, form_idx=0)
+
+    assert first["/organisation-name"]["heading_number"] == "1.1"
+    assert moved["/organisation-name"]["heading_number"] == "2.4"
+    assert mock_metadata.call_count == 4
+
+
+def test_get_print_data_for_form_without_hash_is_not_cached(app):
+    form = {"name": "about-your-org", "form_data": ABOUT_YOUR_ORG_FORM_JSON}
+
+    with patch.object(metadata_utils, "generate_metadata", wraps=metadata_utils.generate_metadata) as mock_metadata:
+        get_print_data_for_form(form, section_idx=1, form_idx=0)
+        get_print_data_for_form(form, section_idx=1, form_idx=0)
+
+    assert mock_metadata.call_count == 2
+    assert len(metadata_utils.print_data_cache) == 0
+
+
+def test_get_print_data_for_form_handles_forms_deeper_than_the_recursion_limit(app):
+    page_count = sys.getrecursionlimit() + 500
+    pages = [
+        {
+            "path": f"/page-{n}",
+            "title": f"Page {n}",
+            "components": [{"name": f"q{n}", "type": "TextField", "title": f"Question {n}", "options": {}}],
+            "next": [{"path": f"/page-{n + 1}" if n + 1 < page_count else "/summary"}],
+        }
+        for n in range(page_count)
+    ]
+    form = {"name": "deep", "form_data": {"startPage": "/page-0", "pages": pages, "lists": [], "conditions": []}}
+
+    print_data = get_print_data_for_form(form, section_idx=1, form_idx=0)
+
+    assert len(print_data) == page_count
+    assert print_data["/page-0"]["heading_number"] == "1.1"
+    assert print_data[f"/page-{page_count - 1}"]["heading_number"] == f"1.1.{page_count - 1}"
@@ -1,15 +1,22 @@
+import io
 import secrets
 import string
+import zipfile
 from pathlib import Path
 from unittest.mock import patch
+from uuid import uuid4
 
 import pytest
 from bs4 import BeautifulSoup
 from flask import g, url_for
 
 from app.blueprints.application.routes import create_export_zip
+from app.export_config.export_jobs import process_export_jobs
+from app.export_config.export_runner import ExportError, ExportResults
+from app.shared.cache import get_cache
 from app.shared.form_store_api import FormResponse
 from tests.helpers import find_button_with_text, submit_form
+from tests.seed_test_data import init_large_round_data
 
 
 @pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
@@ -395,3 +402,149 @@ def test_create_export_zip(temp_output_dir):
     assert output
     output_path = Path(output)
     assert output_path.exists()
+
+
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
+def test_create_export_files_caches_export(mock_published_forms, flask_test_client, seed_dynamic_data):
+    url = f"/rounds/{seed_dynamic_data['rounds'][0].round_id}/sections/create_export_files"
+
+    response = flask_test_client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zip_file:
+        assert "form_runner/about-your-org.json" in zip_file.namelist()
+
+    # Unchanged rounds are served from the cache, or not at all if the client already has them
+    with patch("app.blueprints.application.routes.stream_export") as mock_stream_export:
+        cached_response = flask_test_client.get(url)
+        not_modified_response = flask_test_client.get(url, headers={"If-None-Match": etag})
+    mock_stream_export.assert_not_called()
+    # The round's fingerprint is remembered, so the Form Store API is only asked for the forms once
+    mock_published_forms.return_value.get_published_forms_bulk.assert_called_once()
+    assert cached_response.status_code == 200
+    assert cached_response.data == response.data
+    assert cached_response.headers["ETag"] == etag
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.headers["ETag"] == etag
+    assert "Content-Type" not in not_modified_response.headers
+    assert "Content-Disposition" not in not_modified_response.headers
+
+    # A newly published form changes the export once the remembered fingerprint has expired
+    mock_published_forms.published_form.hash = "test-hash-456"
+    get_cache().clear()
+    changed_response = flask_test_client.get(url, headers={"If-None-Match": etag})
+    assert changed_response.status_code == 200
+    assert changed_response.headers["ETag"] != etag
+
+
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user", "mock_published_forms")
+def test_create_export_files_does_not_stream_exports_that_have_failed(flask_test_client, seed_dynamic_data):
+    url = f"/rounds/{seed_dynamic_data['rounds'][0].round_id}/sections/create_export_files"
+    failing_results = ExportResults(errors={"html": ValueError("Broken")})
+
+    with (
+        patch("app.export_config.export_runner.run_export_generators", return_value=failing_results),
+        patch("app.blueprints.application.routes.run_export_generators", return_value=failing_results),
+    ):
+        # The first failure is only found part way through the stream, which is cut off
+        with pytest.raises(ExportError):
+            flask_test_client.get(url).get_data()
+        # After that the export is built before anything is sent, so the failure is reported
+        with patch("app.blueprints.application.routes.stream_export") as mock_stream_export:
+            with pytest.raises(ExportError):
+                flask_test_client.get(url)
+    mock_stream_export.assert_not_called()
+
+
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user", "mock_published_forms")
+def test_background_export(flask_test_client, seed_dynamic_data):
+    round_id = seed_dynamic_data["rounds"][0].round_id
+
+    response = flask_test_client.post(f"/rounds/{round_id}/exports")
+    assert response.status_code == 202
+    assert response.json["status"] == "QUEUED"
+    status_url = f"/rounds/{round_id}/exports/{response.json['export_job_id']}"
+    assert flask_test_client.get(f"{status_url}/download").status_code == 409
+
+    # Asking again for an unchanged round gives the same job
+    assert flask_test_client.post(f"/rounds/{round_id}/exports").json == response.json
+
+    assert process_export_jobs() == 1
+
+    status = flask_test_client.get(status_url).json
+    assert status["status"] == "COMPLETE"
+    assert status["progress"] == status["total"]
+    download_response = flask_test_client.get(status["download_url"])
+    assert download_response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(download_response.data)) as zip_file:
+        assert "form_runner/about-your-org.json" in zip_file.namelist()
+    not_modified_response = flask_test_client.get(
+        status["download_url"], headers={"If-None-Match": download_response.headers["ETag"]}
+    )
+    assert not_modified_response.status_code == 304
+    assert "Content-Disposition" not in not_modified_response.headers
+    assert flask_test_client.get(f"/rounds/{round_id}/exports/{uuid4()}").status_code == 404
+
+
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
+def test_view_all_questions_revalidates(mock_published_forms, flask_test_client, seed_dynamic_data):
+    url = f"/rounds/{seed_dynamic_data['rounds'][0].round_id}/sections/all-questions"
+
+    response = flask_test_client.get(url)
+    assert response.status_code == 200
+    # Read the whole page, as it's streamed and only cached once it has all been sent
+    assert "What is your organisation" in response.text
+    assert response.cache_control.stale_while_revalidate == 30
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    assert flask_test_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert flask_test_client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    mock_published_forms.return_value.get_published_forms_bulk.assert_called_once()
+
+
+@pytest.mark.seed_config(init_large_round_data(sections=3, forms_per_section=2))
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
+@patch("app.blueprints.application.routes.FormStoreAPIService")
+def test_application_routes_query_budgets(
+    mock_form_store_service, flask_test_client, seed_dynamic_data, assert_max_queries
+):
+    mock_form_store_service.return_value.get_display_name_from_url_path.return_value = "A form"
+    round_id = seed_dynamic_data["rounds"][0].round_id
+    section_id = seed_dynamic_data["sections"][0].section_id
+    fund_id = seed_dynamic_data["funds"][0].fund_id
+    query_budgets = {
+        # The whole round loads in the same number of queries, however many sections and forms it has
+        f"/rounds/{round_id}/sections": 3,
+        f"/rounds/{round_id}/sections/{section_id}": 3,
+        "/rounds/sections/select-grant": 1,
+        f"/rounds/sections/select-application?fund_id={fund_id}": 2,
+    }
+
+    for url, max_queries in query_budgets.items():
+        with assert_max_queries(max_queries):
+            response = flask_test_client.get(url)
+        assert response.status_code == 200
+
+
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
+def test_view_form_questions(mock_published_forms, flask_test_client, seed_dynamic_data, assert_max_queries):
+    round_id = seed_dynamic_data["rounds"][0].round_id
+    section_id = seed_dynamic_data["sections"][0].section_id
+    form_id = seed_dynamic_data["forms"][0].form_id
+    url = f"/rounds/{round_id}/sections/{section_id}/forms/{form_id}/all-questions"
+
+    # The round, with its fund, sections and forms
+    with assert_max_queries(3):
+        response = flask_test_client.get(url)
+    assert response.status_code == 200
+    assert "Preview of form [About your organisation]" in response.text
+    mock_published_forms.return_value.get_published_form.assert_called_once_with("about-your-org")
+    assert flask_test_client.get(url.replace(str(form_id), str(uuid4()))).status_code == 404
+
+    # A browser with a current copy isn't sent the page again, even once it's no longer cached
+    get_cache().clear()
+    with patch("app.export_config.all_questions_cache.generate_html_for_sections") as mock_html:
+        not_modified_response = flask_test_client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+    assert not_modified_response.status_code == 304
+    mock_html.assert_not_called()
@@ -7,6 +7,7 @@ from flask import g
 from app.db.models import Fund, FundingType
 from app.db.queries.fund import get_fund_by_id
 from tests.helpers import submit_form
+from tests.seed_test_data import init_many_funds_data
 
 
 @pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
@@ -470,3 +471,19 @@ def test_fund_search_functionality(flask_test_client, _db):
         # Clean up test data
         _db.session.delete(test_fund)
         _db.session.commit()
+
+
+@pytest.mark.seed_config(init_many_funds_data(funds=5))
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
+def test_fund_routes_query_budgets(flask_test_client, seed_dynamic_data, assert_max_queries):
+    query_budgets = {
+        "/grants/": 2,
+        f"/grants/{seed_dynamic_data['funds'][0].fund_id}": 1,
+    }
+
+    for url, max_queries in query_budgets.items():
+        with assert_max_queries(max_queries) as query_counter:
+            response = flask_test_client.get(url)
+        assert response.status_code == 200
+        # Listings show a row per fund or round, so a query repeated for each row is an N+1
+        assert query_counter.repeated() == {}, query_counter.summary()
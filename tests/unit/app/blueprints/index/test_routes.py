@@ -4,6 +4,7 @@ from unittest.mock import patch
 import pytest
 
 from config import Config
+from tests.seed_test_data import init_large_round_data
 
 
 def test_index_redirects_to_login_for_unauthenticated_user(flask_test_client):
@@ -105,3 +106,26 @@ def test_dashboard_respects_allowed_domains_config(flask_test_client):
     finally:
         # Restore original config
         flask_test_client.application.config["ALLOWED_DOMAINS"] = original_config
+
+
+@pytest.mark.seed_config(init_large_round_data(sections=3, forms_per_section=2))
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
+@patch("app.blueprints.index.routes.requests.post")
+@patch("app.blueprints.index.routes.FormStoreAPIService")
+def test_index_routes_query_budgets(
+    mock_form_store_service, mock_post, flask_test_client, seed_dynamic_data, assert_max_queries
+):
+    mock_post.return_value.status_code = 200
+    query_budgets = {
+        "/": 0,
+        "/login": 0,
+        "/dashboard": 0,
+        "/back": 0,
+        "/accessibility_statement": 0,
+        f"/preview/{seed_dynamic_data['forms'][0].form_id}": 1,
+    }
+
+    for url, max_queries in query_budgets.items():
+        with assert_max_queries(max_queries):
+            response = flask_test_client.get(url)
+        assert response.status_code in (200, 302)
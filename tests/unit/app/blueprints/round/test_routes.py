@@ -8,6 +8,7 @@ from flask import g, url_for
 from app.db.models import Fund, FundingType, Round
 from app.db.queries.round import get_round_by_id
 from tests.helpers import submit_form
+from tests.seed_test_data import init_many_funds_data
 
 radio_fields = {
     "application_fields_download_available": "false",
@@ -532,3 +533,21 @@ def test_create_round_with_assessment_close_date_before_open_date(flask_test_cli
     ]
     error_messages = [li.get_text(strip=True) for li in soup.select(".govuk-error-summary__list li")]
     assert error_messages == expected
+
+
+@pytest.mark.seed_config(init_many_funds_data(funds=5))
+@pytest.mark.usefixtures("set_auth_cookie", "patch_validate_token_rs256_allowed_domain_user")
+def test_round_routes_query_budgets(flask_test_client, seed_dynamic_data, assert_max_queries):
+    round_id = seed_dynamic_data["rounds"][0].round_id
+    query_budgets = {
+        "/rounds/": 3,
+        f"/rounds/{round_id}": 2,
+        "/rounds/select-grant": 1,
+    }
+
+    for url, max_queries in query_budgets.items():
+        with assert_max_queries(max_queries) as query_counter:
+            response = flask_test_client.get(url)
+        assert response.status_code == 200
+        # Listings show a row per fund or round, so a query repeated for each row is an N+1
+        assert query_counter.repeated() == {}, query_counter.summary()
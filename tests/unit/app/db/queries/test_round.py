@@ -6,8 +6,8 @@ import pytest
 from sqlalchemy.orm import joinedload
 
 from app.db.models import Fund, FundingType, Round, Section
-from app.db.queries.round import add_round, delete_selected_round, get_round_by_id
-from tests.seed_test_data import BASIC_ROUND_INFO
+from app.db.queries.round import add_round, delete_selected_round, get_round_by_id, get_round_graph_by_id
+from tests.seed_test_data import BASIC_ROUND_INFO, init_large_round_data
 
 
 @pytest.mark.seed_config(
@@ -119,6 +119,24 @@ def test_get_round_by_id(seed_dynamic_data):
     assert result.title_json["en"] == "round the first"
 
 
+@pytest.mark.seed_config(init_large_round_data(sections=3, forms_per_section=2))
+def test_get_round_graph_by_id(seed_dynamic_data, _db, assert_max_queries):
+    _db.session.expire_all()
+
+    # The round and its fund, the sections, and the forms of every section
+    with assert_max_queries(3):
+        result: Round = get_round_graph_by_id(seed_dynamic_data["rounds"][0].round_id)
+    with assert_max_queries(0):
+        assert result.fund.fund_id == seed_dynamic_data["funds"][0].fund_id
+        assert [section.index for section in result.sections] == [1, 2, 3]
+        assert [form.url_path for form in result.sections[2].forms] == ["benchmark-form-3-1", "benchmark-form-3-2"]
+
+
+def test_get_round_graph_by_id_none(flask_test_client, _db):
+    with pytest.raises(ValueError, match="not found"):
+        get_round_graph_by_id(str(uuid4()))
+
+
 def test_base_path_sequence_insert(seed_dynamic_data, _db):
     fund = seed_dynamic_data["funds"][0]
     new_round_1 = Round(
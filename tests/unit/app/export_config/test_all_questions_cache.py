@@ -0,0 +1,181 @@
+import threading
+import uuid
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.export_config.all_questions_cache import get_form_question_html, get_round_question_html
+from app.export_config.export_context import ExportContext
+from app.shared.cache import get_cache
+from app.shared.form_store_api import FormNotFoundError, PublishedFormResponse
+from tests.seed_test_data import ABOUT_YOUR_ORG_FORM_JSON
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(app):
+    get_cache().clear()
+    yield
+    get_cache().clear()
+
+
+def published_form(form_hash="hash-1"):
+    return PublishedFormResponse(
+        id="about-your-org",
+        url_path="about-your-org",
+        display_name="About your organisation",
+        created_at=None,
+        updated_at=None,
+        published_at=None,
+        is_published=True,
+        published_json=ABOUT_YOUR_ORG_FORM_JSON,
+        hash=form_hash,
+    )
+
+
+@pytest.fixture
+def form():
+    return Mock(form_id=uuid.uuid4(), url_path="about-your-org", section_index=1, updated_at=None)
+
+
+@pytest.fixture
+def round(form):
+    section = Mock(section_id=uuid.uuid4(), index=1, name_in_apply_json={"en": "About you"}, forms=[form])
+    return Mock(
+        round_id=uuid.uuid4(), updated_at=None, fund=Mock(fund_id=uuid.uuid4(), updated_at=None), sections=[section]
+    )
+
+
+@pytest.fixture
+def mock_load(round):
+    published_forms = {"about-your-org": published_form()}
+
+    def from_round(round):
+        return ExportContext(round=round, fund=round.fund, sections=round.sections, published_forms=published_forms)
+
+    with patch("app.export_config.all_questions_cache.ExportContext.from_round", side_effect=from_round) as mock_load:
+        mock_load.published_forms = published_forms
+        yield mock_load
+
+
+def test_round_question_html_is_rendered_once(round, mock_load):
+    with patch(
+        "app.export_config.all_questions_cache.generate_html_for_sections", return_value="<div></div>"
+    ) as mock_html:
+        first = get_round_question_html(round)
+        # Nothing is rendered until the HTML is needed
+        mock_html.assert_not_called()
+        assert first.get_html() == "<div></div>"
+        second = get_round_question_html(round)
+
+    mock_html.assert_called_once()
+    assert first == second
+    # Within the stale window, the Form Store isn't asked again
+    mock_load.assert_called_once()
+
+
+def test_round_question_html_changes_when_round_changes(round, form, mock_load):
+    first = get_round_question_html(round)
+
+    form.section_index = 2
+    moved = get_round_question_html(round)
+
+    assert mock_load.call_count == 2
+    assert moved.etag != first.etag
+
+
+def test_round_question_html_picks_up_published_forms_after_stale_window(round, mock_load):
+    first = get_round_question_html(round)
+
+    mock_load.published_forms["about-your-org"] = published_form("hash-2")
+    assert get_round_question_html(round).etag == first.etag
+
+    # Once the fingerprint has expired, the newly published form is shown
+    get_cache().clear()
+    assert get_round_question_html(round).etag != first.etag
+
+
+def test_round_question_html_etag_is_known_without_rendering(round, mock_load):
+    etag = get_round_question_html(round).etag
+
+    with patch("app.export_config.all_questions_cache.generate_html_for_sections") as mock_html:
+        question_html = get_round_question_html(round)
+
+    mock_html.assert_not_called()
+    assert question_html.html is None
+    assert question_html.etag == etag
+    # Nor are the forms fetched, as the round's fingerprint is remembered
+    mock_load.assert_called_once()
+
+
+@patch("app.export_config.all_questions_cache.FormStoreAPIService")
+def test_form_question_html_is_rendered_once(mock_form_store_service, form):
+    mock_form_store_service.return_value.get_published_form.return_value = published_form()
+
+    first = get_form_question_html(form)
+    first.get_html()
+    second = get_form_question_html(form)
+
+    assert first == second
+    assert first.display_name == "About your organisation"
+    mock_form_store_service.return_value.get_published_form.assert_called_once_with("about-your-org")
+
+
+@patch("app.export_config.all_questions_cache.FormStoreAPIService")
+def test_form_question_html_raises_for_unpublished_form(mock_form_store_service, form):
+    mock_form_store_service.return_value.get_published_form.return_value = None
+
+    with pytest.raises(FormNotFoundError):
+        get_form_question_html(form)
+
+
+def test_streamed_round_question_html_is_cached_once_complete(round, mock_load):
+    rendered = get_round_question_html(round).get_html()
+    get_cache().clear()
+
+    streamed = get_round_question_html(round, stream=True)
+    assert not isinstance(streamed.html, str)
+    # Nothing is cached until the whole page has been streamed
+    assert not isinstance(get_round_question_html(round, stream=True).html, str)
+
+    assert "".join(streamed.html) == rendered
+    cached = get_round_question_html(round, stream=True)
+    assert cached.html == rendered
+    assert cached.etag == streamed.etag
+
+
+def test_streamed_round_question_html_too_big_to_cache(round, mock_load):
+    streamed = get_round_question_html(round, stream=True)
+
+    with patch("app.export_config.all_questions_cache.Config.ALL_QUESTIONS_CACHE_MAX_BYTES", 10):
+        "".join(streamed.html)
+
+    assert not isinstance(get_round_question_html(round, stream=True).html, str)
+
+
+def test_streamed_round_question_html_is_rendered_once_for_concurrent_requests(app, round, mock_load):
+    rendered_sections = []
+
+    def iter_html_for_sections(section_data, lang):
+        for section in section_data:
+            rendered_sections.append(section["section_title"])
+            yield f"<h2>{section['section_title']}</h2>"
+
+    with patch("app.export_config.all_questions_cache.iter_html_for_sections", side_effect=iter_html_for_sections):
+        first = get_round_question_html(round, stream=True)
+        second = get_round_question_html(round, stream=True)
+    # The first request holds the lock from when it starts streaming
+    first_chunks = iter(first.html)
+    first_chunk = next(first_chunks)
+
+    def stream_second():
+        with app.app_context():
+            second_html.append("".join(second.html))
+
+    second_html = []
+    waiting = threading.Thread(target=stream_second)
+    waiting.start()
+    first_html = first_chunk + "".join(first_chunks)
+    waiting.join()
+
+    assert second_html == [first_html] == ["<h2>About you</h2>"]
+    assert rendered_sections == ["About you"]
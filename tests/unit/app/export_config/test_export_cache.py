@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.export_config.export_cache import cache_export, cache_export_stream, get_cached_export, get_export_failure
+from app.shared.cache import get_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(app):
+    get_cache().clear()
+    yield
+    get_cache().clear()
+
+
+def test_cache_export():
+    assert get_cached_export("fingerprint") is None
+
+    cache_export("fingerprint", b"zip data")
+
+    assert get_cached_export("fingerprint") == b"zip data"
+
+
+@patch("app.export_config.export_cache.Config.EXPORT_CACHE_MAX_BYTES", 4)
+def test_cache_export_skips_big_exports():
+    cache_export("fingerprint", b"zip data")
+
+    assert get_cached_export("fingerprint") is None
+
+
+def test_cache_export_stream_caches_finished_stream():
+    chunks = list(cache_export_stream("fingerprint", iter([b"zip ", b"data"])))
+
+    assert chunks == [b"zip ", b"data"]
+    assert get_cached_export("fingerprint") == b"zip data"
+    assert get_export_failure("fingerprint") is None
+
+
+def test_cache_export_stream_does_not_cache_failed_stream():
+    def failing_stream():
+        yield b"zip "
+        raise ValueError("Generator failed")
+
+    with pytest.raises(ValueError):
+        list(cache_export_stream("fingerprint", failing_stream()))
+
+    assert get_cached_export("fingerprint") is None
+    assert get_export_failure("fingerprint") == "Generator failed"
+
+
+def test_cache_export_stream_does_not_cache_abandoned_stream():
+    chunks = cache_export_stream("fingerprint", iter([b"zip ", b"data"]))
+    next(chunks)
+    chunks.close()
+
+    assert get_cached_export("fingerprint") is None
+
+
+@patch("app.export_config.export_cache.Config.EXPORT_CACHE_MAX_BYTES", 6)
+def test_cache_export_stream_skips_big_streams():
+    chunks = list(cache_export_stream("fingerprint", iter([b"zip ", b"data", b"!"])))
+
+    assert chunks == [b"zip ", b"data", b"!"]
+    assert get_cached_export("fingerprint") is None
@@ -0,0 +1,117 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.export_config.export_context import ExportContext
+from app.shared.form_store_api import BulkPublishedFormsResponse, FormNotFoundError
+
+
+def mock_round():
+    sections = []
+    for section_index, url_paths in enumerate([["form-a", "form-b"], ["form-c"]], start=1):
+        section = Mock(section_id=f"section-{section_index}", index=section_index, name_in_apply_json={"en": "Section"})
+        section.forms = [
+            Mock(form_id=f"id-{url_path}", url_path=url_path, section_index=i, updated_at=None)
+            for i, url_path in enumerate(url_paths, start=1)
+        ]
+        sections.append(section)
+    fund = Mock(fund_id="fund-id", updated_at="2025-01-01T00:00:00")
+    return Mock(round_id="round-id", updated_at="2025-01-01T00:00:00", fund=fund, sections=sections)
+
+
+@patch("app.export_config.export_context.get_round_graph_by_id")
+def test_load_fetches_every_form_once(mock_get_round_graph_by_id, app):
+    round = mock_round()
+    mock_get_round_graph_by_id.return_value = round
+    api_service = Mock()
+    api_service.get_published_forms_bulk.side_effect = lambda url_paths: BulkPublishedFormsResponse(
+        forms={url_path: Mock(url_path=url_path) for url_path in url_paths}
+    )
+
+    export_context = ExportContext.load("round-id", api_service)
+
+    mock_get_round_graph_by_id.assert_called_once_with("round-id")
+    api_service.get_published_forms_bulk.assert_called_once_with(["form-a", "form-b", "form-c"])
+    assert export_context.round is round
+    assert export_context.fund is round.fund
+    assert [form.url_path for form in export_context.forms] == ["form-a", "form-b", "form-c"]
+    assert list(export_context.published_forms) == ["form-a", "form-b", "form-c"]
+
+
+@patch("app.export_config.export_context.get_round_graph_by_id")
+def test_load_raises_for_missing_forms(mock_get_round_graph_by_id, app):
+    mock_get_round_graph_by_id.return_value = mock_round()
+    api_service = Mock()
+    api_service.get_published_forms_bulk.side_effect = FormNotFoundError(url_paths=["form-b"])
+
+    with pytest.raises(FormNotFoundError):
+        ExportContext.load("round-id", api_service)
+
+
+def test_from_round_uses_the_loaded_round(app):
+    round = mock_round()
+    api_service = Mock()
+    api_service.get_published_forms_bulk.side_effect = lambda url_paths: BulkPublishedFormsResponse(
+        forms={url_path: Mock(url_path=url_path) for url_path in url_paths}
+    )
+
+    with patch("app.export_config.export_context.get_round_graph_by_id") as mock_get_round_graph_by_id:
+        export_context = ExportContext.from_round(round, api_service)
+
+    mock_get_round_graph_by_id.assert_not_called()
+    assert export_context.round is round
+    assert list(export_context.published_forms) == ["form-a", "form-b", "form-c"]
+
+
+def test_load_requires_round_id():
+    with pytest.raises(ValueError, match="Round ID is required to export a round."):
+        ExportContext.load(None)
+
+
+def export_context_for(round) -> ExportContext:
+    return ExportContext(
+        round=round,
+        fund=round.fund,
+        sections=round.sections,
+        published_forms={form.url_path: Mock(hash=f"hash-{form.url_path}") for s in round.sections for form in s.forms},
+    )
+
+
+def test_fingerprint_is_stable_for_unchanged_round():
+    round = mock_round()
+
+    assert export_context_for(round).fingerprint() == export_context_for(round).fingerprint()
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda round, context: setattr(round, "updated_at", "2025-01-02T00:00:00"),
+        lambda round, context: setattr(round.fund, "updated_at", "2025-01-02T00:00:00"),
+        lambda round, context: setattr(round.sections[0], "index", 3),
+        lambda round, context: setattr(round.sections[0].forms[0], "updated_at", "2025-01-02T00:00:00"),
+        lambda round, context: round.sections[1].forms.pop(),
+        lambda round, context: setattr(context.published_forms["form-a"], "hash", "new-hash"),
+    ],
+)
+def test_fingerprint_changes_with_round(change):
+    round = mock_round()
+    export_context = export_context_for(round)
+    fingerprint = export_context.fingerprint()
+
+    change(round, export_context)
+
+    assert export_context.fingerprint() != fingerprint
+
+
+def test_form_output_reports_each_output():
+    round = mock_round()
+    on_form_output = Mock()
+    export_context = ExportContext(
+        round=round, fund=round.fund, sections=round.sections, published_forms={}, on_form_output=on_form_output
+    )
+
+    assert export_context.form_output("form_runner/form-a", "hash", lambda: "{}") == "{}"
+    assert export_context.form_output("html/form-a", "hash", lambda: "<p></p>") == "<p></p>"
+
+    assert on_form_output.call_count == 2
@@ -0,0 +1,196 @@
+import time
+import uuid
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.db.models import ExportJob, ExportJobStatus
+from app.export_config.export_jobs import (
+    export_job_as_dict,
+    process_export_jobs,
+    run_export_job,
+    start_export_worker,
+)
+from app.export_config.export_runner import ExportError
+
+JOB_ID = uuid.uuid4()
+ROUND_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def mock_export_context():
+    with patch("app.export_config.export_jobs.ExportContext") as mock_export_context:
+        export_context = mock_export_context.load.return_value
+        export_context.fingerprint.return_value = "fingerprint"
+        export_context.forms = [Mock(), Mock()]
+        yield export_context
+
+
+@pytest.fixture
+def mock_update_export_job():
+    with patch("app.export_config.export_jobs.update_export_job") as mock_update_export_job:
+        yield mock_update_export_job
+
+
+@patch("app.export_config.export_jobs.cache_export")
+@patch("app.export_config.export_jobs.get_cached_export", return_value=None)
+@patch("app.export_config.export_jobs.stream_export")
+def test_run_export_job_records_progress(
+    mock_stream_export, _, mock_cache_export, app, mock_export_context, mock_update_export_job
+):
+    def stream(round_id, export_context):
+        export_context.on_form_output()
+        export_context.on_form_output()
+        yield from [b"one", b"two", b"three"]
+
+    mock_stream_export.side_effect = stream
+
+    run_export_job(JOB_ID, ROUND_ID, "fingerprint")
+
+    mock_stream_export.assert_called_once_with(ROUND_ID, mock_export_context)
+    updates = [call.kwargs for call in mock_update_export_job.call_args_list]
+    assert updates[:6] == [{"total": 11}, *({"progress": progress} for progress in range(1, 6))]
+    assert updates[-1]["status"] == ExportJobStatus.COMPLETE
+    assert updates[-1]["artifact"] == b"onetwothree"
+    mock_cache_export.assert_called_once_with("fingerprint", b"onetwothree")
+
+
+@patch("app.export_config.export_jobs.stream_export")
+@patch("app.export_config.export_jobs.get_cached_export", return_value=b"cached zip")
+def test_run_export_job_uses_cached_export(_, mock_stream_export, app, mock_export_context, mock_update_export_job):
+    run_export_job(JOB_ID, ROUND_ID, "fingerprint")
+
+    mock_stream_export.assert_not_called()
+    mock_update_export_job.assert_called_once()
+    assert mock_update_export_job.call_args.kwargs["status"] == ExportJobStatus.COMPLETE
+    assert mock_update_export_job.call_args.kwargs["artifact"] == b"cached zip"
+
+
+@patch("app.export_config.export_jobs.get_cached_export", return_value=None)
+@patch("app.export_config.export_jobs.stream_export")
+def test_run_export_job_fails_job_when_export_fails(
+    mock_stream_export, _, app, mock_export_context, mock_update_export_job
+):
+    def failing_stream():
+        yield b"one"
+        raise ExportError({"html": ValueError("Broken")})
+
+    mock_stream_export.return_value = failing_stream()
+
+    run_export_job(JOB_ID, ROUND_ID, "fingerprint")
+
+    mock_update_export_job.assert_called_with(
+        JOB_ID, status=ExportJobStatus.FAILED, error="Export failed in: html (ValueError('Broken'))"
+    )
+
+
+@patch("app.export_config.export_jobs.remember_round_fingerprint")
+@patch("app.export_config.export_jobs.cache_export")
+@patch("app.export_config.export_jobs.get_cached_export", return_value=None)
+@patch("app.export_config.export_jobs.stream_export", return_value=iter([b"zip"]))
+def test_run_export_job_exports_round_as_it_is_now_when_it_has_changed(
+    _, __, mock_cache_export, mock_remember_round_fingerprint, app, mock_export_context, mock_update_export_job
+):
+    mock_export_context.fingerprint.return_value = "new fingerprint"
+
+    run_export_job(JOB_ID, ROUND_ID, "fingerprint")
+
+    mock_update_export_job.assert_any_call(JOB_ID, fingerprint="new fingerprint")
+    mock_cache_export.assert_called_once_with("new fingerprint", b"zip")
+    mock_remember_round_fingerprint.assert_called_once_with(mock_export_context.round, "new fingerprint")
+    assert mock_update_export_job.call_args.kwargs["status"] == ExportJobStatus.COMPLETE
+
+
+@patch("app.export_config.export_jobs.get_cached_export", return_value=None)
+@patch("app.export_config.export_jobs.stream_export")
+def test_run_export_job_fails_job_when_changed_round_is_already_being_exported(
+    mock_stream_export, _, app, mock_export_context, mock_update_export_job
+):
+    mock_export_context.fingerprint.return_value = "new fingerprint"
+
+    def update_export_job(export_job_id, **values):
+        if "fingerprint" in values:
+            raise IntegrityError("UPDATE export_job", {}, Exception("duplicate key"))
+
+    mock_update_export_job.side_effect = update_export_job
+
+    run_export_job(JOB_ID, ROUND_ID, "fingerprint")
+
+    mock_stream_export.assert_not_called()
+    assert mock_update_export_job.call_args.kwargs["status"] == ExportJobStatus.FAILED
+    assert "already being exported" in mock_update_export_job.call_args.kwargs["error"]
+
+
+@patch("app.export_config.export_jobs.Config.EXPORT_JOB_HEARTBEAT_SECONDS", 0.01)
+@patch("app.export_config.export_jobs.cache_export")
+@patch("app.export_config.export_jobs.get_cached_export", return_value=None)
+@patch("app.export_config.export_jobs.stream_export")
+def test_run_export_job_sends_heartbeats_during_slow_steps(
+    mock_stream_export, _, __, app, mock_export_context, mock_update_export_job
+):
+    def slow_stream():
+        time.sleep(0.2)
+        yield b"one"
+
+    mock_stream_export.return_value = slow_stream()
+
+    run_export_job(JOB_ID, ROUND_ID, "fingerprint")
+
+    heartbeats = [call for call in mock_update_export_job.call_args_list if call == ((JOB_ID,), {})]
+    assert heartbeats
+    # Heartbeats stop once the job is finished
+    assert mock_update_export_job.call_args.kwargs["status"] == ExportJobStatus.COMPLETE
+
+
+@patch("app.export_config.export_jobs.run_export_job")
+@patch("app.export_config.export_jobs.claim_next_export_job")
+def test_process_export_jobs_runs_jobs_until_queue_is_empty(mock_claim, mock_run_export_job, app):
+    mock_claim.side_effect = [(JOB_ID, ROUND_ID, "first"), (JOB_ID, ROUND_ID, "second"), None]
+
+    assert process_export_jobs() == 2
+
+    assert [call.args[2] for call in mock_run_export_job.call_args_list] == ["first", "second"]
+
+
+@patch("app.export_config.export_jobs.ThreadPoolExecutor")
+def test_start_export_worker_does_nothing_when_jobs_run_elsewhere(mock_executor, app):
+    with patch("app.export_config.export_jobs.Config.EXPORT_JOBS_RUN_IN_PROCESS", False):
+        start_export_worker()
+
+    mock_executor.assert_not_called()
+
+
+@patch("app.export_config.export_jobs.delete_expired_export_jobs")
+@patch("app.export_config.export_jobs.claim_next_export_job", return_value=None)
+def test_start_export_worker_limits_workers(mock_claim, mock_delete_expired_export_jobs, app):
+    with (
+        patch("app.export_config.export_jobs.Config.EXPORT_JOBS_RUN_IN_PROCESS", True),
+        patch("app.export_config.export_jobs._executor") as mock_executor,
+    ):
+        for _ in range(5):
+            start_export_worker()
+        assert mock_executor.submit.call_count == app.config["EXPORT_JOB_WORKERS"]
+        # Let the workers finish, so they no longer count towards the limit
+        for call in mock_executor.submit.call_args_list:
+            call.args[0]()
+
+    assert mock_claim.call_count == app.config["EXPORT_JOB_WORKERS"]
+    # Each worker clears up expired jobs once the queue is empty
+    assert mock_delete_expired_export_jobs.call_count == app.config["EXPORT_JOB_WORKERS"]
+
+
+def test_export_job_as_dict():
+    export_job = ExportJob(export_job_id=JOB_ID, round_id=ROUND_ID, status=ExportJobStatus.RUNNING, progress=2, total=5)
+
+    assert export_job_as_dict(export_job, "/download") == {
+        "export_job_id": str(JOB_ID),
+        "round_id": str(ROUND_ID),
+        "status": "RUNNING",
+        "progress": 2,
+        "total": 5,
+        "error": None,
+        "download_url": None,
+    }
+    export_job.status = ExportJobStatus.COMPLETE
+    assert export_job_as_dict(export_job, "/download")["download_url"] == "/download"
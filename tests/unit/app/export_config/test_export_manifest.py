@@ -0,0 +1,127 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.export_config.export_context import ExportContext
+from app.export_config.export_manifest import ExportManifest, IncrementalExport
+from app.export_config.export_runner import run_export_generators
+from app.export_config.generate_fund_round_form_jsons import generate_form_jsons_for_round
+from app.export_config.zip_stream import ZipStream
+from app.shared.cache import get_cache
+from app.shared.form_store_api import PublishedFormResponse
+from tests.seed_test_data import ABOUT_YOUR_ORG_FORM_JSON
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(app):
+    get_cache().clear()
+    yield
+    get_cache().clear()
+
+
+def published_form(url_path, form_hash):
+    return PublishedFormResponse(
+        id=url_path,
+        url_path=url_path,
+        display_name=url_path,
+        created_at=None,
+        updated_at=None,
+        published_at=None,
+        is_published=True,
+        published_json=ABOUT_YOUR_ORG_FORM_JSON,
+        hash=form_hash,
+    )
+
+
+@pytest.fixture
+def export_context():
+    forms = [Mock(url_path="first-form"), Mock(url_path="second-form")]
+    return ExportContext(
+        round=Mock(short_name="R1"),
+        fund=Mock(),
+        sections=[Mock(forms=forms)],
+        published_forms={form.url_path: published_form(form.url_path, f"{form.url_path}-1") for form in forms},
+    )
+
+
+def test_manifest_is_empty_until_saved():
+    assert ExportManifest.load("round-1").outputs == {}
+
+    ExportManifest(round_id="round-1", outputs={"form_runner/first-form": "abc"}).save()
+
+    assert ExportManifest.load("round-1").outputs == {"form_runner/first-form": "abc"}
+    assert ExportManifest.load("round-2").outputs == {}
+
+
+def test_incremental_export_only_regenerates_changed_outputs():
+    first_export = IncrementalExport("round-1")
+    assert first_export.get_or_generate("first", "hash-1", lambda: "first output") == "first output"
+    assert first_export.get_or_generate("second", "hash-1", lambda: "second output") == "second output"
+    assert first_export.regenerated == ["first", "second"]
+    first_export.save()
+
+    generate = Mock(return_value="changed output")
+    second_export = IncrementalExport("round-1")
+    assert second_export.get_or_generate("first", "hash-1", generate) == "first output"
+    assert second_export.get_or_generate("second", "hash-2", generate) == "changed output"
+
+    generate.assert_called_once()
+    assert second_export.regenerated == ["second"]
+    assert second_export.manifest.outputs == {"first": "hash-1", "second": "hash-2"}
+
+
+def test_incremental_export_regenerates_everything_when_not_reusing():
+    first_export = IncrementalExport("round-1")
+    first_export.get_or_generate("first", "hash-1", lambda: "first output")
+    first_export.save()
+
+    full_export = IncrementalExport("round-1", reuse=False)
+
+    assert full_export.get_or_generate("first", "hash-1", lambda: "new output") == "new output"
+    assert full_export.regenerated == ["first"]
+
+
+def test_incremental_export_regenerates_outputs_missing_from_cache():
+    first_export = IncrementalExport("round-1")
+    first_export.get_or_generate("first", "hash-1", lambda: "first output")
+    first_export.save()
+    get_cache().delete(IncrementalExport._cache_key("first", "hash-1"))
+
+    second_export = IncrementalExport("round-1")
+
+    assert second_export.get_or_generate("first", "hash-1", lambda: "new output") == "new output"
+
+
+@patch("app.export_config.generate_fund_round_form_jsons.validate_form_json")
+def test_form_jsons_only_regenerated_for_changed_forms(mock_validate_form_json, export_context):
+    export_context.incremental_export = IncrementalExport("round-1")
+    generate_form_jsons_for_round("round-1", ZipStream(max_pending_files=10), export_context)
+    export_context.incremental_export.save()
+    assert mock_validate_form_json.call_count == 2
+
+    export_context.published_forms["second-form"] = published_form("second-form", "second-form-2")
+    export_context.incremental_export = IncrementalExport("round-1")
+    generate_form_jsons_for_round("round-1", ZipStream(max_pending_files=10), export_context)
+
+    assert mock_validate_form_json.call_count == 3
+    assert export_context.incremental_export.regenerated == ["form_runner/second-form"]
+
+
+@patch("app.export_config.export_runner.generate_assessment_config_for_round")
+@patch("app.export_config.export_runner.generate_config_for_round", return_value=({}, {}))
+@patch("app.export_config.export_runner.generate_all_round_html")
+@patch("app.export_config.export_runner.generate_form_jsons_for_round")
+def test_run_export_generators_saves_manifest_only_when_export_succeeds(
+    mock_form_jsons, mock_html, mock_config, mock_assessment, export_context
+):
+    def generate_form_jsons(round_id, base_output_dir, export_context):
+        export_context.form_output("form_runner/first-form", "hash-1", lambda: "{}")
+
+    mock_form_jsons.side_effect = generate_form_jsons
+    mock_html.side_effect = ValueError("Broken")
+    run_export_generators("round-1", "/output", export_context)
+    assert ExportManifest.load("round-1").outputs == {}
+
+    mock_html.side_effect = None
+    run_export_generators("round-1", "/output", export_context)
+    assert ExportManifest.load("round-1").outputs == {"form_runner/first-form": "hash-1"}
@@ -0,0 +1,153 @@
+import io
+import threading
+import zipfile
+from unittest.mock import Mock, patch
+
+import pytest
+from flask import current_app, has_app_context
+from sqlalchemy import inspect
+
+from app.db.models import Round
+from app.db.queries.round import get_round_graph_by_id
+from app.export_config.export_context import ExportContext
+from app.export_config.export_runner import (
+    ExportError,
+    ExportResults,
+    run_export_generators,
+    run_generators,
+    stream_export,
+)
+
+
+def test_run_generators_runs_generators_at_the_same_time(app):
+    # Each generator waits for the others, so this only finishes if they all run at once
+    barrier = threading.Barrier(3, timeout=5)
+
+    def generator(name):
+        barrier.wait()
+        return name
+
+    results = run_generators({name: lambda name=name: generator(name) for name in ["one", "two", "three"]})
+
+    assert results.outputs == {"one": "one", "two": "two", "three": "three"}
+    assert results.errors == {}
+
+
+def test_run_generators_gives_each_generator_an_app_context(app):
+    def generator():
+        assert threading.current_thread() is not threading.main_thread()
+        return has_app_context() and current_app.name
+
+    results = run_generators({"generator": generator})
+
+    assert results.outputs == {"generator": app.name}
+
+
+def test_run_generators_collects_errors(app):
+    error = ValueError("Round ID is required")
+
+    def failing_generator():
+        raise error
+
+    results = run_generators({"first": lambda: 1, "failing": failing_generator, "last": lambda: 3})
+
+    assert results.outputs == {"first": 1, "last": 3}
+    assert results.errors == {"failing": error}
+    with pytest.raises(ExportError, match="Export failed in: failing") as e:
+        results.raise_for_errors()
+    assert e.value.errors == {"failing": error}
+    assert e.value.__cause__ is error
+
+
+@patch("app.export_config.export_runner.generate_assessment_config_for_round")
+@patch("app.export_config.export_runner.generate_config_for_round")
+@patch("app.export_config.export_runner.generate_all_round_html")
+@patch("app.export_config.export_runner.generate_form_jsons_for_round")
+def test_run_export_generators(mock_form_jsons, mock_html, mock_config, mock_assessment, app):
+    export_context = Mock()
+    mock_config.return_value = ({"short_name": "TEST"}, {"short_name": "R1"})
+
+    results = run_export_generators("round-id", "/output", export_context)
+
+    results.raise_for_errors()
+    # The generators run in other threads, so they're given a copy of the context that's detached from the session
+    detached_context = export_context.detached.return_value
+    mock_form_jsons.assert_called_once_with("round-id", "/output", detached_context)
+    mock_html.assert_called_once_with("round-id", "/output", detached_context)
+    mock_config.assert_called_once_with("round-id", "/output", detached_context)
+    mock_assessment.assert_called_once_with({"short_name": "TEST"}, {"short_name": "R1"}, "/output", detached_context)
+    assert results.outputs["config"] == ({"short_name": "TEST"}, {"short_name": "R1"})
+
+
+@patch("app.export_config.export_runner.generate_assessment_config_for_round")
+@patch("app.export_config.export_runner.generate_config_for_round", return_value=({}, {}))
+@patch("app.export_config.export_runner.generate_all_round_html")
+@patch("app.export_config.export_runner.generate_form_jsons_for_round")
+def test_run_export_generators_do_not_share_database_rows_with_generators(
+    mock_form_jsons, mock_html, mock_config, mock_assessment, seed_dynamic_data
+):
+    round = get_round_graph_by_id(seed_dynamic_data["rounds"][0].round_id)
+    export_context = ExportContext(round=round, fund=round.fund, sections=list(round.sections), published_forms={})
+
+    def generate_form_jsons(round_id, base_output_dir, export_context):
+        assert not isinstance(export_context.round, Round)
+        assert export_context.round.fund.short_name == round.fund.short_name
+        assert [form.url_path for form in export_context.forms] == ["about-your-org"]
+        # Only what was loaded on the calling thread can be used, rather than being loaded through its session
+        return export_context.fund.rounds
+
+    mock_form_jsons.side_effect = generate_form_jsons
+
+    results = run_export_generators(round.round_id, "/output", export_context, incremental=False)
+
+    assert list(results.errors) == ["form_jsons"]
+    assert isinstance(results.errors["form_jsons"], AttributeError)
+    assert "rounds" not in inspect(round.fund).dict
+
+
+@patch("app.export_config.export_runner.run_export_generators")
+def test_stream_export(mock_run_export_generators, app):
+    def run_export_generators(round_id, zip_stream, export_context):
+        zip_stream.write("html/round.html", "<div></div>")
+        return ExportResults()
+
+    mock_run_export_generators.side_effect = run_export_generators
+
+    zip_stream = stream_export("round-id", Mock())
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(zip_stream))) as zip_file:
+        assert zip_file.read("html/round.html") == b"<div></div>"
+
+
+@patch("app.export_config.export_runner.run_export_generators", return_value=ExportResults())
+def test_stream_export_detaches_round_before_streaming_in_the_background(mock_run_export_generators, app):
+    export_context = Mock()
+    detached_on = []
+    export_context.detached.side_effect = lambda: detached_on.append(threading.current_thread()) or Mock()
+
+    b"".join(stream_export("round-id", export_context))
+
+    assert detached_on == [threading.current_thread()]
+    assert mock_run_export_generators.call_args.args[2] is not export_context
+
+
+@patch("app.export_config.export_runner.run_export_generators")
+def test_stream_export_fails_zip_stream_when_generators_fail(mock_run_export_generators, app):
+    mock_run_export_generators.return_value = ExportResults(errors={"html": ValueError("Round ID is required")})
+
+    zip_stream = stream_export("round-id", Mock())
+
+    with pytest.raises(ExportError, match="Export failed in: html"):
+        b"".join(zip_stream)
+
+
+@patch("app.export_config.export_runner.run_export_generators")
+def test_stream_export_logs_failures_with_round(mock_run_export_generators, app):
+    mock_run_export_generators.return_value = ExportResults(errors={"html": ValueError("Broken")})
+
+    with patch.object(app.logger, "error") as mock_error:
+        with pytest.raises(ExportError):
+            b"".join(stream_export("round-id", Mock()))
+
+    mock_error.assert_called_once()
+    assert mock_error.call_args.kwargs["extra"]["round_id"] == "round-id"
@@ -0,0 +1,158 @@
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.all_questions.metadata_utils import generate_print_data_for_sections
+from app.export_config.generate_all_questions import (
+    form_fragment_cache,
+    generate_html,
+    generate_html_for_sections,
+    get_form_fragment,
+    iter_html_for_sections,
+)
+
+TEST_DATA = Path("tests") / "test_data"
+EXPECTED_HTML = TEST_DATA / "expected" / "all_questions"
+FORM_FILES = [
+    "asset-information.json",
+    "favourite-colours.json",
+    "funding-and-match-funding.json",
+    "multi_input.json",
+    "org-info.json",
+    "projects.json",
+]
+
+
+# Rendered by the Airium renderer these pages used to be built with
+GOLDEN_FORMS = [
+    "asset-information",
+    "favourite-colours",
+    "funding-and-match-funding",
+    "multi_input",
+    "org-info",
+    "projects",
+    "test-section",
+    "Contact details template",
+    "organisation-and-local-authority",
+]
+
+
+def load_form(file_name):
+    with open(TEST_DATA / file_name) as f:
+        return json.load(f)
+
+
+def golden_round_sections():
+    forms = [{"name": name, "form_data": load_form(f"{name}.json")} for name in GOLDEN_FORMS[:6]]
+    return [
+        {"section_title": "1. Organisation", "forms": forms[:3]},
+        {"section_title": '2. Project "details"', "forms": forms[3:]},
+        {"section_title": "3. Declarations", "forms": []},
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clear_fragment_cache():
+    form_fragment_cache.clear()
+    yield
+    form_fragment_cache.clear()
+
+
+def expected_html(sections, all_question_view=True):
+    return generate_html(generate_print_data_for_sections(sections, lang="en"), all_question_view)
+
+
+@pytest.mark.parametrize("name", GOLDEN_FORMS)
+def test_form_html_matches_golden_file(app, name):
+    sections = [{"section_title": "1. About you", "forms": [{"name": name, "form_data": load_form(f"{name}.json")}]}]
+
+    expected = (EXPECTED_HTML / f"{name}.html").read_text()
+    assert generate_html(generate_print_data_for_sections(sections, lang="en"), all_question_view=False) == expected
+    assert generate_html_for_sections(sections, all_question_view=False) == expected
+
+
+@pytest.mark.parametrize("lang, file_name", [("en", "round.html"), ("cy", "round_cy.html")])
+def test_round_html_matches_golden_file(app, lang, file_name):
+    sections = golden_round_sections()
+
+    expected = (EXPECTED_HTML / file_name).read_text()
+    assert generate_html(generate_print_data_for_sections(sections, lang=lang)) == expected
+    assert generate_html_for_sections(sections, lang=lang) == expected
+
+
+@pytest.mark.parametrize("all_question_view", [True, False])
+@pytest.mark.parametrize("file_name", FORM_FILES)
+def test_single_form_matches_generate_html(app, file_name, all_question_view):
+    sections = [{"section_title": "1. About you", "forms": [{"name": "form", "form_data": load_form(file_name)}]}]
+
+    assert generate_html_for_sections(sections, all_question_view=all_question_view) == expected_html(
+        sections, all_question_view
+    )
+
+
+@pytest.mark.parametrize("all_question_view", [True, False])
+def test_round_matches_generate_html(app, all_question_view):
+    forms = [{"name": file_name, "form_data": load_form(file_name), "hash": file_name} for file_name in FORM_FILES]
+    sections = [
+        {"section_title": "1. First", "forms": forms[:2]},
+        {"section_title": "2. Second", "forms": forms[2:]},
+        # Forms in the same section with the same page paths are rendered as a whole section
+        {"section_title": "3. Repeated", "forms": [forms[0], forms[0]]},
+        {"section_title": "4. Empty", "forms": []},
+    ]
+
+    assert generate_html_for_sections(sections, all_question_view=all_question_view) == expected_html(
+        sections, all_question_view
+    )
+
+
+def test_sections_with_more_than_ten_forms_match_generate_html(app):
+    # Headings are sorted as strings, so the eleventh form (1.10) comes before the third (1.2)
+    def get_print_data_for_form(form, section_idx, form_idx, lang):
+        return {
+            f"/{form['name']}": {
+                "heading_number": f"{section_idx}.{form_idx}",
+                "is_form_heading": True,
+                "title": form["name"],
+                "components": [],
+            }
+        }
+
+    sections = [{"section_title": "1. Lots of forms", "forms": [{"name": f"form-{n}"} for n in range(12)]}]
+
+    with (
+        patch("app.all_questions.metadata_utils.get_print_data_for_form", get_print_data_for_form),
+        patch("app.export_config.generate_all_questions.get_print_data_for_form", get_print_data_for_form),
+    ):
+        html = generate_html_for_sections(sections)
+        assert html == expected_html(sections)
+    assert html.index("form-10") < html.index("form-2")
+
+
+def test_form_fragments_are_rendered_once(app):
+    form = {"name": "form", "form_data": load_form("org-info.json"), "hash": "hash-1"}
+    sections = [{"section_title": "1. About you", "forms": [form]}]
+
+    first = generate_html_for_sections(sections)
+    with patch("app.export_config.generate_all_questions.render_headings") as mock_render_headings:
+        second = generate_html_for_sections(sections)
+        # Rendered again when the form is published again
+        get_form_fragment({**form, "hash": "hash-2"}, section_idx=1, form_idx=0)
+
+    assert first == second
+    mock_render_headings.assert_called_once()
+
+
+def test_html_is_generated_a_section_at_a_time(app):
+    sections = golden_round_sections()
+    get_fragment = Mock(wraps=get_form_fragment)
+
+    chunks = iter_html_for_sections(sections, get_fragment=get_fragment)
+    # The table of contents is sent before any forms are rendered
+    assert "Table of contents" in "".join(next(chunks) for _ in range(2))
+    get_fragment.assert_not_called()
+
+    assert "".join(chunks).count("govuk-heading-l") == 3
+    assert get_fragment.call_count == 6
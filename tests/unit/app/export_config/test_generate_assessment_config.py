@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from app.db.models.application_config import ComponentType
+from app.export_config.export_context import ExportContext
 from app.export_config.generate_assessment_config import _get_component_type, generate_assessment_config_for_round
 from app.shared.form_store_api import PublishedFormResponse
 
@@ -58,83 +59,81 @@ class TestGenerateAssessmentConfig:
 
         return [mock_section]
 
+    @pytest.fixture
+    def published_form(self):
+        return PublishedFormResponse(
+            id="form-1",
+            url_path="test-form",
+            display_name="Test Form",
+            created_at=None,
+            updated_at=None,
+            published_at=None,
+            is_published=True,
+            published_json={
+                "pages": [
+                    {
+                        "path": "/contact",
+                        "title": "Contact Details",
+                        "components": [
+                            {"name": "name_field", "type": "TextField", "title": "Your Name"},
+                            {"name": "email_field", "type": "EmailAddressField", "title": "Email"},
+                            {"name": "html_content", "type": "Html", "title": "Info Text"},
+                        ],
+                    },
+                    {
+                        "path": "/summary",
+                        "title": "Summary",
+                        "components": [{"name": "summary_field", "type": "TextField", "title": "Summary"}],
+                    },
+                ]
+            },
+            hash="test-hash",
+        )
+
+    @staticmethod
+    def export_context(sections, published_form) -> ExportContext:
+        """Export context returning the same published form for every form in the sections"""
+        return ExportContext(
+            round=Mock(),
+            fund=Mock(),
+            sections=sections,
+            published_forms={form.url_path: published_form for section in sections for form in section.forms},
+        )
+
     @pytest.fixture
     def common_patches(self):
         """Common patches that most tests need"""
         with (
             patch("app.export_config.generate_assessment_config.copy.deepcopy") as mock_deepcopy,
-            patch("app.export_config.generate_assessment_config.db") as mock_db,
             patch("app.export_config.generate_assessment_config.helpers") as mock_helpers,
             patch(
                 "app.export_config.generate_assessment_config.form_json_to_assessment_display_types"
             ) as mock_display_types,
             patch("app.export_config.generate_assessment_config.human_to_kebab_case") as mock_kebab,
-            patch("app.export_config.generate_assessment_config.FormStoreAPIService") as mock_api_service_class,
         ):
             # Setup common behavior
             mock_kebab.side_effect = lambda x: x.lower().replace(" ", "-")
             mock_display_types.get.return_value = "text"
 
-            # Setup mock API service
-            mock_api_service = Mock()
-            mock_api_service.get_display_name_from_url_path.return_value = "Test Form"
-
-            # Add the get_published_form mock to return the form JSON
-            mock_api_service.get_published_form.return_value = PublishedFormResponse(
-                id="form-1",
-                url_path="test-form",
-                display_name="Test Form",
-                created_at=None,
-                updated_at=None,
-                published_at=None,
-                is_published=True,
-                published_json={
-                    "pages": [
-                        {
-                            "path": "/contact",
-                            "title": "Contact Details",
-                            "components": [
-                                {"name": "name_field", "type": "TextField", "title": "Your Name"},
-                                {"name": "email_field", "type": "EmailAddressField", "title": "Email"},
-                                {"name": "html_content", "type": "Html", "title": "Info Text"},
-                            ],
-                        },
-                        {
-                            "path": "/summary",
-                            "title": "Summary",
-                            "components": [{"name": "summary_field", "type": "TextField", "title": "Summary"}],
-                        },
-                    ]
-                },
-                hash="test-hash",
-            )
-            mock_api_service_class.return_value = mock_api_service
-
             mock_template = Mock()
             mock_template.substitute.return_value = "generated_config"
             mock_deepcopy.return_value = mock_template
 
             yield {
                 "deepcopy": mock_deepcopy,
-                "db": mock_db,
                 "helpers": mock_helpers,
                 "display_types": mock_display_types,
                 "kebab": mock_kebab,
-                "api_service_class": mock_api_service_class,
-                "api_service": mock_api_service,
                 "template": mock_template,
             }
 
-    def test_basic_config_generation(self, configs, mock_form_data, common_patches):
+    def test_basic_config_generation(self, configs, mock_form_data, published_form, common_patches):
         fund_config, round_config = configs
 
-        # Setup database query
-        common_patches[
-            "db"
-        ].session.query.return_value.filter.return_value.order_by.return_value.all.return_value = mock_form_data
-
         # Run function
-        generate_assessment_config_for_round(fund_config, round_config, "/output")
+        generate_assessment_config_for_round(
+            fund_config, round_config, "/output", self.export_context(mock_form_data, published_form)
+        )
 
         # Verify template was called with correct parameters
         common_patches["template"].substitute.assert_called_once()
@@ -146,14 +145,12 @@ class TestGenerateAssessmentConfig:
         # Verify config was written
         common_patches["helpers"].write_config.assert_called_once()
 
-    def test_unscored_data_structure(self, configs, mock_form_data, common_patches):
+    def test_unscored_data_structure(self, configs, mock_form_data, published_form, common_patches):
         fund_config, round_config = configs
 
-        common_patches[
-            "db"
-        ].session.query.return_value.filter.return_value.order_by.return_value.all.return_value = mock_form_data
-
-        generate_assessment_config_for_round(fund_config, round_config, "/output")
+        generate_assessment_config_for_round(
+            fund_config, round_config, "/output", self.export_context(mock_form_data, published_form)
+        )
 
         # Check the unscored data structure
         call_args = common_patches["template"].substitute.call_args[1]
@@ -191,8 +188,8 @@ class TestGenerateAssessmentConfig:
         mock_form = Mock()
         mock_form.url_path = "readonly-form"
 
-        # Set up API service to return form JSON for this form
-        common_patches["api_service"].get_published_form.return_value = PublishedFormResponse(
+        # Form JSON for this form
+        published_form = PublishedFormResponse(
             id="form-2",
             url_path="readonly-form",
             display_name="Readonly Form",
@@ -219,14 +216,9 @@ class TestGenerateAssessmentConfig:
         mock_section.name_in_apply_json = {"en": "Test"}
         mock_section.forms = [mock_form]
 
-        # Set up API service to return display name for this form
-        common_patches["api_service"].get_display_name_from_url_path.return_value = "Readonly Form"
-
-        common_patches["db"].session.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
-            mock_section
-        ]
-
-        generate_assessment_config_for_round(fund_config, round_config, "/output")
+        generate_assessment_config_for_round(
+            fund_config, round_config, "/output", self.export_context([mock_section], published_form)
+        )
 
         # Should have no answers since all components are readonly
         call_args = common_patches["template"].substitute.call_args[1]
@@ -234,13 +226,13 @@ class TestGenerateAssessmentConfig:
         answers = unscored[0]["sub_criteria"][0]["themes"][0]["answers"]
         assert len(answers) == 0
 
-    def test_empty_sections(self, configs, common_patches):
+    def test_empty_sections(self, configs, published_form, common_patches):
         fund_config, round_config = configs
 
         # No sections
-        common_patches["db"].session.query.return_value.filter.return_value.order_by.return_value.all.return_value = []
-
-        generate_assessment_config_for_round(fund_config, round_config, "/output")
+        generate_assessment_config_for_round(
+            fund_config, round_config, "/output", self.export_context([], published_form)
+        )
 
         # Should have empty unscored list
         call_args = common_patches["template"].substitute.call_args[1]
@@ -1,8 +1,9 @@
 import ast
+from unittest.mock import Mock, patch
 
 import pytest
 
-from app.export_config.generate_fund_round_config import generate_config_for_round
+from app.export_config.generate_fund_round_config import TEMPLATE_FUND_ROUND_EXPORT, generate_config_for_round
 
 
 def read_data_from_output_file(file):
@@ -26,23 +27,29 @@ def test_generate_config_for_round_valid_input(seed_dynamic_data, monkeypatch, t
 
     monkeypatch.setattr(generate_fund_round_config, "ROUND_BASE_PATHS", mock_round_base_paths)
 
-    from app.shared.form_store_api import FormResponse
-
-    def mock_get_published_forms(self):  # Needs same number of parameters as FormStoreAPIService.get_published_forms
-        return [
-            FormResponse(
-                id="1",
-                url_path="about-your-org",
-                display_name="About your organisation",
-                created_at=None,
-                updated_at=None,
-                published_at=None,
-                is_published=True,
-            )
-        ]
+    from app.shared.form_store_api import BulkPublishedFormsResponse, PublishedFormResponse
+
+    # Needs same parameters as FormStoreAPIService.get_published_forms_bulk
+    def mock_get_published_forms_bulk(self, url_paths):
+        return BulkPublishedFormsResponse(
+            forms={
+                "about-your-org": PublishedFormResponse(
+                    id="1",
+                    url_path="about-your-org",
+                    display_name="About your organisation",
+                    created_at=None,
+                    updated_at=None,
+                    published_at=None,
+                    is_published=True,
+                    published_json={},
+                    hash="test-hash",
+                )
+            }
+        )
 
     monkeypatch.setattr(
-        "app.export_config.generate_fund_round_config.FormStoreAPIService.get_published_forms", mock_get_published_forms
+        "app.export_config.export_context.FormStoreAPIService.get_published_forms_bulk",
+        mock_get_published_forms_bulk,
     )
 
     # Execute: Call the function with valid inputs
@@ -154,3 +161,25 @@ def test_generate_config_for_round_invalid_input(seed_dynamic_data):
     # Execute and Assert: Ensure the function raises an exception for invalid inputs
     with pytest.raises(ValueError):
         generate_config_for_round(round_id)
+
+
+@patch("app.export_config.generate_fund_round_config.write_config")
+@patch("app.export_config.generate_fund_round_config.generate_application_display_config", return_value=[])
+@patch("app.export_config.generate_fund_round_config.generate_round_config", return_value={"short_name": "R1"})
+@patch("app.export_config.generate_fund_round_config.generate_fund_config")
+def test_generate_config_for_round_fills_in_its_own_copy_of_the_template(
+    mock_generate_fund_config, _, __, mock_write_config
+):
+    for fund_short_name in ("FIRST", "SECOND"):
+        mock_generate_fund_config.return_value = {"short_name": fund_short_name}
+        generate_config_for_round("round-id", export_context=Mock())
+
+    first, second = [call.args[0] for call in mock_write_config.call_args_list]
+    assert first["fund_config"]["short_name"] == "FIRST"
+    assert second["fund_config"]["short_name"] == "SECOND"
+    assert TEMPLATE_FUND_ROUND_EXPORT == {
+        "sections_config": [],
+        "fund_config": {},
+        "round_config": [],
+        "base_path": None,
+    }
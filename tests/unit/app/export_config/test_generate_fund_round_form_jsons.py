@@ -4,11 +4,11 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from app.export_config.generate_fund_round_form_jsons import generate_form_jsons_for_round
-from app.shared.form_store_api import PublishedFormResponse
+from app.shared.form_store_api import BulkPublishedFormsResponse, PublishedFormResponse
 from tests.seed_test_data import ABOUT_YOUR_ORG_FORM_JSON
 
 
-@patch("app.export_config.generate_fund_round_form_jsons.FormStoreAPIService")
+@patch("app.export_config.export_context.FormStoreAPIService")
 def test_generate_form_jsons_for_round_valid_input(mock_api_service_class, seed_dynamic_data, temp_output_dir):
     # Setup mock
     mock_api_service = MagicMock()
@@ -26,7 +26,9 @@ def test_generate_form_jsons_for_round_valid_input(mock_api_service_class, seed_
         hash="test-hash-123",
     )
 
-    mock_api_service.get_published_form.return_value = mock_published_form
+    mock_api_service.get_published_forms_bulk.side_effect = lambda url_paths: BulkPublishedFormsResponse(
+        forms={url_path: mock_published_form for url_path in url_paths}
+    )
     mock_api_service_class.return_value = mock_api_service
 
     # Setup: Prepare valid input parameters
@@ -8,11 +8,11 @@ from app.export_config.generate_fund_round_html import (
     frontend_html_suffix,
     generate_all_round_html,
 )
-from app.shared.form_store_api import PublishedFormResponse
+from app.shared.form_store_api import BulkPublishedFormsResponse, PublishedFormResponse
 from tests.seed_test_data import ABOUT_YOUR_ORG_FORM_JSON
 
 
-@patch("app.export_config.generate_fund_round_html.FormStoreAPIService")
+@patch("app.export_config.export_context.FormStoreAPIService")
 def test_generate_fund_round_html(mock_api_service_class, seed_dynamic_data, temp_output_dir):
     # Setup mock
     mock_api_service = MagicMock()
@@ -30,7 +30,9 @@ def test_generate_fund_round_html(mock_api_service_class, seed_dynamic_data, tem
         hash="test-hash-123",
     )
 
-    mock_api_service.get_published_form.return_value = mock_published_form
+    mock_api_service.get_published_forms_bulk.side_effect = lambda url_paths: BulkPublishedFormsResponse(
+        forms={url_path: mock_published_form for url_path in url_paths}
+    )
     mock_api_service_class.return_value = mock_api_service
 
     # Setup: Prepare valid input parameters
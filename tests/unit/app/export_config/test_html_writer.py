@@ -0,0 +1,38 @@
+from airium import Airium
+
+from app.export_config.html_writer import HtmlWriter
+
+
+def test_html_writer_matches_airium():
+    air = Airium(current_level=1)
+    with air.div(klass='a "quoted" class', id=None, hidden=True):
+        with air.p():
+            air("Some <b>text</b> & more")
+        with air.ul():
+            with air.li():
+                with air.a(href="#anchor"):
+                    air(3)
+        air.hr(klass="break")
+        air("Loose text")
+    with air.div():
+        pass
+
+    html = HtmlWriter(level=1)
+    html.open("div", klass='a "quoted" class', id=None, hidden=True)
+    html.element("p", "Some <b>text</b> & more")
+    html.open("ul")
+    html.open("li")
+    html.element("a", 3, href="#anchor")
+    html.close("li")
+    html.close("ul")
+    html.void("hr", klass="break")
+    html.text("Loose text")
+    html.close("div")
+    html.open("div")
+    html.close("div")
+
+    assert str(html) == str(air)
+
+
+def test_empty_html_writer():
+    assert str(HtmlWriter()) == ""
@@ -0,0 +1,97 @@
+import io
+import threading
+import zipfile
+
+import pytest
+
+from app.export_config.helpers import write_config
+from app.export_config.zip_stream import ZipStream
+
+
+def write_files(zip_stream: ZipStream, files: dict[str, str]):
+    for path, content in files.items():
+        zip_stream.write(path, content)
+    zip_stream.finish()
+
+
+def test_zip_stream_zips_files_as_they_are_written():
+    zip_stream = ZipStream(max_pending_files=2)
+    files = {f"form_runner/form-{i}.json": f'{{"form": {i}}}' for i in range(10)}
+    writer = threading.Thread(target=write_files, args=(zip_stream, files))
+    writer.start()
+
+    chunks = list(zip_stream)
+    writer.join()
+
+    # One chunk per file, plus the end of the zip file
+    assert len(chunks) == 11
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+        assert zip_file.namelist() == list(files)
+        assert {name: zip_file.read(name).decode() for name in zip_file.namelist()} == files
+
+
+def test_zip_stream_does_not_finish_zip_on_failure():
+    zip_stream = ZipStream()
+    zip_stream.write("html/round.html", "<div></div>")
+    zip_stream.fail(ValueError("Generator failed"))
+
+    chunks = []
+    with pytest.raises(ValueError, match="Generator failed"):
+        for chunk in zip_stream:
+            chunks.append(chunk)
+
+    assert len(chunks) == 1
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+
+def test_zip_stream_blocks_writers_until_files_are_zipped():
+    zip_stream = ZipStream(max_pending_files=1)
+    zip_stream.write("one.txt", "1")
+    writer = threading.Thread(target=zip_stream.write, args=("two.txt", "2"))
+    writer.start()
+    writer.join(timeout=0.3)
+    assert writer.is_alive()
+
+    chunks = iter(zip_stream)
+    next(chunks)
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+
+
+def test_zip_stream_releases_writers_when_abandoned():
+    zip_stream = ZipStream(max_pending_files=1)
+    files = {f"file-{i}.txt": str(i) for i in range(5)}
+    writer = threading.Thread(target=write_files, args=(zip_stream, files))
+    writer.start()
+
+    # The client goes away after the first file
+    chunks = iter(zip_stream)
+    next(chunks)
+    chunks.close()
+
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+
+
+@pytest.mark.parametrize(
+    "config,filename,config_type,expected_path,expected_content",
+    [
+        ('{"pages": []}', "about-your-org", "form_json", "form_runner/about-your-org.json", '{"pages": []}'),
+        ({"base_path": 1}, "TEST", "python_file", "fund_store/test.py", "LOADER_CONFIG={'base_path': 1}\n"),
+        ("<div></div>", "test_r1", "html", "html/test_r1_all_questions_en.html", "<div></div>"),
+        ("{}", "assessment_config", "assessment", "assessment_store/assessment_config.py", "{}"),
+    ],
+)
+def test_write_config_to_zip_stream_matches_files(
+    tmp_path, config, filename, config_type, expected_path, expected_content
+):
+    write_config(config, filename, "R1", config_type, tmp_path)
+    zip_stream = ZipStream()
+    write_config(config, filename, "R1", config_type, zip_stream)
+    zip_stream.finish()
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(zip_stream))) as zip_file:
+        assert zip_file.namelist() == [expected_path]
+        assert zip_file.read(expected_path).decode() == expected_content
+    assert (tmp_path / expected_path).read_text() == expected_content
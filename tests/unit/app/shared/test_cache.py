@@ -0,0 +1,215 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.shared.cache import FilesystemCache, MemoryCache, NullCache, RedisCache, create_cache
+from tests.fake_redis import FakeRedisServer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("app.shared.cache.time", clock):
+        yield clock
+
+
+@pytest.fixture
+def redis_server(clock):
+    server = FakeRedisServer(clock=clock)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture(params=["memory", "filesystem", "redis"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCache(max_bytes=1024 * 1024, lock_poll_interval=0.01)
+    if request.param == "filesystem":
+        return FilesystemCache(directory=tmp_path / "cache", lock_poll_interval=0.01)
+    return RedisCache.from_url(request.getfixturevalue("redis_server").url, lock_poll_interval=0.01)
+
+
+def test_set_get_and_delete(cache):
+    assert cache.get("key") is None
+
+    cache.set("key", {"forms": ["about-your-org"]})
+    assert cache.get("key") == {"forms": ["about-your-org"]}
+
+    cache.delete("key")
+    assert cache.get("key") is None
+
+
+def test_values_expire_after_ttl(cache, clock):
+    cache.set("short", "value", ttl=10)
+    cache.set("forever", "value", ttl=0)
+
+    clock.now += 9
+    assert cache.get("short") == "value"
+
+    clock.now += 1
+    assert cache.get("short") is None
+    assert cache.get("forever") == "value"
+
+
+def test_default_ttl_is_used_when_not_given(cache, clock):
+    cache.default_ttl = 5
+    cache.set("key", "value")
+
+    clock.now += 5
+    assert cache.get("key") is None
+
+
+def test_add_only_stores_if_missing_or_expired(cache, clock):
+    assert cache.add("key", "first", ttl=10) is True
+    assert cache.add("key", "second", ttl=10) is False
+    assert cache.get("key") == "first"
+
+    clock.now += 10
+    assert cache.add("key", "third", ttl=10) is True
+    assert cache.get("key") == "third"
+
+
+def test_clear(cache):
+    cache.set("one", 1)
+    cache.set("two", 2)
+
+    cache.clear()
+
+    assert cache.get("one") is None
+    assert cache.get("two") is None
+
+
+def test_get_or_set_only_creates_missing_values(cache):
+    create = MagicMock(return_value="created")
+
+    assert cache.get_or_set("key", create) == "created"
+    assert cache.get_or_set("key", create) == "created"
+    create.assert_called_once()
+
+
+def test_get_or_set_does_not_cache_none(cache):
+    create = MagicMock(return_value=None)
+
+    assert cache.get_or_set("key", create) is None
+    assert cache.get_or_set("key", create) is None
+    assert create.call_count == 2
+
+
+def test_get_or_set_builds_value_once_for_concurrent_callers(cache):
+    started = threading.Event()
+    create_calls = []
+
+    def create():
+        create_calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "created"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_set("key", create)))
+    first.start()
+    started.wait()
+    others = [threading.Thread(target=lambda: results.append(cache.get_or_set("key", create))) for _ in range(4)]
+    for thread in others:
+        thread.start()
+    for thread in [first, *others]:
+        thread.join()
+
+    assert results == ["created"] * 5
+    assert len(create_calls) == 1
+
+
+def test_get_or_set_takes_over_when_lock_expires(cache, clock):
+    # Another caller took the lock and then died without building the value
+    cache.add("key:lock", True, ttl=cache.lock_timeout)
+    clock.now += cache.lock_timeout
+
+    assert cache.get_or_set("key", lambda: "created") == "created"
+
+
+def test_get_or_lock_waits_for_the_lock_holder(cache):
+    assert cache.get_or_lock("key") is None
+
+    def build():
+        time.sleep(0.1)
+        cache.set("key", "built")
+        cache.unlock("key")
+
+    builder = threading.Thread(target=build)
+    builder.start()
+    # Waits for the value instead of taking the lock
+    assert cache.get_or_lock("key") == "built"
+    builder.join()
+
+
+def test_get_or_lock_takes_the_lock_once_it_is_released_without_a_value(cache):
+    assert cache.get_or_lock("key") is None
+    cache.unlock("key")
+
+    assert cache.get_or_lock("key") is None
+
+
+def test_memory_cache_evicts_when_over_budget():
+    cache = MemoryCache(max_bytes=200)
+    cache.set("one", "x" * 100)
+    cache.set("two", "x" * 100)
+
+    assert cache.get("one") is None
+    assert cache.get("two") == "x" * 100
+
+
+def test_redis_cache_only_clears_its_own_keys(redis_server):
+    cache = RedisCache.from_url(redis_server.url, key_prefix="fab:")
+    other = RedisCache.from_url(redis_server.url, key_prefix="other:")
+    cache.set("key", "fab value")
+    other.set("key", "other value")
+
+    cache.clear()
+
+    assert cache.get("key") is None
+    assert other.get("key") == "other value"
+
+
+def test_null_cache_never_stores():
+    cache = NullCache()
+    cache.set("key", "value")
+
+    assert cache.get("key") is None
+    assert cache.get_or_set("key", lambda: "created") == "created"
+
+
+@pytest.mark.parametrize(
+    "backend,expected_class",
+    [("memory", MemoryCache), ("filesystem", FilesystemCache), ("redis", RedisCache), ("null", NullCache)],
+)
+def test_create_cache(backend, expected_class, tmp_path):
+    config = {
+        "CACHE_BACKEND": backend,
+        "CACHE_DEFAULT_TTL": 60,
+        "CACHE_LOCK_TIMEOUT": 10,
+        "CACHE_MEMORY_MAX_BYTES": 1024,
+        "CACHE_DIR": tmp_path,
+        "CACHE_REDIS_URL": "redis://localhost:6379/0",
+        "CACHE_KEY_PREFIX": "fab:",
+    }
+
+    cache = create_cache(config)
+
+    assert isinstance(cache, expected_class)
+    assert cache.default_ttl == 60
+    assert cache.lock_timeout == 10
+
+
+def test_create_cache_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown CACHE_BACKEND: memcached"):
+        create_cache({"CACHE_BACKEND": "memcached", "CACHE_DEFAULT_TTL": 60, "CACHE_LOCK_TIMEOUT": 10})
@@ -0,0 +1,66 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.shared.cache import get_cache
+from app.shared.fingerprint import (
+    get_recent_round_fingerprint,
+    get_round_fingerprint,
+    remember_round_fingerprint,
+    round_fingerprint,
+    source_hash,
+)
+from app.shared.form_store_api import BulkPublishedFormsResponse
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(app):
+    get_cache().clear()
+    yield
+    get_cache().clear()
+
+
+@pytest.fixture
+def round():
+    form = Mock(form_id="form-id", url_path="about-your-org", section_index=1, updated_at=None)
+    section = Mock(section_id="section-id", index=1, name_in_apply_json={"en": "About you"}, forms=[form])
+    fund = Mock(fund_id="fund-id", updated_at="2025-01-01T00:00:00")
+    return Mock(round_id="round-id", updated_at="2025-01-01T00:00:00", fund=fund, sections=[section])
+
+
+def test_source_hash_changes_with_any_source():
+    assert source_hash("hash", 1) == source_hash("hash", 1)
+    assert source_hash("hash", 1) != source_hash("hash", 2)
+    assert source_hash("hash", 1) != source_hash("other-hash", 1)
+
+
+def test_round_fingerprint_changes_with_published_form_hashes(round):
+    fingerprint = round_fingerprint(round, round.fund, round.sections, {"about-your-org": "hash-1"})
+
+    assert fingerprint == round_fingerprint(round, round.fund, round.sections, {"about-your-org": "hash-1"})
+    assert fingerprint != round_fingerprint(round, round.fund, round.sections, {"about-your-org": "hash-2"})
+
+
+def test_recent_round_fingerprint_is_remembered_until_the_round_changes(round):
+    assert get_recent_round_fingerprint(round) is None
+
+    remember_round_fingerprint(round, "fingerprint")
+
+    assert get_recent_round_fingerprint(round) == "fingerprint"
+
+    round.sections[0].forms[0].updated_at = "2025-01-02T00:00:00"
+
+    assert get_recent_round_fingerprint(round) is None
+
+
+def test_get_round_fingerprint_only_fetches_forms_when_not_remembered(round):
+    api_service = Mock()
+    api_service.get_published_forms_bulk.return_value = BulkPublishedFormsResponse(
+        forms={"about-your-org": Mock(hash="hash-1")}
+    )
+
+    fingerprint = get_round_fingerprint(round, api_service)
+
+    assert fingerprint == round_fingerprint(round, round.fund, round.sections, {"about-your-org": "hash-1"})
+    assert get_round_fingerprint(round, api_service) == fingerprint
+    api_service.get_published_forms_bulk.assert_called_once_with(["about-your-org"])
@@ -1,11 +1,14 @@
+import threading
+import time
 from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 from flask import Flask
 
-from app.shared.form_store_api import FormStoreAPIService, PublishedFormResponse
+from app.shared.form_store_api import FormNotFoundError, FormStoreAPIService, PublishedFormResponse, get_session
 
 
 class TestFormStoreAPIService:
@@ -16,7 +19,7 @@ class TestFormStoreAPIService:
         with app.app_context():
             yield
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_published_forms_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = HTTPStatus.OK
@@ -57,9 +60,9 @@ class TestFormStoreAPIService:
         assert len(forms) == 2
         assert forms[0].display_name == "Form 1"
         assert forms[1].display_name == "Form 3"
-        mock_get.assert_called_once_with("http://localhost", timeout=30, headers={"Content-Type": "application/json"})
+        mock_get.assert_called_once_with("http://localhost", timeout=(5, 30))
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_published_forms_empty(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = HTTPStatus.OK
@@ -71,7 +74,7 @@ class TestFormStoreAPIService:
 
         assert len(forms) == 0
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_published_forms_no_published(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = HTTPStatus.OK
@@ -93,7 +96,7 @@ class TestFormStoreAPIService:
 
         assert len(forms) == 0
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_published_forms_exception(self, mock_get):
         mock_get.side_effect = requests.exceptions.RequestException("API Error")
 
@@ -102,7 +105,7 @@ class TestFormStoreAPIService:
 
         assert len(forms) == 0
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_published_form_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = HTTPStatus.OK
@@ -128,9 +131,9 @@ class TestFormStoreAPIService:
         assert result.hash == "12345"
         assert result.url_path == "test-form"
         assert result.display_name == "Test Form"
-        mock_get.assert_called_once_with("http://localhost/test-form/published")
+        mock_get.assert_called_once_with("http://localhost/test-form/published", timeout=(5, 30))
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_published_form_not_found(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = HTTPStatus.NOT_FOUND
@@ -141,7 +144,7 @@ class TestFormStoreAPIService:
 
         assert form_config is None
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_published_form_http_error(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
@@ -152,7 +155,7 @@ class TestFormStoreAPIService:
 
         assert form_config is None
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_published_form_exception(self, mock_get):
         mock_get.side_effect = requests.exceptions.RequestException("API Error")
 
@@ -160,3 +163,125 @@ class TestFormStoreAPIService:
         form_config = service.get_published_form("exception-form")
 
         assert form_config is None
+
+    @staticmethod
+    def published_form_response(url: str, timeout) -> MagicMock:
+        url_path = url.split("/")[-2]
+        response = MagicMock()
+        if url_path.startswith("missing"):
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+                response=MagicMock(status_code=HTTPStatus.NOT_FOUND)
+            )
+        elif url_path.startswith("broken"):
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+                response=MagicMock(status_code=HTTPStatus.INTERNAL_SERVER_ERROR)
+            )
+        response.json.return_value = {
+            "id": url_path,
+            "url_path": url_path,
+            "is_published": True,
+            "published_json": {"name": url_path},
+            "hash": f"hash-{url_path}",
+        }
+        return response
+
+    @patch("requests.Session.get")
+    def test_get_published_forms_bulk_preserves_order(self, mock_get):
+        # Fetch the later forms faster, so they would come back first if order wasn't preserved
+        def get(url, timeout):
+            time.sleep(0.01 * (10 - int(url.split("/")[-2].split("-")[1])))
+            return self.published_form_response(url, timeout)
+
+        mock_get.side_effect = get
+        url_paths = [f"form-{i}" for i in range(10)]
+
+        result = FormStoreAPIService().get_published_forms_bulk(url_paths + ["form-0"])
+
+        assert list(result.forms) == url_paths
+        assert [form.hash for form in result.forms.values()] == [f"hash-{url_path}" for url_path in url_paths]
+        assert result.errors == {}
+        assert mock_get.call_count == 10
+
+    @patch("requests.Session.get")
+    def test_get_published_forms_bulk_raises_for_every_missing_form(self, mock_get):
+        mock_get.side_effect = self.published_form_response
+
+        with pytest.raises(FormNotFoundError) as e:
+            FormStoreAPIService().get_published_forms_bulk(["form-1", "missing-1", "broken-1", "missing-2"])
+
+        assert e.value.url_paths == ["missing-1", "broken-1", "missing-2"]
+        assert e.value.message == "Published forms not found for URL paths: missing-1, broken-1, missing-2"
+
+    @patch("requests.Session.get")
+    def test_get_published_forms_bulk_returns_errors(self, mock_get):
+        mock_get.side_effect = self.published_form_response
+
+        result = FormStoreAPIService().get_published_forms_bulk(
+            ["missing-1", "form-1", "broken-1"], raise_on_missing=False
+        )
+
+        assert list(result.forms) == ["form-1"]
+        assert list(result.errors) == ["missing-1", "broken-1"]
+        assert isinstance(result.errors["missing-1"], FormNotFoundError)
+        assert isinstance(result.errors["broken-1"], requests.exceptions.HTTPError)
+
+    @patch("requests.Session.get")
+    def test_get_published_forms_bulk_empty(self, mock_get):
+        result = FormStoreAPIService().get_published_forms_bulk([])
+
+        assert result.forms == {}
+        assert result.errors == {}
+        mock_get.assert_not_called()
+
+
+class FlakyFormStoreHandler(BaseHTTPRequestHandler):
+    """Fails the first request to each path with a 503, then succeeds"""
+
+    failed_paths = set()
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        if self.path not in self.failed_paths:
+            self.failed_paths.add(self.path)
+            self.send_response(HTTPStatus.SERVICE_UNAVAILABLE)
+            self.end_headers()
+            return
+        body = b"[]"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestFormStoreSession:
+    def test_session_is_shared(self):
+        assert get_session() is get_session()
+
+    def test_session_pools_connections_and_retries(self):
+        session = get_session()
+        adapter = session.get_adapter("https://api.communities.gov.localhost:4004/forms")
+
+        assert adapter._pool_maxsize == 10
+        assert adapter.max_retries.total == 3
+        assert adapter.max_retries.status_forcelist == (500, 502, 503, 504)
+        assert session.headers["Accept-Encoding"] == "gzip"
+
+    def test_session_retries_server_errors(self):
+        server = HTTPServer(("127.0.0.1", 0), FlakyFormStoreHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        app = Flask(__name__)
+        app.config["FORM_STORE_API_HOST"] = f"http://127.0.0.1:{server.server_port}/forms"
+        try:
+            with app.app_context():
+                forms = FormStoreAPIService().get_published_forms()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert forms == []
+        assert FlakyFormStoreHandler.requests_seen == ["/forms", "/forms"]
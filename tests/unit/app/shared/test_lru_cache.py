@@ -0,0 +1,65 @@
+from app.shared.lru_cache import LRUCache
+
+
+def test_get_returns_default_when_missing():
+    cache = LRUCache(max_bytes=100)
+
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+
+
+def test_set_and_get():
+    cache = LRUCache(max_bytes=100)
+    cache.set("a", {"value": 1}, size=10)
+
+    assert cache.get("a") == {"value": 1}
+    assert "a" in cache
+    assert len(cache) == 1
+    assert cache.total_bytes == 10
+
+
+def test_evicts_least_recently_used_when_over_budget():
+    cache = LRUCache(max_bytes=30)
+    cache.set("a", 1, size=10)
+    cache.set("b", 2, size=10)
+    cache.set("c", 3, size=10)
+
+    # Reading "a" makes "b" the least recently used
+    cache.get("a")
+    cache.set("d", 4, size=10)
+
+    assert "b" not in cache
+    assert [cache.get(key) for key in ("a", "c", "d")] == [1, 3, 4]
+    assert cache.total_bytes == 30
+
+
+def test_replacing_a_value_updates_its_size():
+    cache = LRUCache(max_bytes=30)
+    cache.set("a", 1, size=10)
+    cache.set("a", 2, size=25)
+
+    assert cache.get("a") == 2
+    assert cache.total_bytes == 25
+
+
+def test_values_bigger_than_the_budget_are_not_stored():
+    cache = LRUCache(max_bytes=30)
+    cache.set("a", 1, size=10)
+    cache.set("b", 2, size=31)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+
+
+def test_delete_and_clear():
+    cache = LRUCache(max_bytes=30)
+    cache.set("a", 1, size=10)
+    cache.set("b", 2, size=10)
+
+    cache.delete("a")
+    assert "a" not in cache
+    assert cache.total_bytes == 10
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
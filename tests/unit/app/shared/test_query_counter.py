@@ -0,0 +1,79 @@
+import logging
+import threading
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from app.shared.query_counter import QueryCounter, init_query_counter
+
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://")
+
+
+def run_queries(engine, *statements: str):
+    with engine.connect() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def test_query_counter_counts_queries_by_statement(engine):
+    with QueryCounter() as outer:
+        run_queries(engine, "SELECT 1")
+        with QueryCounter() as inner:
+            run_queries(engine, "SELECT 2", "SELECT 2", "SELECT 2")
+    run_queries(engine, "SELECT 3")
+
+    assert outer.count == 4
+    assert inner.count == 3
+    assert outer.repeated() == {"SELECT 2": 3}
+    assert outer.repeated(times=4) == {}
+    assert outer.summary() == "3 x SELECT 2\n1 x SELECT 1"
+
+
+def test_query_counter_does_not_count_other_threads(engine):
+    with QueryCounter() as query_counter:
+        thread = threading.Thread(target=run_queries, args=(engine, "SELECT 1"))
+        thread.start()
+        thread.join()
+
+    assert query_counter.count == 0
+
+
+def test_assert_max_queries(engine, assert_max_queries):
+    with assert_max_queries(2):
+        run_queries(engine, "SELECT 1", "SELECT 1")
+
+    with pytest.raises(AssertionError, match="Ran 3 queries, more than the 2 allowed") as error:
+        with assert_max_queries(2):
+            run_queries(engine, "SELECT 1", "SELECT 1", "SELECT 1")
+    assert "3 x SELECT 1" in str(error.value)
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_init_query_counter_logs_queries_for_each_request(engine, caplog, enabled):
+    app = Flask(__name__)
+    app.config.update(QUERY_COUNTER_ENABLED=enabled, QUERY_COUNTER_REPEAT_THRESHOLD=3)
+    init_query_counter(app)
+
+    @app.route("/sections")
+    def sections():
+        run_queries(engine, "SELECT 'round'", *["SELECT 'forms in section'"] * 3)
+        return "sections"
+
+    with caplog.at_level(logging.INFO, logger=app.logger.name):
+        response = app.test_client().get("/sections")
+
+    assert response.text == "sections"
+    if not enabled:
+        assert caplog.records == []
+        return
+    assert [(record.levelname, record.getMessage()) for record in caplog.records] == [
+        ("INFO", "{endpoint} ran {query_count} queries"),
+        ("WARNING", "{endpoint} ran the same query {times} times, which may be an N+1: {statement}"),
+    ]
+    assert caplog.records[0].query_count == 4
+    assert caplog.records[1].times == 3
+    assert caplog.records[1].statement == "SELECT 'forms in section'"
@@ -0,0 +1,80 @@
+import pytest
+from flask import Flask, render_template_string
+from sqlalchemy import create_engine, text
+
+from app.shared.server_timing import RequestTimings, init_server_timing, timed
+
+
+@timed("all_questions")
+def render_questions(depth: int = 2) -> str:
+    # Calls itself, to check time within the same metric isn't counted twice
+    return render_questions(depth - 1) if depth else "questions"
+
+
+def create_timed_app(enabled: bool) -> Flask:
+    app = Flask(__name__)
+    app.config["SERVER_TIMING_ENABLED"] = enabled
+    init_server_timing(app)
+    engine = create_engine("sqlite://")
+
+    @app.route("/")
+    def index():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return render_template_string("{{ questions }}", questions=render_questions())
+
+    return app
+
+
+def parse_server_timing(header: str) -> dict:
+    metrics = {}
+    for entry in header.split(", "):
+        name, duration, description = entry.split(";")
+        metrics[name] = (float(duration.removeprefix("dur=")), description.removeprefix("desc="))
+    return metrics
+
+
+def test_server_timing_header():
+    response = create_timed_app(enabled=True).test_client().get("/")
+
+    assert response.text == "questions"
+    metrics = parse_server_timing(response.headers["Server-Timing"])
+    assert list(metrics) == ["sql", "all_questions", "template", "total"]
+    assert metrics["sql"][1] == '"Database queries (2)"'
+    assert metrics["all_questions"][1] == '"All questions engine (1)"'
+    assert metrics["template"][1] == '"Templates (1)"'
+    assert all(duration >= 0 for duration, _ in metrics.values())
+    assert metrics["total"][0] >= metrics["sql"][0] + metrics["all_questions"][0]
+
+
+def test_server_timing_disabled():
+    response = create_timed_app(enabled=False).test_client().get("/")
+
+    assert response.text == "questions"
+    assert "Server-Timing" not in response.headers
+
+
+def test_timed_outside_of_a_request():
+    assert render_questions() == "questions"
+
+
+@pytest.mark.parametrize(
+    "durations, counts, expected_header, expected_fields",
+    [
+        ({}, {}, "", {}),
+        (
+            {"form_store": 0.0125, "total": 0.02},
+            {"form_store": 3, "total": 1},
+            'form_store;dur=12.50;desc="Form Store API (3)", total;dur=20.00;desc="Total"',
+            {"form_store_ms": 12.5, "form_store_count": 3, "total_ms": 20.0},
+        ),
+    ],
+)
+def test_request_timings_header_and_log_fields(durations, counts, expected_header, expected_fields):
+    timings = RequestTimings()
+    timings.durations = durations
+    timings.counts = counts
+
+    assert timings.header() == expected_header
+    assert timings.log_fields() == expected_fields